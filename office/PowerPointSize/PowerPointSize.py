@@ -7,11 +7,11 @@ For help in extending this template, see https://msdn.microsoft.com/en-us/VBA/VB
 import argparse
 import pathlib
 import sys
-import tempfile
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-import office
+from office import pptx
+from office.worker import Worker
 
 
 class Window(QtWidgets.QWidget):
@@ -24,10 +24,13 @@ class Window(QtWidgets.QWidget):
         self.progress = QtWidgets.QProgressBar()
         self.table = QtWidgets.QTableWidget()
         size = QtWidgets.QPushButton('Size / Slide')
+        self.cancel = QtWidgets.QPushButton('Cancel')
+        self.worker = Worker(parent=self)
 
         self.progress.setTextVisible(False)
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(['Size in MB', '% Size'])
+        self.cancel.setEnabled(False)
+        self.table.setColumnCount(3)
+        self.table.setHorizontalHeaderLabels(['Size in MB', '% Size', 'Shared in MB'])
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
 
@@ -35,7 +38,8 @@ class Window(QtWidgets.QWidget):
         layout.addWidget(input_select, 0, 0)
         layout.addWidget(self.input_path, 0, 1)
         layout.addWidget(self.progress, 2, 0, 1, 2)
-        layout.addWidget(size, 3, 0, 1, 2)
+        layout.addWidget(size, 3, 0)
+        layout.addWidget(self.cancel, 3, 1)
         layout.addWidget(self.table, 4, 0, 1, 2)
         layout.setColumnStretch(1, 1)
         layout.setRowStretch(4, 1)
@@ -43,12 +47,22 @@ class Window(QtWidgets.QWidget):
 
         input_select.clicked.connect(self.on_input_select)
         size.clicked.connect(self.on_size)
+        self.cancel.clicked.connect(lambda: self.worker.cancel())
+        self.worker.started_job.connect(self.on_started)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_job.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.idle.connect(self.on_idle)
 
         self.setAcceptDrops(True)
         self.setAutoFillBackground(True)
         self.setWindowTitle('PowerPoint Size')
         self.show()
 
+    def closeEvent(self, event):  # noqa: N802
+        self.worker.shutdown()
+        event.accept()
+
     def dragEnterEvent(self, event):  # noqa: N802
         if event.mimeData().urls() and event.mimeData().urls()[0].toLocalFile().endswith('.pptx'):
             self.setBackgroundRole(QtGui.QPalette.Highlight)
@@ -66,29 +80,39 @@ class Window(QtWidgets.QWidget):
         self.input_path.setText(str(pathlib.Path(filepath).resolve()))
         event.accept()
 
+    def on_failed(self, key, message):
+        QtWidgets.QMessageBox.critical(self, 'PowerPoint Size', f'Failed to size {key}\n\n{message}')
+
+    def on_finished(self, key, result):  # noqa: ARG002
+        total = sum(self.table.item(i, 0).data(QtCore.Qt.UserRole) for i in range(self.table.rowCount()))
+        for i in range(self.table.rowCount()):
+            size = self.table.item(i, 0).data(QtCore.Qt.UserRole)
+            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(f'{100 * size / max(total, 1):.0f}'))
+
+    def on_idle(self):
+        self.cancel.setEnabled(False)
+        self.progress.setMaximum(1)
+
     def on_input_select(self):
         filepath, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Select input presentation', self.input_path.text(), 'PowerPoint Presentations (*.pptx)')
         if filepath:
             self.input_path.setText(str(pathlib.Path(filepath).resolve()))
 
+    def on_progress(self, key, size):  # noqa: ARG002
+        i = self.table.rowCount()
+        self.table.setRowCount(i + 1)
+        item = QtWidgets.QTableWidgetItem(f'{size.size / 1e6:.2f}')
+        item.setData(QtCore.Qt.UserRole, size.size)
+        self.table.setItem(i, 0, item)
+        self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(f'{size.shared / 1e6:.2f}'))
+
     def on_size(self):
-        ppt = office.PowerPoint(self.input_path.text())
-        self.progress.setMaximum(ppt.doc.Slides.Count)
-        self.table.setRowCount(ppt.doc.Slides.Count)
-        with tempfile.NamedTemporaryFile(suffix='.pptx', delete=False) as f:
-            filepath = pathlib.Path(f.name)
-        sizes = []
-        for i in range(ppt.doc.Slides.Count):
-            self.progress.setValue(i)
-            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 100)
-            ppt.export(filepath, i + 1)
-            sizes.append(filepath.stat().st_size / 1e6)
-            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(f'{sizes[i]:.2f}'))
-        filepath.unlink()
-        self.progress.setValue(0)
-        for i, size in enumerate(sizes):
-            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(f'{100 * size / sum(sizes):.0f}'))
-        ppt.close(alert=False)
+        self.cancel.setEnabled(True)
+        self.worker.submit(pptx.slide_sizes, self.input_path.text())
+
+    def on_started(self, key):  # noqa: ARG002
+        self.progress.setMaximum(0)
+        self.table.setRowCount(0)
 
 
 if __name__ == '__main__':
@@ -97,14 +121,10 @@ if __name__ == '__main__':
         parser.add_argument('input', help='Input presentation')
         args = parser.parse_args()
 
-        ppt = office.PowerPoint(args.input)
-        with tempfile.NamedTemporaryFile(suffix='.pptx', delete=False) as f:
-            filepath = pathlib.Path(f.name)
-        for i in range(1, ppt.doc.Slides.Count + 1):
-            ppt.export(filepath, i)
-            print(f'{i:>3}/{ppt.doc.Slides.Count}: {filepath.stat().st_size / 1e6:.1f} MB')
-        filepath.unlink()
-        del ppt
+        sizes = list(pptx.slide_sizes(args.input))
+        for size in sizes:
+            shared = f' ({size.shared / 1e6:.1f} MB shared)' if size.shared_parts else ''
+            print(f'{size.index:>3}/{len(sizes)}: {size.size / 1e6:.1f} MB{shared}')
     else:
         app = QtWidgets.QApplication(sys.argv)
         window = Window()
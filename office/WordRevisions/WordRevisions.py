@@ -6,11 +6,44 @@ For help in extending this template, see https://msdn.microsoft.com/en-us/VBA/VB
 
 import argparse
 import os
+import shutil
 import sys
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtGui, QtWidgets
 
 import office
+from office import docx
+from office.worker import Worker
+
+
+def mark(input_path, output_path, strike_deletions=False, word=False):
+    """Mark revisions of a document, yielding the number of revisions handled so far and their total.
+
+    Revisions are counted from the document itself first, to warn about those left as tracked changes, and to copy
+    documents without revisions to handle as they are, without opening Word.
+    """
+    revisions = docx.scan_revisions(input_path)
+    for revision, count in sorted(revisions.unhandled().items()):
+        print(f'Unhandled revisions: {count} {revision}', file=sys.stderr)
+    if not revisions.handled:
+        shutil.copyfile(input_path, output_path)
+        yield 0, 0
+        return
+    if word:
+        N = sum(revisions.counts.values())  # Word iterates over every revision, and may count them differently
+        yield 0, N
+        doc = office.Word(input_path)
+        try:
+            for n in doc.mark_revisions(strike_deletions=strike_deletions):
+                yield n, max(n, N)
+            doc.doc.SaveAs(output_path)
+        finally:
+            doc.close(alert=False)
+    else:
+        N = revisions.handled
+        yield 0, N
+        for n in docx.mark_revisions(input_path, output_path, strike_deletions=strike_deletions):
+            yield n, N
 
 
 class Window(QtWidgets.QWidget):
@@ -23,31 +56,46 @@ class Window(QtWidgets.QWidget):
         self.input_path = QtWidgets.QLabel('Input Document.docx')
         self.output_path = QtWidgets.QLabel(os.path.abspath(os.path.expanduser('~/Desktop/Output Document.docx')))
         self.strike_deletions = QtWidgets.QCheckBox('Strike Deletions')
+        self.word = QtWidgets.QCheckBox('Use Word')
         self.progress = QtWidgets.QProgressBar()
         mark = QtWidgets.QPushButton('Mark')
+        self.cancel = QtWidgets.QPushButton('Cancel')
+        self.worker = Worker(parent=self)
 
         self.progress.setTextVisible(False)
+        self.cancel.setEnabled(False)
 
         layout = QtWidgets.QGridLayout()
         layout.addWidget(input_select, 0, 0)
         layout.addWidget(self.input_path, 0, 1)
         layout.addWidget(output_select, 1, 0)
         layout.addWidget(self.output_path, 1, 1)
-        layout.addWidget(self.strike_deletions, 2, 0, 1, 2)
+        layout.addWidget(self.strike_deletions, 2, 0)
+        layout.addWidget(self.word, 2, 1)
         layout.addWidget(self.progress, 3, 0, 1, 2)
-        layout.addWidget(mark, 4, 0, 1, 2)
+        layout.addWidget(mark, 4, 0)
+        layout.addWidget(self.cancel, 4, 1)
         layout.setColumnStretch(1, 1)
         self.setLayout(layout)
 
         input_select.clicked.connect(self.on_input_select)
         output_select.clicked.connect(self.on_output_select)
         mark.clicked.connect(self.on_mark)
+        self.cancel.clicked.connect(lambda: self.worker.cancel())
+        self.worker.started_job.connect(self.on_started)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.idle.connect(self.on_idle)
 
         self.setAcceptDrops(True)
         self.setAutoFillBackground(True)
         self.setWindowTitle('Mark Revisions')
         self.show()
 
+    def closeEvent(self, event):  # noqa: N802
+        self.worker.shutdown()
+        event.accept()
+
     def dragEnterEvent(self, event):  # noqa: N802
         if event.mimeData().urls() and event.mimeData().urls()[0].toLocalFile().endswith('.docx'):
             self.setBackgroundRole(QtGui.QPalette.Highlight)
@@ -70,19 +118,31 @@ class Window(QtWidgets.QWidget):
         if path:
             self.input_path.setText(os.path.abspath(path))
 
+    def on_failed(self, key, message):
+        QtWidgets.QMessageBox.critical(self, 'Mark Revisions', f'Failed to mark {key}\n\n{message}')
+
+    def on_idle(self):
+        self.cancel.setEnabled(False)
+        self.progress.setTextVisible(False)
+        self.progress.setValue(0)
+
+    def on_mark(self):
+        self.cancel.setEnabled(True)
+        self.worker.submit(mark, self.input_path.text(), self.output_path.text(), self.strike_deletions.isChecked(), self.word.isChecked())
+
+    def on_progress(self, key, progress):  # noqa: ARG002
+        n, N = progress
+        self.progress.setMaximum(max(N, 1))
+        self.progress.setValue(n)
+
     def on_output_select(self):
         path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Select output document', self.output_path.text(), 'Word Documents (*.docx)')
         if path:
             self.output_path.setText(os.path.abspath(path))
 
-    def on_mark(self):
-        doc = office.Word(self.input_path.text())
-        self.progress.setMaximum(doc.doc.Revisions.Count)
-        for n in doc.mark_revisions(strike_deletions=self.strike_deletions.isChecked()):
-            self.progress.setValue(n)
-            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 100)
-        doc.doc.SaveAs(self.output_path.text())
-        doc.close(alert=False)
+    def on_started(self, key):
+        self.progress.setFormat(f'{os.path.basename(key)} (%p%)')
+        self.progress.setTextVisible(True)
         self.progress.setValue(0)
 
 
@@ -92,15 +152,12 @@ if __name__ == '__main__':
         parser.add_argument('input', help='Input document')
         parser.add_argument('output', help='Output document')
         parser.add_argument('--strike-deletions', action='store_true', help='Strike deletions instead of removing them')
+        parser.add_argument('--word', action='store_true', help='Mark revisions through Word instead of rewriting the document directly')
         args = parser.parse_args()
 
-        doc = office.Word(args.input)
-        N = doc.doc.Revisions.Count
-        for n in doc.mark_revisions(args.strike_deletions):
-            sys.stdout.write(f'\rMarking... {100 * n / N:.0f}%')
+        for n, N in mark(args.input, args.output, args.strike_deletions, args.word):
+            sys.stdout.write(f'\rMarking... {100 * n / max(N, 1):.0f}%')
             sys.stdout.flush()
-        doc.doc.SaveAs(args.output)
-        del doc
     else:
         app = QtWidgets.QApplication(sys.argv)
         window = Window()
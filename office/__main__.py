@@ -0,0 +1,171 @@
+"""Run a job over many documents, one JSON line per document, resuming from a manifest of those already done.
+
+    python -m office size "decks/**/*.pptx"
+    python -m office mark-revisions "\\\\server\\share\\**\\*.docx" --output marked --processes 8 --manifest marked.jsonl
+    python -m office split @decks.txt --output slides
+    python -m office export "decks/*.pptx" --output previews --width 640
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import pathlib
+import shutil
+import sys
+import time
+
+from . import docx, ooxml, pptx
+
+JOBS = {}
+
+
+def job(name, office=False, output=True):
+    """Register a job, run on a document with the directory to write its outputs to, returning what to report.
+
+    Jobs using Office run in threads, one at a time unless `--processes` says otherwise, as Office applications are
+    driven one instance (and process) at a time anyway, the others in worker processes.
+    """
+    def register(func):
+        func.office = office
+        func.output = output
+        JOBS[name] = func
+        return func
+    return register
+
+
+@job('export', office=True)
+def export(filepath, out_dir, args):
+    """Render each slide to PNG with PowerPoint, reusing slides rendered before."""
+    from . import render
+    return {'files': [str(x) for x in render.render(filepath, None, out_dir, args.width)]}
+
+
+@job('mark-revisions')
+def mark_revisions(filepath, out_dir, args):
+    """Convert tracked changes to marked revisions, without Office."""
+    output = out_dir / filepath.name
+    if output.resolve() == filepath:
+        raise ValueError('Output would overwrite the input')
+    revisions = docx.scan_revisions(filepath, args.author)
+    if revisions.handled:
+        for _ in docx.mark_revisions(filepath, output, args.author, strike_deletions=args.strike_deletions):
+            pass
+    else:
+        shutil.copyfile(filepath, output)
+    return {'file': str(output), 'revisions': revisions.handled, 'unhandled': revisions.unhandled()}
+
+
+@job('size', output=False)
+def size(filepath, out_dir, args):  # noqa: ARG001
+    """Attribute the size of a presentation to its slides."""
+    return {'slides': [{'index': x.index, 'size': x.size, 'shared': x.shared} for x in pptx.slide_sizes(filepath)]}
+
+
+@job('split')
+def split(filepath, out_dir, args):  # noqa: ARG001
+    """Split a presentation into one file per slide, without Office."""
+    with ooxml.Package(filepath) as package:
+        count = len(pptx.slide_parts(package))
+    return {'files': [str(x) for x in pptx.export_slides(filepath, range(1, count + 1), out_dir)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m office', description='Runs a job over many Office documents', fromfile_prefix_chars='@')
+    parser.add_argument('job', choices=sorted(JOBS), help='Job to run on each document')
+    parser.add_argument('inputs', nargs='+', metavar='INPUT', help='Documents or glob patterns (with ** for subdirectories), or @FILE listing them one per line')
+    parser.add_argument('--output', help='Directory to write outputs to, mirroring the directories of the inputs')
+    parser.add_argument('--processes', type=int, help='Number of workers, one per CPU by default, or one for jobs using Office')
+    parser.add_argument('--manifest', help='JSON lines file recording documents done, which are skipped when run again')
+    parser.add_argument('--author', help='Only mark revisions by this author')
+    parser.add_argument('--strike-deletions', action='store_true', help='Strike deletions instead of removing them')
+    parser.add_argument('--width', type=int, default=1280, help='Width of exported slides, in pixels')
+    args = parser.parse_args()
+    func = JOBS[args.job]
+    if func.output and args.output is None:
+        parser.error(f'{args.job} requires --output')
+
+    filepaths = _expand(args.inputs)
+    done = _done(args.manifest, args.job) if args.manifest else {}
+    pending = [x for x in filepaths if done.get(str(x)) != _stamp(x)]
+    root = pathlib.Path(os.path.commonpath([x.parent for x in filepaths])) if filepaths else None
+    processes = args.processes or (1 if func.office else os.cpu_count())  # Office applications run a single process anyway
+    executor = (concurrent.futures.ThreadPoolExecutor if func.office else concurrent.futures.ProcessPoolExecutor)(processes)
+    counts = {'done': 0, 'failed': 0, 'skipped': len(filepaths) - len(pending)}
+    manifest = open(args.manifest, 'a', encoding='utf-8') if args.manifest else None  # noqa: SIM115
+    futures = {}
+    try:
+        for filepath in pending:
+            out_dir = None if args.output is None else pathlib.Path(args.output).resolve() / filepath.parent.relative_to(root)
+            futures[executor.submit(_run, args.job, filepath, out_dir, args)] = filepath
+        for future in concurrent.futures.as_completed(futures):
+            record = future.result()
+            counts['done' if record['status'] == 'ok' else 'failed'] += 1
+            line = json.dumps(record)
+            print(line, flush=True)
+            if manifest is not None:
+                manifest.write(f'{line}\n')
+                manifest.flush()
+    except KeyboardInterrupt:
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        executor.shutdown()
+        if manifest is not None:
+            manifest.close()
+        print(', '.join(f'{n} {x}' for x, n in counts.items()), file=sys.stderr)
+
+
+def _done(filepath, name):
+    """Documents done by a job, as recorded in a manifest, with the modification time and size they had."""
+    done = {}
+    if not os.path.isfile(filepath):
+        return done
+    with open(filepath, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:  # cut short by an interruption
+                continue
+            if record.get('job') == name and record.get('status') == 'ok':
+                done[record['path']] = record['stamp']
+    return done
+
+
+def _expand(inputs):
+    """Documents matched by paths or glob patterns, once each, in the order given."""
+    filepaths = {}
+    for pattern in inputs:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = pathlib.Path(match).resolve()
+            if path.is_file() and not path.name.startswith('~$'):
+                filepaths[path] = None
+            elif not glob.has_magic(pattern):
+                print(f'No such file: {match}', file=sys.stderr)
+    return list(filepaths)
+
+
+def _run(name, filepath, out_dir, args):
+    """Run a job on a document, returning its record for the manifest."""
+    record = {'job': name, 'path': str(filepath), 'stamp': _stamp(filepath)}
+    start = time.perf_counter()
+    try:
+        if out_dir is not None:
+            out_dir.mkdir(parents=True, exist_ok=True)
+        record.update(status='ok', result=JOBS[name](filepath, out_dir, args))
+    except Exception as error:  # noqa: BLE001
+        record.update(status='failed', error=f'{type(error).__name__}: {error}')
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def _stamp(filepath):
+    stat = os.stat(filepath)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+if __name__ == '__main__':
+    main()
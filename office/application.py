@@ -1,14 +1,21 @@
 import contextlib
-import io
-import os
+import datetime as dt
+import functools
+import math
 import pathlib
 import sys
+import tempfile
 
-import pythoncom
-import win32com.client
-from win32com.client import constants, makepy
+from . import backend as backends
+from . import enums
+from .builder import Paths, text_properties
+from .util import address, boolean, constants, inch, parse_address, timer
 
-from .util import boolean, inch, rgb
+# wdRevisionType values that are reported but left as tracked changes
+UNHANDLED_REVISIONS = {enums.VALUES[f'wdRevision{revision.replace(" ", "")}']: revision for revision in (
+    'Cell Deletion', 'Cell Insertion', 'Cell Merge', 'Cell Split', 'Conflict', 'Conflict Delete', 'Conflict Insert',
+    'Display Field', 'Moved From', 'Moved To', 'Paragraph Number', 'Paragraph Property', 'Property', 'Reconcile',
+    'Replace', 'Section Property', 'Style', 'Style Definition', 'Table Property')}
 
 
 class Application:
@@ -17,32 +24,68 @@ class Application:
     See https://msdn.microsoft.com/en-us/library/office/jj162978.aspx.
     """
 
-    def __init__(self, application, document, filepath=None, visible=True, version=16.0):
+    images = None  # an image.Cache preparing pictures for add_image, which then inserts each picture once per document
+    retry = backends.Backoff()  # retry policy for calls rejected by a busy application, or None to fail them
+
+    def __init__(self, application, document, filepath=None, visible=True, version=16.0, backend=None):
         self.app = None
+        self.backend = backends.get() if backend is None else backend
         self._proxy(f'Microsoft Office {version:.1f} Object Library')
         self._proxy(f'Microsoft {application} {version:.1f} Object Library')
+        self.backend.message_filter(self.retry)
         try:
-            self.app = win32com.client.gencache.EnsureDispatch(f'{application}.Application')
-        except pythoncom.com_error as error:
+            with timer('dispatch'):
+                self.app = self.backend.dispatch(f'{application}.Application')
+        except self.backend.error as error:
             raise RuntimeError(f'Failed to start {application}') from error
         if application != 'PowerPoint':
             self.app.Visible = boolean(visible)
-        if filepath is not None and pathlib.Path(filepath).is_file():
-            self.doc = self._get_open_file(str(filepath))
-            if self.doc is None:
-                kwargs = {}
-                if application == 'PowerPoint':
-                    kwargs['WithWindow'] = boolean(visible)
-                self.doc = getattr(self.app, document).Open(str(filepath), **kwargs)
-        else:
-            self.doc = getattr(self.app, document).Add()
-            if filepath is not None:
-                self.doc.SaveAs(str(filepath))
-
-    def quit(self):  # noqa: A003
+        self.application = application
+        self.document = document
+        self._bulk = 0
+        self.open(filepath, visible)
+
+    def quit(self, force=False):  # noqa: A003
+        """Quit the application, or with `force`, discard changes to documents still open rather than being prompted."""
+        if force:
+            for doc in getattr(self.app, self.document):
+                doc.Saved = boolean(True)
         self.app.Quit()
         self.app = self.doc = self._proxy = None
 
+    @contextlib.contextmanager
+    def bulk(self):
+        """Suspend screen updating, alerts and other UI work within a block, restoring previous settings afterwards.
+
+        Settings are given per application by `_bulk_settings`. Nested blocks cost nothing, and time spent in the
+        outermost block is reported as 'bulk' through `util.timer`. This is the time taken, not the time saved, which
+        Office does not report; only `fake.Backend` models the saving (as `saved`, shown by the benchmarks). Saving and
+        restoring settings takes a few round-trips of its own, so wrap loops of calls rather than single ones.
+
+        >>> with w.bulk():
+        >>>     for text in texts:
+        >>>         w.add_text(text)
+        """
+        self._bulk += 1
+        try:
+            if self._bulk > 1:
+                yield self
+                return
+            saved = []
+            for path, value in self._bulk_settings().items():
+                *names, name = path.split('.')
+                obj = functools.reduce(getattr, names, self.app)
+                saved.append((obj, name, getattr(obj, name)))
+                setattr(obj, name, value)
+            try:
+                with timer('bulk'):
+                    yield self
+            finally:
+                for obj, name, value in reversed(saved):
+                    setattr(obj, name, value)
+        finally:
+            self._bulk -= 1
+
     def close(self, alert=True, switch=None):
         if switch is None:
             switch = boolean(True), boolean(False)
@@ -51,20 +94,32 @@ class Application:
         self.doc.Close()
         self.app.DisplayAlerts = display_alerts
 
+    def open(self, filepath=None, visible=True):  # noqa: A003
+        """Open (or create) a document in the running application, and make it current."""
+        self._pictures = {}
+        kwargs = {'WithWindow': boolean(visible)} if self.application == 'PowerPoint' else {}
+        with timer('open'):
+            if filepath is not None and pathlib.Path(filepath).is_file():
+                self.doc = self._get_open_file(str(filepath))
+                if self.doc is None:
+                    self.doc = getattr(self.app, self.document).Open(str(filepath), **kwargs)
+            else:
+                self.doc = getattr(self.app, self.document).Add(**kwargs)
+                if filepath is not None:
+                    self.doc.SaveAs(str(filepath))
+        self.doc = self.backend.wrap(self.doc, self.document[:-1])
+        return self.doc
+
+    def _bulk_settings(self):
+        """Application settings (as dotted paths from `app`) to apply within `bulk`."""
+        return {}
+
     def _get_open_file(self, filepath):
-        context = pythoncom.CreateBindCtx(0)
-        for moniker in pythoncom.GetRunningObjectTable():
-            if str(filepath) == os.path.abspath(moniker.GetDisplayName(context, None)):
-                return win32com.client.GetObject(str(filepath))
-        return None
+        return self.backend.get_open_file(filepath)
 
     def _proxy(self, name=''):
         """Ensure generation of named static COM proxy upon dispatch."""
-        f = io.StringIO()
-        with contextlib.redirect_stdout(f):
-            sys.argv = ['', '-i', name]
-            makepy.main()
-        exec('\n'.join(line.replace(' >>> ', '') for line in f.getvalue().splitlines() if line.startswith(' >>> ')))
+        self.backend.proxy(name)
 
 
 class Word(Application):
@@ -74,77 +129,125 @@ class Word(Application):
     >>> for i in range(3):
     >>>     paragraph = w.doc.Paragraphs.Add(w.doc.Paragraphs(w.doc.Paragraphs.Count).Range)
     >>>     paragraph.Range.Text = f'Paragraph {w.doc.Paragraphs.Count - 1}{os.linesep}'
+    >>> with w.buffer():
+    >>>     for i in range(20000):
+    >>>         w.add_text(f'Paragraph {i}')
     >>> w.doc.SaveAs('/path/to/file.docx')
     """
 
     def __init__(self, *args, **kwargs):
+        self._buffer = None
         super().__init__('Word', 'Documents', *args, **kwargs)
 
-    def quit(self):  # noqa: A003
-        if self.app is not None and len(self.app.Documents) > 0:
+    def quit(self, force=False):  # noqa: A003
+        if not force and self.app is not None and len(self.app.Documents) > 0:
             raise RuntimeError(f'Cannot quit with {len(self.app.Documents)} document(s) open')
-        super().quit()
+        super().quit(force)
 
-    def add_image(self, filepath):
+    def add_image(self, filepath, size=None):
+        if self.images is not None:
+            filepath = self.images.prepare(filepath, size)
+        if self._buffer is not None:
+            return self._buffer.add(image=filepath, size=size)
         paragraph = self.doc.Paragraphs.Add(self.doc.Paragraphs(self.doc.Paragraphs.Count).Range)
-        return self.doc.InlineShapes.AddPicture(FileName=filepath, LinkToFile=boolean(False), SaveWithDocument=boolean(True), Range=paragraph.Range)
+        shape = None
+        if str(filepath) in self._pictures:
+            with contextlib.suppress(self.backend.error):
+                paragraph.Range.FormattedText = self._pictures[str(filepath)].Range.FormattedText
+                shape = paragraph.Range.InlineShapes(1)
+        if shape is None:
+            shape = self.doc.InlineShapes.AddPicture(FileName=str(filepath), LinkToFile=boolean(False), SaveWithDocument=boolean(True), Range=paragraph.Range)
+            if self.images is not None:
+                self._pictures[str(filepath)] = shape
+        if size is not None:
+            shape.Width = inch(size[0])
+            shape.Height = inch(size[1])
+        return shape
 
     def add_text(self, text):
+        if self._buffer is not None:
+            return self._buffer.add(text=text)
         paragraph = self.doc.Paragraphs.Add(self.doc.Paragraphs(self.doc.Paragraphs.Count).Range)
         paragraph.Range.Text = text
         return paragraph
 
+    @contextlib.contextmanager
+    def buffer(self, size=1000):
+        """Queue `add_text` and `add_image` within a block, appending them to the document every `size` paragraphs.
+
+        Consecutive paragraphs of text are inserted in one round-trip, at a cached range that follows the end of the
+        document, so that appending does not slow down as the document grows. Queued paragraphs are returned as handles
+        that resolve to their paragraph (or inline shape) when first used, flushing the buffer if needed.
+        """
+        if self._buffer is not None:
+            yield self._buffer
+            return
+        self._buffer = _Buffer(self, size)
+        try:
+            with self.bulk():
+                yield self._buffer
+                self._buffer.flush()
+        finally:
+            self._buffer = None
+
     def close(self, alert=True):
         super().close(alert, switch=(constants.wdAlertsAll, constants.wdAlertsNone))
 
     def mark_revisions(self, author=None, color=None, strike_deletions=False):
         """Convert tracked changes to marked revisions."""
-        unhandled_revisions = {eval('constants.wdRevision{}'.format(revision.replace(' ', ''))): revision for revision in (
-            'Cell Deletion', ' Cell Insertion', 'Cell Merge', 'Cell Split', 'Conflict', 'Conflict Delete',
-            'Conflict Insert', 'Display Field', 'Moved From', 'Moved To', 'Paragraph Number', 'Paragraph Property',
-            'Property', 'Reconcile', 'Replace', 'Section Property', 'Style', 'Style Definition', 'Table Property')}
-
-        track_revisions = self.doc.TrackRevisions
-        self.doc.TrackRevisions = boolean(False)
-        for i, r in enumerate(self.doc.Revisions):
-            if author is None or r.Author == author:
-                if r.Type == constants.wdRevisionDelete:
-                    if strike_deletions:
+        with self.bulk():
+            track_revisions = self.doc.TrackRevisions
+            self.doc.TrackRevisions = boolean(False)
+            for i, r in enumerate(self.doc.Revisions):
+                if author is None or r.Author == author:
+                    if r.Type == constants.wdRevisionDelete:
+                        if strike_deletions:
+                            r.Range.Font.ColorIndex = constants.wdBlue if color is None else color
+                            r.Range.Font.StrikeThrough = boolean(True)
+                            r.Reject()
+                        else:
+                            r.Accept()
+                    elif r.Type == constants.wdRevisionInsert:
                         r.Range.Font.ColorIndex = constants.wdBlue if color is None else color
-                        r.Range.Font.StrikeThrough = boolean(True)
-                        r.Reject()
-                    else:
                         r.Accept()
-                elif r.Type == constants.wdRevisionInsert:
-                    r.Range.Font.ColorIndex = constants.wdBlue if color is None else color
-                    r.Accept()
-                elif r.Type == constants.wdNoRevision:
-                    print('Unhandled revision: No Revision', file=sys.stderr)
-                elif r.Type in unhandled_revisions:
-                    print(f'Unhandled revision: {unhandled_revisions[r.Type]}', file=sys.stderr)
-                else:
-                    print(f'Unexpected revision type: {r.Type}', file=sys.stderr)
-            yield i + 1
-        self.doc.TrackRevisions = track_revisions
+                    elif r.Type == constants.wdNoRevision:
+                        print('Unhandled revision: No Revision', file=sys.stderr)
+                    elif r.Type in UNHANDLED_REVISIONS:
+                        print(f'Unhandled revision: {UNHANDLED_REVISIONS[r.Type]}', file=sys.stderr)
+                    else:
+                        print(f'Unexpected revision type: {r.Type}', file=sys.stderr)
+                yield i + 1
+            self.doc.TrackRevisions = track_revisions
 
     def maximize(self):
         self.app.WindowState = constants.wdWindowStateMaximize
 
+    def _bulk_settings(self):
+        return {
+            'ScreenUpdating': False,
+            'DisplayAlerts': constants.wdAlertsNone,
+            'Options.Pagination': False,
+            'Options.CheckSpellingAsYouType': False,
+            'Options.CheckGrammarAsYouType': False}
+
 
 class Excel(Application):
     """Microsoft Office Excel.
 
     >>> e = Excel()
+    >>> e.write_range(numpy.eye(3), 'B2')
     >>> e.doc.SaveAs('/path/to/file.xlsx')
     """
 
+    chunk = 1 << 18  # cells per Range.Value round-trip, large blocks are split by rows to keep marshaling in check
+
     def __init__(self, *args, **kwargs):
         super().__init__('Excel', 'Workbooks', *args, **kwargs)
 
-    def quit(self):  # noqa: A003
-        if self.app is not None and len(self.app.Workbooks) > 0:
+    def quit(self, force=False):  # noqa: A003
+        if not force and self.app is not None and len(self.app.Workbooks) > 0:
             raise RuntimeError(f'Cannot quit with {len(self.app.Workbooks)} workbook(s) open')
-        super().quit()
+        super().quit(force)
 
     def export(self, filepath):
         self.doc.ActiveSheet.ExportAsFixedFormat(0, filepath)
@@ -152,6 +255,54 @@ class Excel(Application):
     def maximize(self):
         self.app.WindowState = constants.xlMaximized
 
+    def read_range(self, cells=None, sheet=None, dtype=None):
+        """Read a block of cells (e.g. 'A1:C10', the used range by default) as a 2-D NumPy array, one Range.Value per chunk.
+
+        Without a dtype, numbers (and booleans) are read as float with NaN for empty cells, dates as datetime64 with NaT,
+        and anything else as object with None. Nested lists are returned instead if NumPy is not installed. Saved
+        workbooks can be read without Excel, and in bounded memory, with `xlsx.read_chunks`.
+        """
+        worksheet = self._worksheet(sheet)
+        if cells is None:
+            cells = worksheet.UsedRange.Address
+        row, column, rows, columns = parse_address(cells)
+        step = max(1, self.chunk // columns)
+        values = []
+        with timer('read_range'):
+            for start in range(0, rows, step):
+                block = worksheet.Range(address(row + start, column, min(step, rows - start), columns)).Value
+                values.extend(block if isinstance(block, tuple) else ((block,),))
+        return _array(values, dtype)
+
+    def write_range(self, values, cells='A1', sheet=None):
+        """Write a 2-D block (a NumPy array or nested sequences) from the top-left cell of `cells`, one Range.Value per chunk.
+
+        A 1-D array is written as a column. NaN, NaT and None leave cells empty, datetime64 is written as dates. Returns
+        the address of the block written.
+        """
+        rows = _values(values)
+        if not rows:
+            return None
+        worksheet = self._worksheet(sheet)
+        row, column, _, _ = parse_address(cells)
+        columns = len(rows[0])
+        step = max(1, self.chunk // columns)
+        with self.bulk(), timer('write_range'):
+            for start in range(0, len(rows), step):
+                block = rows[start:start + step]
+                worksheet.Range(address(row + start, column, len(block), columns)).Value = block
+        return address(row, column, len(rows), columns)
+
+    def _bulk_settings(self):
+        return {
+            'ScreenUpdating': False,
+            'DisplayAlerts': False,
+            'EnableEvents': False,
+            'Calculation': constants.xlCalculationManual}
+
+    def _worksheet(self, sheet=None):
+        return self.doc.ActiveSheet if sheet is None else self.doc.Worksheets(sheet)
+
 
 class PowerPoint(Application):
     """Microsoft Office PowerPoint.
@@ -160,62 +311,77 @@ class PowerPoint(Application):
     >>> slide = p.add_slide()
     >>> p.add_text(f'Slide {slide.SlideNumber}', position=(0.2,0.2), slide=slide.SlideNumber)
     >>> p.doc.SaveAs('/path/to/file.pptx')
+
+    With `headless` (or `visible=False`), the presentation is opened without a window, and the current slide is tracked
+    here rather than through selection, so that no slide is ever selected or redrawn. Slides and shapes looked up by name are indexed on
+    first use, and kept up to date as they are added through this wrapper.
+
+    >>> p = PowerPoint('/path/to/file.pptx', headless=True)
+    >>> p.get_slide('Summary')
+    >>> p.get_shape('Title').TextFrame.TextRange.Text = 'Summary'
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, headless=False, **kwargs):
+        self.headless = headless
+        if headless:
+            kwargs['visible'] = False
         super().__init__('PowerPoint', 'Presentations', *args, **kwargs)
 
-    def quit(self):  # noqa: A003
-        if self.app is not None and len(self.app.Presentations) > 0:
+    def quit(self, force=False):  # noqa: A003
+        if not force and self.app is not None and len(self.app.Presentations) > 0:
             raise RuntimeError(f'Cannot quit with {len(self.app.Presentations)} presentation(s) open')
-        super().quit()
+        super().quit(force)
 
     def add_slide(self, layout=None):
         if layout is None:
             layout = constants.ppLayoutBlank
         elif isinstance(layout, str):
-            layout = eval(f'constants.ppLayout{layout}')
+            layout = getattr(constants, f'ppLayout{layout}')
         slide = self.doc.Slides.Add(self.doc.Slides.Count + 1, layout)
-        slide.Select()
-        return slide
+        if self._slide_names is not None:
+            self._slide_names[slide.Name] = slide
+        return self._select(slide)
 
     def add_text(self, text, position=(0, 0), size=(0, 0), margins=(0, 0, 0, 0), fontsize=None, fontcolor=None, bold=None, wrap=None, glow=None, slide=None):
         slide = self.get_slide(slide)
         shape = slide.Shapes.AddTextbox(Orientation=constants.msoTextOrientationHorizontal, Left=inch(position[0]), Top=inch(position[1]), Width=inch(size[0]), Height=inch(size[1]))
-        shape.TextFrame.TextRange.Text = text
-        if margins is not None:
-            shape.TextFrame.MarginLeft = margins[0]
-            shape.TextFrame.MarginRight = margins[1]
-            shape.TextFrame.MarginTop = margins[2]
-            shape.TextFrame.MarginBottom = margins[3]
-        if fontsize is not None:
-            shape.TextFrame.TextRange.Font.Size = fontsize
-        if fontcolor is not None:
-            shape.TextFrame.TextRange.Font.Color.RGB = rgb(*fontcolor)
-        if bold is not None:
-            shape.TextFrame.TextRange.Font.Bold = boolean(bold)
-        if wrap is not None:
-            shape.TextFrame.WordWrap = boolean(wrap)
-        if glow is not None:
-            shape.TextFrame2.TextRange.Font.Glow.Color.RGB = rgb(*glow['color'])
-            shape.TextFrame2.TextRange.Font.Glow.Radius = glow['radius']
-            shape.TextFrame2.TextRange.Font.Glow.Transparency = glow['alpha']
+        paths = Paths(shape)
+        paths.set('TextFrame.TextRange.Text', text)
+        for path, value in text_properties(margins, fontsize, fontcolor, bold, wrap, glow).items():
+            paths.set(path, value)
+        self._index_shape(slide, shape)
         return shape
 
     def add_image(self, filepath, position=(0, 0), size=None, slide=None):
+        if self.images is not None:
+            filepath = self.images.prepare(filepath, size)
         slide = self.get_slide(slide)
         kwargs = {}
         if size is not None:
             kwargs['Width'] = inch(size[0])
             kwargs['Height'] = inch(size[1])
-        return slide.Shapes.AddPicture(FileName=filepath, LinkToFile=boolean(False), SaveWithDocument=boolean(True), Left=inch(position[0]), Top=inch(position[1]), **kwargs)
+        previous = self._pictures.get(str(filepath))
+        if previous is not None and previous[0] == slide:
+            with contextlib.suppress(self.backend.error):
+                shape = previous[1].Duplicate()(1)
+                shape.Left = inch(position[0])
+                shape.Top = inch(position[1])
+                for name, value in kwargs.items():
+                    setattr(shape, name, value)
+                self._index_shape(slide, shape)
+                return shape
+        shape = slide.Shapes.AddPicture(FileName=str(filepath), LinkToFile=boolean(False), SaveWithDocument=boolean(True), Left=inch(position[0]), Top=inch(position[1]), **kwargs)
+        if self.images is not None:
+            self._pictures[str(filepath)] = slide, shape
+        self._index_shape(slide, shape)
+        return shape
 
     def close(self, alert=True):
         super().close(alert, switch=(constants.ppAlertsAll, constants.ppAlertsNone))
 
     def export(self, filepath, index):
         self.doc.SaveCopyAs(filepath)
-        other = PowerPoint(filepath, visible=False)
+        other = PowerPoint(filepath, headless=True, backend=self.backend)
         for i in range(other.doc.Slides.Count, index, -1):
             other.doc.Slides(i).Delete()
         for i in range(index - 1, 0, -1):
@@ -223,18 +389,39 @@ class PowerPoint(Application):
         other.doc.Save()
         other.close(alert=False)
 
+    def export_slides(self, indices, out_dir, processes=None):
+        """Export slides, or ranges of slides, to separate files (see `pptx.export_slides`) from a single saved copy."""
+        from . import pptx
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = pathlib.Path(directory) / f'{pathlib.Path(self.doc.Name).stem}.pptx'
+            self.doc.SaveCopyAs(str(filepath))
+            return pptx.export_slides(filepath, indices, out_dir, processes)
+
+    def get_shape(self, name, slide=None):
+        """Shape of a slide by name, from an index of the slide's shapes built on first use."""
+        slide = self.get_slide(slide)
+        key = slide.SlideID
+        if key not in self._shape_names or name not in self._shape_names[key]:
+            self._shape_names[key] = {shape.Name: shape for shape in slide.Shapes}
+        return self._shape_names[key][name]
+
     def get_slide(self, index=None):
+        """Slide by index (from 0, or from the end if negative) or name, or the current slide, which it becomes."""
         if index == 'master':
             return self.doc.SlideMaster
+        if isinstance(index, str):
+            if self._slide_names is None or index not in self._slide_names:
+                self._slide_names = {slide.Name: slide for slide in self.doc.Slides}
+            return self._select(self._slide_names[index])
         if index is None:
+            if self.headless:
+                return self._slide if self._slide is not None else self._select(self.doc.Slides(1))
             index = self.app.ActiveWindow.View.Slide.SlideNumber
         elif index >= 0:
             index += 1
         else:
             index += self.doc.Slides.Count + 1
-        slide = self.doc.Slides(index)
-        slide.Select()
-        return slide
+        return self._select(self.doc.Slides(index))
 
     def maximize(self):
         self.app.WindowState = constants.ppWindowMaximized
@@ -258,13 +445,28 @@ class PowerPoint(Application):
         elif left == 'right':
             shape.Left = self.doc.PageSetup.SlideWidth - shape.Width - x
 
+    def open(self, filepath=None, visible=True):  # noqa: A003
+        self.headless = self.headless or not visible  # slides cannot be selected without a window
+        self._slide = self._slide_names = None
+        self._shape_names = {}
+        return super().open(filepath, visible)
+
+    def render(self, indices, out_dir, width=1280, height=None, renderer=None, instances=1, cache=None):
+        """Render slides to PNG files (see `render.render`) from a single saved copy, by headless PowerPoint instances by default."""
+        from . import render
+        renderer = render.PowerPointRenderer(self.backend) if renderer is None else renderer
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = pathlib.Path(directory) / f'{pathlib.Path(self.doc.Name).stem}.pptx'
+            self.doc.SaveCopyAs(str(filepath))
+            return render.render(filepath, indices, out_dir, width, height, renderer, instances, cache)
+
     def ungroup(self, shape, flatten=False):
         def ungroups(shape, shapes=[]):  # noqa: B006
             try:
                 srange = shape.Ungroup()
                 for i in range(srange.Count):
                     ungroups(srange.Item(i + 1), shapes)
-            except pythoncom.com_error:
+            except self.backend.error:
                 shapes.append(shape)
                 return
         slide = shape.Parent
@@ -275,3 +477,136 @@ class PowerPoint(Application):
             srange = shape.Ungroup()
             shapes = [srange.Item(x + 1) for x in range(srange.Count)]
         return slide.Shapes.Range([x.Name for x in shapes]).Group() if len(shapes) > 1 else shapes[0]
+
+    def _bulk_settings(self):
+        return {
+            'DisplayAlerts': constants.ppAlertsNone}
+
+    def _index_shape(self, slide, shape):
+        """Add a new shape to the index of its slide's shapes, if built."""
+        if self._shape_names:
+            key = slide.SlideID
+            if key in self._shape_names:
+                self._shape_names[key][shape.Name] = shape
+
+    def _select(self, slide):
+        """Make a slide current, by selecting it unless headless."""
+        if not self.headless:
+            slide.Select()
+        self._slide = slide
+        return slide
+
+
+class _Buffer:
+
+    def __init__(self, word, size):
+        self.word = word
+        self.size = size
+        self.pending = []
+        self.end = None
+
+    def add(self, text=None, image=None, size=None):
+        handle = _Handle(self)
+        self.pending.append((handle, None if text is None else text.replace('\r\n', '\r').replace('\n', '\r'), image, size))
+        if len(self.pending) >= self.size:
+            self.flush()
+        return handle
+
+    def flush(self):
+        """Append queued paragraphs, tracking positions in characters (UTF-16 code units, as counted by Word)."""
+        if not self.pending:
+            return
+        with self.word.bulk(), timer('flush'):
+            position = self.word.doc.Content.End - 1  # before the final paragraph mark
+            if self.end is None:
+                self.end = self.word.doc.Range(position, position)
+            text = ''
+            start = position
+            for handle, value, image, size in self.pending:
+                if image is None:
+                    handle.start = start + len(text.encode('utf-16-le')) // 2
+                    text += f'{value}\r'
+                    handle.end = start + len(text.encode('utf-16-le')) // 2
+                    continue
+                if text:
+                    self.end.SetRange(start, start)
+                    self.end.InsertAfter(text)
+                    start += len(text.encode('utf-16-le')) // 2
+                self.end.SetRange(start, start)
+                handle.shape = self.word.doc.InlineShapes.AddPicture(FileName=str(image), LinkToFile=boolean(False), SaveWithDocument=boolean(True), Range=self.end)
+                if size is not None:
+                    handle.shape.Width = inch(size[0])
+                    handle.shape.Height = inch(size[1])
+                handle.start, handle.end = start, start + 2
+                start += 1
+                text = '\r'
+            if text:
+                self.end.SetRange(start, start)
+                self.end.InsertAfter(text)
+            self.pending = []
+
+
+class _Handle:
+    """A queued paragraph, resolved to its paragraph (or inline shape, for images) when any of its members is used."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.start = self.end = self.shape = None
+        self.target = None
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name, value):
+        if name[:1].isupper():
+            setattr(self.resolve(), name, value)
+        else:
+            super().__setattr__(name, value)
+
+    def resolve(self):
+        if self.target is None:
+            if self.start is None:
+                self.buffer.flush()
+            self.target = self.shape if self.shape is not None else self.buffer.word.doc.Range(self.start, self.end).Paragraphs(1)
+        return self.target
+
+
+def _array(values, dtype=None):
+    """Convert rows read through Range.Value to a NumPy array, inferring the dtype from the values present."""
+    values = [[x.replace(tzinfo=None) if isinstance(x, dt.datetime) else x for x in row] for row in values]  # pywintypes dates are tz-aware
+    try:
+        import numpy as np
+    except ImportError:
+        return values
+    if dtype is None:
+        dtype = _dtype(values) or object
+    if np.dtype(dtype).kind in 'fc':
+        values = [[math.nan if x is None else x for x in row] for row in values]
+    return np.array(values, dtype=dtype).reshape(len(values), -1)
+
+
+def _dtype(values):
+    """Dtype of the values present in rows, floats for numbers and booleans, or None without any."""
+    types = {type(x) for row in values for x in row if x is not None}
+    if not types:
+        return None
+    if all(issubclass(x, (bool, int, float)) for x in types):
+        return float
+    if all(issubclass(x, dt.datetime) for x in types):
+        return 'datetime64[us]'
+    return object
+
+
+def _values(values):
+    """Convert a NumPy array or nested sequences to rows for Range.Value, leaving missing values empty."""
+    if hasattr(values, 'tolist'):
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if values.dtype.kind == 'M':
+            values = values.astype('datetime64[us]')
+        values = values.tolist()
+    else:
+        values = [list(row) if isinstance(row, (list, tuple)) else [row] for row in values]
+    return tuple(tuple(None if isinstance(x, float) and math.isnan(x) else x for x in row) for row in values)
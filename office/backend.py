@@ -0,0 +1,190 @@
+"""Backends that dispatch Office applications, selected per `Application` or process-wide through `use`."""
+
+import collections
+import contextlib
+import io
+import json
+import os
+import pathlib
+import re
+import sys
+import threading
+import time
+
+from .util import timer
+
+RPC_E_CALL_REJECTED = -2147418111  # call was rejected by callee
+RPC_E_SERVERCALL_RETRYLATER = -2147417846  # server busy, call again later
+
+_default = None
+_filters = threading.local()  # message filter policy registered in each thread (COM apartment)
+_proxies = {}  # type library name to arguments of gencache.EnsureModule, resolved in this process
+
+
+class Backoff:
+    """Retry policy for calls rejected by a busy application, with exponential backoff.
+
+    A rejected call is retried after `initial` seconds, then after delays growing by `factor` (up to `maximum`), until
+    `timeout` seconds have passed since it was made, when it fails with RPC_E_CALL_REJECTED. At most `budget` retries are
+    made within `window` seconds, across calls, so that an unresponsive application fails fast once it is exhausted,
+    until the window has passed. Rejected, retried and failed calls are counted in `counters`.
+
+    >>> Application.retry = Backoff(timeout=300)
+    >>> w = Word()
+    >>> print(Application.retry.counters)
+    """
+
+    def __init__(self, initial=0.05, factor=2.0, maximum=2.0, timeout=60.0, budget=10000, window=60.0):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.timeout = timeout
+        self.budget = budget
+        self.window = window
+        self.counters = collections.Counter()
+        self._lock = threading.Lock()
+        self._opened = None  # start of the current window
+        self._spent = 0  # retries made within the current window
+
+    def delay(self, elapsed):
+        """Seconds to wait before retrying a call rejected `elapsed` seconds after it was made, or -1 to fail it."""
+        with self._lock:
+            self.counters['rejected'] += 1
+            now = time.monotonic()
+            if self._opened is None or now - self._opened >= self.window:
+                self._opened, self._spent = now, 0
+            if elapsed >= self.timeout or self._spent >= self.budget:
+                self.counters['failed'] += 1
+                return -1
+            self._spent += 1
+            self.counters['retried'] += 1
+        return min(self.maximum, self.initial * self.factor ** self._attempt(elapsed))
+
+    def _attempt(self, elapsed):
+        """Number of retries made so far, as many as the delays before them fit in the time elapsed since the call."""
+        attempt, delay = 0, self.initial
+        elapsed += 5e-4  # as measured by COM, to the millisecond
+        while 0 < delay < self.maximum and elapsed >= delay:
+            elapsed -= delay
+            attempt += 1
+            delay *= self.factor
+        if delay >= self.maximum:
+            attempt += int(elapsed // self.maximum)
+        return attempt
+
+
+class COM:
+    """Microsoft Office through pywin32, imported on first construction."""
+
+    def __init__(self):
+        import pythoncom
+        import win32com.client
+        from win32com.client import makepy
+        self.pythoncom = pythoncom
+        self.client = win32com.client
+        self.makepy = makepy
+        self.gen_path = pathlib.Path(win32com.__gen_path__)
+        self.error = pythoncom.com_error
+
+    def dispatch(self, name):
+        return self.client.gencache.EnsureDispatch(name)
+
+    def get_open_file(self, filepath):
+        context = self.pythoncom.CreateBindCtx(0)
+        for moniker in self.pythoncom.GetRunningObjectTable():
+            if str(filepath) == os.path.abspath(moniker.GetDisplayName(context, None)):
+                return self.client.GetObject(str(filepath))
+        return None
+
+    def initialize(self):
+        self.pythoncom.CoInitialize()
+
+    def message_filter(self, policy):
+        """Retry calls rejected by a busy application from the current thread, as advised by a `Backoff` policy (or None)."""
+        if getattr(_filters, 'policy', None) is policy:
+            return
+        from win32com.server.util import wrap
+        self.pythoncom.CoRegisterMessageFilter(None if policy is None else wrap(_MessageFilter(policy, self.pythoncom.IID_IMessageFilter), self.pythoncom.IID_IMessageFilter))
+        _filters.policy = policy
+
+    def proxy(self, name=''):
+        """Ensure generation of named static COM proxy upon dispatch.
+
+        Type library lookups through makepy are cached per process and on disk (next to the generated proxies), keyed by
+        library name, which includes the version.
+        """
+        if name in _proxies:
+            return
+        with timer('proxy'):
+            cache_path = self.gen_path / 'proxies.json'
+            cache = json.loads(cache_path.read_text()) if cache_path.is_file() else {}
+            if name not in cache:
+                f = io.StringIO()
+                argv = sys.argv
+                with timer('makepy'), contextlib.redirect_stdout(f):
+                    sys.argv = ['', '-i', name]
+                    try:
+                        self.makepy.main()
+                    finally:
+                        sys.argv = argv
+                match = re.search(r"EnsureModule\('(\{[^}]+\})', (\d+), (\d+), (\d+)\)", f.getvalue())
+                if match is None:
+                    _proxies[name] = None
+                    return
+                cache[name] = [match.group(1), *(int(x) for x in match.groups()[1:])]
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(json.dumps(cache, indent=2))
+            self.client.gencache.EnsureModule(*cache[name])
+            _proxies[name] = cache[name]
+
+    def uninitialize(self):
+        self.pythoncom.CoUninitialize()
+
+    def wrap(self, obj, name):  # noqa: ARG002
+        """Root of member paths for tracing, see `trace.Tracer`."""
+        return obj
+
+
+class _MessageFilter:
+    """IMessageFilter, see https://learn.microsoft.com/en-us/windows/win32/api/objidl/nn-objidl-imessagefilter."""
+
+    _public_methods_ = ['HandleInComingCall', 'MessagePending', 'RetryRejectedCall']
+
+    def __init__(self, policy, iid):
+        self._com_interfaces_ = [iid]
+        self.policy = policy
+
+    def HandleInComingCall(self, call_type, caller, tick_count, interface_info):  # noqa: ARG002, N802
+        return 0  # SERVERCALL_ISHANDLED
+
+    def MessagePending(self, callee, tick_count, pending_type):  # noqa: ARG002, N802
+        return 2  # PENDINGMSG_WAITDEFPROCESS
+
+    def RetryRejectedCall(self, callee, tick_count, reject_type):  # noqa: ARG002, N802
+        delay = self.policy.delay(tick_count / 1000)
+        return -1 if delay < 0 else round(1000 * delay)
+
+
+def get():
+    """The process-wide backend, COM unless replaced through `use`."""
+    global _default
+    if _default is None:
+        _default = COM()
+    return _default
+
+
+@contextlib.contextmanager
+def use(backend):
+    """Make a backend the process-wide default within a block.
+
+    >>> with use(fake.Backend(latency=1e-3)) as backend:
+    >>>     office.Word().add_text('Hello')
+    >>> print(backend.calls)
+    """
+    global _default
+    previous = _default
+    _default = backend
+    try:
+        yield backend
+    finally:
+        _default = previous
@@ -0,0 +1,264 @@
+"""Count COM round-trips of common operations against the fake backend, and model their cost.
+
+    python -m office.benchmark --latency 1e-4 --redraw 1e-3 --size 100
+    python -m office.benchmark --startup
+    python -m office.benchmark Word.mark_revisions --trace traces
+"""
+
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import fake, trace
+from .application import Excel, PowerPoint, Word
+from .builder import Builder
+from .layout import Layout
+from .util import constants
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    """Register a scenario, which prepares a document and returns the operation to measure."""
+    SCENARIOS[func.__name__.replace('_', '.', 1)] = func
+    return func
+
+
+@scenario
+def Word_add_text(backend, size, directory):  # noqa: ARG001, N802
+    word = Word(backend=backend)
+
+    def run():
+        with word.bulk():
+            for i in range(size):
+                word.add_text(f'Paragraph {i}')
+    return run
+
+
+@scenario
+def Word_add_text_unbulked(backend, size, directory):  # noqa: ARG001, N802
+    word = Word(backend=backend)
+
+    def run():
+        for i in range(size):
+            word.add_text(f'Paragraph {i}')
+    return run
+
+
+@scenario
+def Word_buffer(backend, size, directory):  # noqa: ARG001, N802
+    word = Word(backend=backend)
+
+    def run():
+        with word.buffer():
+            for i in range(size):
+                word.add_text(f'Paragraph {i}')
+    return run
+
+
+@scenario
+def Word_mark_revisions(backend, size, directory):  # noqa: ARG001, N802
+    word = Word(backend=backend)
+    revisions = word.doc.Revisions
+    for i in range(size):
+        revisions.append(Author=f'Author {i % 3}', Type=(constants.wdRevisionInsert, constants.wdRevisionDelete)[i % 2])
+
+    def run():
+        for _ in word.mark_revisions(author='Author 0', strike_deletions=True):
+            pass
+    return run
+
+
+@scenario
+def Excel_write_cells(backend, size, directory):  # noqa: ARG001, N802
+    excel = Excel(backend=backend)
+    worksheet = excel.doc.ActiveSheet
+
+    def run():
+        for i in range(size):
+            for j in range(10):
+                worksheet.Cells(i + 1, j + 1).Value = i * j
+    return run
+
+
+@scenario
+def Excel_write_range(backend, size, directory):  # noqa: ARG001, N802
+    excel = Excel(backend=backend)
+    values = [[i * j for j in range(10)] for i in range(size)]
+
+    def run():
+        excel.write_range(values)
+    return run
+
+
+@scenario
+def Excel_read_range(backend, size, directory):  # noqa: ARG001, N802
+    excel = Excel(backend=backend)
+    excel.write_range([[i * j for j in range(10)] for i in range(size)])
+
+    def run():
+        excel.read_range()
+    return run
+
+
+@scenario
+def PowerPoint_add_text(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend)
+    ppt.add_slide()
+
+    def run():
+        with ppt.bulk():
+            for i in range(size):
+                ppt.add_text(f'Text {i}', position=(1, 1), size=(2, 1), fontsize=12, fontcolor=(0, 0, 0), bold=True, wrap=True, glow={'color': (255, 255, 255), 'radius': 4, 'alpha': 0.5})
+    return run
+
+
+@scenario
+def PowerPoint_add_text_unbulked(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend)
+    ppt.add_slide()
+
+    def run():
+        for i in range(size):
+            ppt.add_text(f'Text {i}', position=(1, 1), size=(2, 1), fontsize=12, fontcolor=(0, 0, 0), bold=True, wrap=True, glow={'color': (255, 255, 255), 'radius': 4, 'alpha': 0.5})
+    return run
+
+
+@scenario
+def PowerPoint_headless(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend, headless=True)
+    ppt.add_slide()
+
+    def run():
+        with ppt.bulk():
+            for i in range(size):
+                ppt.add_text(f'Text {i}', position=(1, 1), size=(2, 1), fontsize=12, fontcolor=(0, 0, 0), bold=True, wrap=True, glow={'color': (255, 255, 255), 'radius': 4, 'alpha': 0.5})
+    return run
+
+
+@scenario
+def PowerPoint_build(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend)
+    builder = Builder(ppt)
+    glow = {'color': (255, 255, 255), 'radius': 4, 'alpha': 0.5}
+    shapes = [{'text': f'Text {i}', 'position': (1, 1), 'size': (2, 1), 'fontsize': 12, 'fontcolor': (0, 0, 0), 'bold': True, 'wrap': True, 'glow': glow} for i in range(size)]
+
+    def run():
+        builder.flush([{'layout': 'Blank', 'shapes': shapes}])
+    return run
+
+
+@scenario
+def PowerPoint_export(backend, size, directory):  # noqa: N802
+    ppt = PowerPoint(backend=backend)
+    for i in range(size):
+        ppt.add_slide()
+        ppt.add_text(f'Slide {i}')
+
+    def run():
+        ppt.export(directory / 'export.pptx', size // 2 + 1)
+    return run
+
+
+@scenario
+def PowerPoint_move_shape(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend)
+    slide = ppt.add_slide()
+    shapes = [slide.Shapes.AddShape(constants.msoShapeRectangle, 0, 0, 72, 72) for _ in range(size)]
+
+    def run():
+        for i, shape in enumerate(shapes):
+            ppt.move_shape(shape, i % 10, i // 10)
+    return run
+
+
+@scenario
+def PowerPoint_layout(backend, size, directory):  # noqa: ARG001, N802
+    ppt = PowerPoint(backend=backend)
+    slide = ppt.add_slide()
+    shapes = [slide.Shapes.AddShape(constants.msoShapeRectangle, 0, 0, 72, 72) for _ in range(size)]
+    layout = Layout(ppt)
+
+    def run():
+        layout.grid(shapes, columns=10, reference='upper left')
+    return run
+
+
+@scenario
+def PowerPointTemplate_main(backend, size, directory):  # noqa: ARG001, N802
+    from .PowerPointTemplate import PowerPointTemplate
+
+    def run():
+        PowerPointTemplate.main(16.0, 'dark', options=False, backend=backend)
+    return run
+
+
+def run(names=None, size=100, latency=1e-4, latencies=None, redraw=0.0, traces=None, reject=0.0):
+    """Run scenarios against a fresh fake backend each, returning calls, simulated, saved and wall time per scenario.
+
+    With `traces`, round-trips of each scenario are also traced, and written to that directory as Chrome traces.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in SCENARIOS if names is None else names:
+            backend = fake.Backend(latency=latency, latencies=latencies, redraw=redraw, reject=reject)
+            tracer = None if traces is None else trace.Tracer(backend)
+            func = SCENARIOS[name](tracer or backend, size, pathlib.Path(directory))
+            backend.reset()
+            if tracer is not None:
+                tracer.reset()
+            start = time.perf_counter()
+            func()
+            if tracer is not None:
+                pathlib.Path(traces).mkdir(parents=True, exist_ok=True)
+                tracer.write_trace(pathlib.Path(traces) / f'{name}.json')
+            results[name] = {'calls': sum(backend.calls.values()), 'simulated': backend.elapsed, 'saved': backend.saved, 'wall': time.perf_counter() - start, 'members': backend.calls.copy()}
+    return results
+
+
+def startup(modules=('office',), repeat=5):
+    """Best wall time of importing each module in a fresh interpreter, and whether doing so imported pywin32."""
+    code = 'import sys, time; t = time.perf_counter(); import {}; print(time.perf_counter() - t, any(x.split(".")[0] in ("pythoncom", "pywintypes", "win32com") for x in sys.modules))'
+    results = {}
+    for module in modules:
+        times = []
+        for _ in range(repeat):
+            seconds, pywin32 = subprocess.run([sys.executable, '-c', code.format(module)], capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(seconds))
+        results[module] = {'import': min(times), 'pywin32': pywin32 == 'True'}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Counts COM round-trips of common operations against the fake backend')
+    parser.add_argument('names', nargs='*', help=f'Scenarios to run, among {", ".join(SCENARIOS)}')
+    parser.add_argument('--size', type=int, default=100, help='Number of paragraphs, revisions, slides or shapes per scenario')
+    parser.add_argument('--latency', type=float, default=1e-4, help='Simulated latency of a COM round-trip in seconds')
+    parser.add_argument('--redraw', type=float, default=0.0, help='Simulated cost of redrawing after a COM set or method call, unless suspended by Application.bulk')
+    parser.add_argument('--cost', action='append', default=[], metavar='MEMBER=SECONDS', help='Simulated latency of a specific member, e.g. Presentation.SaveCopyAs()=2')
+    parser.add_argument('--reject', type=float, default=0.0, help='Probability of a busy application rejecting a COM round-trip, retried with Application.retry')
+    parser.add_argument('--top', type=int, default=0, help='Number of most frequent members to list per scenario')
+    parser.add_argument('--trace', metavar='DIRECTORY', help='Write a Chrome trace of each scenario to this directory')
+    parser.add_argument('--startup', action='store_true', help='Measure import time of the package instead, in fresh interpreters')
+    args = parser.parse_args()
+
+    if args.startup:
+        print(f'{"module":<28} {"import (ms)":>12} {"pywin32":>8}')
+        for name, result in startup(('office', 'office.docx', 'office.pptx', 'office.fake', 'office.benchmark')).items():
+            print(f'{name:<28} {1e3 * result["import"]:>12.1f} {"yes" if result["pywin32"] else "no":>8}')
+        return
+
+    latencies = {member: float(seconds) for member, seconds in (x.rsplit('=', 1) for x in args.cost)}
+    results = run(args.names or None, args.size, args.latency, latencies, args.redraw, args.trace, args.reject)
+    print(f'{"scenario":<28} {"calls":>9} {"simulated (s)":>14} {"saved (s)":>10} {"wall (s)":>9}')
+    for name, result in results.items():
+        print(f'{name:<28} {result["calls"]:>9} {result["simulated"]:>14.3f} {result["saved"]:>10.3f} {result["wall"]:>9.3f}')
+        for member, count in result['members'].most_common(args.top):
+            print(f'  {member:<50} {count:>9}')
+
+
+if __name__ == '__main__':
+    main()
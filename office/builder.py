@@ -0,0 +1,149 @@
+"""Slides described as plain data, built in one flush with as few COM round-trips as possible."""
+
+import collections
+import re
+
+from .util import boolean, constants, inch, rgb, timer
+
+
+class Paths:
+    """Dotted property paths from a COM object (e.g. 'TextFrame.TextRange.Font.Size'), fetching each intermediate once.
+
+    Segments may call parameterized properties with integer arguments, e.g. 'TextFrame.TextRange.Paragraphs(2)'.
+    Round-trips are counted in `calls`.
+    """
+
+    def __init__(self, obj):
+        self.objects = {'': obj}
+        self.calls = 0
+
+    def call(self, path, method, *args, **kwargs):
+        self.calls += 1
+        return getattr(self.get(path), method)(*args, **kwargs)
+
+    def get(self, path):
+        if path not in self.objects:
+            parent, _, name = path.rpartition('.')
+            obj = self.get(parent)
+            self.calls += 1
+            match = re.fullmatch(r'(\w+)\(([\d, ]*)\)', name)
+            if match is None:
+                self.objects[path] = getattr(obj, name)
+            else:
+                self.objects[path] = getattr(obj, match.group(1))(*(int(x) for x in match.group(2).split(',') if x.strip()))
+        return self.objects[path]
+
+    def set(self, path, value):  # noqa: A003
+        parent, _, name = path.rpartition('.')
+        obj = self.get(parent)
+        self.calls += 1
+        setattr(obj, name, value)
+
+
+class Builder:
+    """Build slides described as plain data, in one flush.
+
+    >>> builder = Builder(ppt)
+    >>> calls = builder.flush([{'layout': 'Blank', 'shapes': [
+    >>>     {'text': 'Title', 'position': (1, 1), 'size': (8, 1), 'fontsize': 36, 'bold': True},
+    >>>     {'image': '/path/to/image.png', 'position': (1, 2), 'size': (4, 3)},
+    >>>     {'shape': constants.msoShapeRectangle, 'position': (5, 2), 'size': (4, 3), 'properties': {'Fill.Transparency': 0.75}},
+    >>>     {'line': (1, 6), 'end': (9, 6), 'properties': {'Line.Weight': 2}}]}])
+
+    Slides are added with a `layout` (name or ppLayout value), or taken by their `index`. Shapes are textboxes (`text`,
+    with the options of `PowerPoint.add_text`), pictures (`image`), autoshapes (`shape`) or lines (`line`), positioned
+    in inches, and take further dotted `properties` as COM values. Properties equal to those of a new shape of the same
+    type (read once per builder) are skipped, and values shared by several shapes of a slide are written once through
+    a ShapeRange.
+    """
+
+    def __init__(self, ppt):
+        self.ppt = ppt
+        self.calls = 0
+        self.defaults = {}
+
+    def flush(self, slides):
+        """Build slides, returning the number of COM round-trips made."""
+        paths = []
+        with self.ppt.bulk(), timer('build'):
+            collection = Paths(self.ppt.doc)
+            paths.append(collection)
+            count = None
+            for spec in slides:
+                if 'index' in spec:
+                    slide = collection.call('Slides', 'Item', spec['index'])
+                else:
+                    if count is None:
+                        count = collection.get('Slides.Count')
+                    count += 1
+                    layout = spec.get('layout', 'Blank')
+                    slide = collection.call('Slides', 'Add', count, getattr(constants, f'ppLayout{layout}') if isinstance(layout, str) else layout)
+                if spec.get('shapes'):
+                    self._shapes(slide, spec['shapes'], paths)
+        calls = sum(x.calls for x in paths)
+        self.calls += calls
+        return calls
+
+    def _add(self, shapes, spec):
+        left, top = (inch(x) for x in spec.get('position', (0, 0)))
+        width, height = (inch(x) for x in spec.get('size', (0, 0)))
+        if 'text' in spec:
+            return 'text', shapes.call('Shapes', 'AddTextbox', Orientation=constants.msoTextOrientationHorizontal, Left=left, Top=top, Width=width, Height=height)
+        if 'image' in spec:
+            kwargs = {'Width': width, 'Height': height} if 'size' in spec else {}
+            return 'image', shapes.call('Shapes', 'AddPicture', FileName=str(spec['image']), LinkToFile=boolean(False), SaveWithDocument=boolean(True), Left=left, Top=top, **kwargs)
+        if 'shape' in spec:
+            return 'shape', shapes.call('Shapes', 'AddShape', spec['shape'], left, top, width, height)
+        if 'line' in spec:
+            return 'line', shapes.call('Shapes', 'AddLine', *(inch(x) for x in (*spec['line'], *spec['end'])))
+        raise ValueError(f'Unrecognized shape: {spec}')
+
+    def _shapes(self, slide, specs, paths):
+        shapes = Paths(slide)
+        paths.append(shapes)
+        index = shapes.get('Shapes.Count')
+        groups = collections.defaultdict(list)
+        for spec in specs:
+            kind, shape = self._add(shapes, spec)
+            index += 1
+            shape = Paths(shape)
+            paths.append(shape)
+            if kind == 'text':
+                shape.set('TextFrame.TextRange.Text', spec['text'])
+            properties = text_properties(**{k: spec[k] for k in ('margins', 'fontsize', 'fontcolor', 'bold', 'wrap', 'glow') if k in spec}) if kind == 'text' else {}
+            properties.update(spec.get('properties', {}))
+            for path, value in properties.items():
+                if (kind, path) not in self.defaults:
+                    self.defaults[kind, path] = shape.get(path)
+                if self.defaults[kind, path] != value:
+                    groups[path, value].append((index, shape))
+        ranges = {}
+        for (path, value), targets in groups.items():
+            if len(targets) == 1:
+                targets[0][1].set(path, value)
+                continue
+            key = tuple(i for i, _ in targets)
+            if key not in ranges:
+                ranges[key] = Paths(shapes.call('Shapes', 'Range', list(key)))
+                paths.append(ranges[key])
+            ranges[key].set(path, value)
+
+
+def text_properties(margins=(0, 0, 0, 0), fontsize=None, fontcolor=None, bold=None, wrap=None, glow=None):
+    """Dotted property paths and values of a textbox formatted as by `PowerPoint.add_text`."""
+    properties = {}
+    if margins is not None:
+        properties.update(zip(('TextFrame.MarginLeft', 'TextFrame.MarginRight', 'TextFrame.MarginTop', 'TextFrame.MarginBottom'), margins))
+    if fontsize is not None:
+        properties['TextFrame.TextRange.Font.Size'] = fontsize
+    if fontcolor is not None:
+        properties['TextFrame.TextRange.Font.Color.RGB'] = rgb(*fontcolor)
+    if bold is not None:
+        properties['TextFrame.TextRange.Font.Bold'] = boolean(bold)
+    if wrap is not None:
+        properties['TextFrame.WordWrap'] = boolean(wrap)
+    if glow is not None:
+        properties['TextFrame2.TextRange.Font.Glow.Color.RGB'] = rgb(*glow['color'])
+        properties['TextFrame2.TextRange.Font.Glow.Radius'] = glow['radius']
+        properties['TextFrame2.TextRange.Font.Glow.Transparency'] = glow['alpha']
+    return properties
@@ -0,0 +1,188 @@
+"""Compaction of media in Office documents (.pptx, .docx, .xlsx), without Office.
+
+    python -m office.compact deck.pptx compact.pptx --dpi 150
+"""
+
+import argparse
+import collections
+import hashlib
+import os
+import pathlib
+import posixpath
+import tempfile
+import typing
+import zipfile
+
+from . import image, ooxml, pptx
+
+
+class Saving(typing.NamedTuple):
+    index: int  # slide number, or 0 for media not reached by any slide
+    part: str
+    saved: float
+    media: list
+
+
+def compact(filepath, output, dpi=None, quality=85):
+    """Deduplicate media by content, and optionally re-encode images, writing a compacted copy of a document to `output`.
+
+    Media parts with identical content are collapsed into one, and relationships to the others are retargeted. With
+    `dpi`, JPEG and PNG images are downsampled to that resolution at the largest (uncropped) size they are displayed
+    at, and recompressed; re-encoded images are kept only if smaller. Other members are copied raw, so memory use does
+    not grow with the document. Returns the compressed bytes saved per slide (or for the whole document, unless a
+    presentation), with media reached by several slides split evenly among them, as in `pptx.slide_sizes`.
+    """
+    filepath, output = pathlib.Path(filepath), pathlib.Path(output)
+    with tempfile.NamedTemporaryFile(dir=output.parent, suffix=output.suffix, delete=False) as f:
+        temp = pathlib.Path(f.name)
+    try:
+        with ooxml.Package(filepath) as package:
+            media = sorted(part for part in package.parts if posixpath.basename(posixpath.dirname(part)) == 'media')
+            replaced = _duplicates(package, media)
+            changed = _retarget(package, replaced)
+            sizes = _display_sizes(package, set(media), replaced) if dpi is not None else {}
+            with zipfile.ZipFile(temp, 'w', zipfile.ZIP_DEFLATED) as zout:
+                for info in package.zip.infolist():
+                    if info.filename in replaced:
+                        continue
+                    data = changed.get(info.filename)
+                    if info.filename in sizes:
+                        with package.open(info.filename) as source:
+                            data = image.resample(source, sizes[info.filename], dpi, quality)
+                        if data is not None and len(data) >= info.file_size:
+                            data = None
+                    if data is not None:
+                        zout.writestr(zipfile.ZipInfo(info.filename, info.date_time), data, info.compress_type)
+                        continue
+                    package.copy(zout, info.filename)
+                written = {info.filename: info.compress_size for info in zout.infolist()}
+            savings = _attribute(package, {part: package.size(part) - written.get(part, 0) for part in media})
+        os.replace(temp, output)
+    finally:
+        temp.unlink(missing_ok=True)
+    return savings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compacts media in Office documents, without Office')
+    parser.add_argument('input', help='Input document')
+    parser.add_argument('output', help='Output document')
+    parser.add_argument('--dpi', type=float, help='Downsample images to this resolution at their displayed size')
+    parser.add_argument('--quality', type=int, default=85, help='JPEG quality of re-encoded images')
+    args = parser.parse_args()
+
+    before = os.path.getsize(args.input)
+    savings = compact(args.input, args.output, args.dpi, args.quality)
+    for saving in savings:
+        name = f'{saving.index:>3}/{sum(x.index > 0 for x in savings)}' if saving.index else '   deck'
+        print(f'{name}: {saving.saved / 1e6:.1f} MB saved')
+    print(f'{before / 1e6:.1f} MB -> {os.path.getsize(args.output) / 1e6:.1f} MB')
+
+
+def _attribute(package, savings):
+    """Split the bytes saved on each media part among the slides (or the document) that reach it."""
+    if package.main().startswith('ppt/'):
+        owners = [(part, package.reachable(part, stop=pptx.SLIDE_BOUNDARY)) for part in pptx.slide_parts(package)]
+    else:
+        owners = [(package.main(), package.reachable(package.main()))]
+    users = collections.Counter(part for _, parts in owners for part in parts if part in savings)
+    result = []
+    for i, (owner, parts) in enumerate(owners):
+        media = sorted(part for part in parts if savings.get(part))
+        result.append(Saving(i + 1, owner, sum(savings[part] / users[part] for part in media), media))
+    unreached = sorted(part for part, saved in savings.items() if saved and not users[part])
+    if unreached:
+        result.insert(0, Saving(0, '', sum(savings[part] for part in unreached), unreached))
+    return result
+
+
+def _display_sizes(package, media, replaced):
+    """Largest size in inches at which each image is displayed, or None if any of its uses has no known size.
+
+    Uses of a replaced part count as uses of the part kept instead, which they are retargeted to.
+    """
+    embed, link = ooxml.qn('r:embed'), ooxml.qn('r:link')
+    sizes = {}
+    for part in sorted(package.parts):
+        rels = {rel.id: replaced.get(rel.target, rel.target) for rel in package.rels(part) if not rel.external and rel.target in media}
+        if not rels:
+            continue
+        root = package.parse(part)
+        parents = {child: parent for parent in root.iter() for child in parent}
+        used = set()
+        for element in root.iter():
+            for target in (rels.get(element.get(embed)), rels.get(element.get(link))):
+                if target is None:
+                    continue
+                used.add(target)
+                size = _extent(element, parents)
+                if target not in sizes:
+                    sizes[target] = size
+                elif sizes[target] is not None:
+                    sizes[target] = None if size is None else (max(sizes[target][0], size[0]), max(sizes[target][1], size[1]))
+        for target in set(rels.values()) - used:  # referred to otherwise, e.g. by VML
+            sizes[target] = None
+    return sizes
+
+
+def _duplicates(package, media):
+    """Media parts whose content duplicates that of an earlier part, mapped to the part kept instead."""
+    candidates = collections.defaultdict(list)
+    for part in media:
+        info = package.parts[part]
+        candidates[info.file_size, info.CRC].append(part)
+    replaced = {}
+    for parts in candidates.values():
+        if len(parts) < 2:
+            continue
+        first = {}
+        for part in parts:
+            sha = hashlib.sha256()
+            with package.open(part) as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            kept = first.setdefault(sha.digest(), part)
+            if kept != part:
+                replaced[part] = kept
+    return replaced
+
+
+def _extent(element, parents):
+    """Size in inches of the picture or fill an image element (e.g. a:blip) belongs to, scaled up by its cropping."""
+    crop = (1, 1)
+    rect = parents[element].find(ooxml.qn('a:srcRect')) if element in parents else None
+    if rect is not None:
+        crop = tuple(max(1e-3, 1 - (int(rect.get(a, 0)) + int(rect.get(b, 0))) / 1e5) for a, b in (('l', 'r'), ('t', 'b')))
+    while element is not None:
+        ext = element.find(f'*/{ooxml.qn("a:xfrm")}/{ooxml.qn("a:ext")}')
+        if ext is not None:
+            return int(ext.get('cx')) / ooxml.EMU / crop[0], int(ext.get('cy')) / ooxml.EMU / crop[1]
+        element = parents.get(element)
+    return None
+
+
+def _retarget(package, replaced):
+    """Relationships parts (and content types) rewritten so that no relationship targets a replaced part."""
+    changed = {}
+    if not replaced:
+        return changed
+    for part in ['', *sorted(package.parts)]:
+        rids = {rel.id: replaced[rel.target] for rel in package.rels(part) if not rel.external and rel.target in replaced}
+        if not rids:
+            continue
+        tree = package.tree(ooxml.rels_name(part))
+        for element in tree.root:
+            if element.get('Id') in rids:
+                kept = rids[element.get('Id')]
+                element.set('Target', f'/{kept}' if element.get('Target').startswith('/') else posixpath.relpath(kept, posixpath.dirname(part) or '.'))
+        changed[ooxml.rels_name(part)] = tree.tostring()
+    types = package.tree('[Content_Types].xml')
+    for element in list(types.root):
+        if element.tag == ooxml.qn('ct:Override') and element.get('PartName').lstrip('/') in replaced:
+            types.root.remove(element)
+    changed['[Content_Types].xml'] = types.tostring()
+    return changed
+
+
+if __name__ == '__main__':
+    main()
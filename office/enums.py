@@ -0,0 +1,102 @@
+"""Office enumerations used by this package, so that they resolve without the type libraries generated by pywin32.
+
+Values are as documented in the VBA references of Office, Excel, PowerPoint and Word, see
+https://learn.microsoft.com/en-us/office/vba/api/overview/library-reference/enumerations-office.
+"""
+
+VALUES = {
+    # MsoTriState
+    'msoCTrue': 1, 'msoFalse': 0, 'msoTriStateMixed': -2, 'msoTriStateToggle': -3, 'msoTrue': -1,
+
+    # MsoAlignCmd, MsoDistributeCmd
+    'msoAlignLefts': 0, 'msoAlignCenters': 1, 'msoAlignRights': 2, 'msoAlignTops': 3, 'msoAlignMiddles': 4, 'msoAlignBottoms': 5,
+    'msoDistributeHorizontally': 0, 'msoDistributeVertically': 1,
+
+    # MsoAutoShapeType
+    'msoShapeRectangle': 1, 'msoShapeParallelogram': 2, 'msoShapeTrapezoid': 3, 'msoShapeDiamond': 4, 'msoShapeRoundedRectangle': 5,
+    'msoShapeOctagon': 6, 'msoShapeIsoscelesTriangle': 7, 'msoShapeRightTriangle': 8, 'msoShapeOval': 9,
+
+    # MsoFontLanguageIndex
+    'msoThemeLatin': 1, 'msoThemeComplexScript': 2, 'msoThemeEastAsian': 3,
+
+    # MsoShapeType
+    'msoAutoShape': 1, 'msoGroup': 6, 'msoLine': 9, 'msoPicture': 13, 'msoPlaceholder': 14, 'msoTextBox': 17,
+
+    # MsoTextOrientation
+    'msoTextOrientationHorizontal': 1, 'msoTextOrientationUpward': 2, 'msoTextOrientationDownward': 3,
+    'msoTextOrientationVerticalFarEast': 4, 'msoTextOrientationVertical': 5, 'msoTextOrientationHorizontalRotatedFarEast': 6,
+
+    # MsoThemeColorIndex
+    'msoThemeColorMixed': -2, 'msoNotThemeColor': 0,
+    'msoThemeColorDark1': 1, 'msoThemeColorLight1': 2, 'msoThemeColorDark2': 3, 'msoThemeColorLight2': 4,
+    'msoThemeColorAccent1': 5, 'msoThemeColorAccent2': 6, 'msoThemeColorAccent3': 7, 'msoThemeColorAccent4': 8,
+    'msoThemeColorAccent5': 9, 'msoThemeColorAccent6': 10, 'msoThemeColorHyperlink': 11, 'msoThemeColorFollowedHyperlink': 12,
+    'msoThemeColorText1': 13, 'msoThemeColorBackground1': 14, 'msoThemeColorText2': 15, 'msoThemeColorBackground2': 16,
+
+    # MsoVerticalAnchor
+    'msoAnchorTop': 1, 'msoAnchorTopBaseline': 2, 'msoAnchorMiddle': 3, 'msoAnchorBottom': 4, 'msoAnchorBottomBaseLine': 5,
+
+    # MsoZOrderCmd
+    'msoBringToFront': 0, 'msoSendToBack': 1, 'msoBringForward': 2, 'msoSendBackward': 3, 'msoBringInFrontOfText': 4, 'msoSendBehindText': 5,
+
+    # PpAlertLevel
+    'ppAlertsNone': 1, 'ppAlertsAll': 2,
+
+    # PpBulletType
+    'ppBulletMixed': -2, 'ppBulletNone': 0, 'ppBulletUnnumbered': 1, 'ppBulletNumbered': 2, 'ppBulletPicture': 3,
+
+    # PpRemoveDocInfoType
+    'ppRDIComments': 1, 'ppRDIRemovePersonalInformation': 4, 'ppRDIDocumentProperties': 8, 'ppRDIAll': 99,
+
+    # PpSaveAsFileType
+    'ppSaveAsPresentation': 1, 'ppSaveAsDefault': 11, 'ppSaveAsJPG': 17, 'ppSaveAsPNG': 18, 'ppSaveAsOpenXMLPresentation': 24, 'ppSaveAsPDF': 32,
+
+    # PpSlideLayout
+    'ppLayoutMixed': -2, 'ppLayoutTitle': 1, 'ppLayoutText': 2, 'ppLayoutTwoColumnText': 3, 'ppLayoutTable': 4,
+    'ppLayoutTextAndChart': 5, 'ppLayoutChartAndText': 6, 'ppLayoutOrgchart': 7, 'ppLayoutChart': 8, 'ppLayoutTextAndClipart': 9,
+    'ppLayoutClipartAndText': 10, 'ppLayoutTitleOnly': 11, 'ppLayoutBlank': 12, 'ppLayoutTextAndObject': 13,
+    'ppLayoutObjectAndText': 14, 'ppLayoutLargeObject': 15, 'ppLayoutObject': 16, 'ppLayoutTextAndMediaClip': 17,
+    'ppLayoutMediaClipAndText': 18, 'ppLayoutObjectOverText': 19, 'ppLayoutTextOverObject': 20, 'ppLayoutTextAndTwoObjects': 21,
+    'ppLayoutTwoObjectsAndText': 22, 'ppLayoutTwoObjectsOverText': 23, 'ppLayoutFourObjects': 24, 'ppLayoutVerticalText': 25,
+    'ppLayoutClipArtAndVerticalText': 26, 'ppLayoutVerticalTitleAndText': 27, 'ppLayoutVerticalTitleAndTextOverChart': 28,
+    'ppLayoutTwoObjects': 29, 'ppLayoutObjectAndTwoObjects': 30, 'ppLayoutTwoObjectsAndObject': 31, 'ppLayoutCustom': 32,
+    'ppLayoutSectionHeader': 33, 'ppLayoutComparison': 34, 'ppLayoutContentWithCaption': 35, 'ppLayoutPictureWithCaption': 36,
+
+    # PpSlideShowAdvanceMode
+    'ppSlideShowManualAdvance': 1, 'ppSlideShowUseSlideTimings': 2, 'ppSlideShowRehearseNewTimings': 3,
+
+    # PpWindowState
+    'ppWindowNormal': 1, 'ppWindowMinimized': 2, 'ppWindowMaximized': 3,
+
+    # WdAlertLevel
+    'wdAlertsAll': -1, 'wdAlertsMessageBox': -2, 'wdAlertsNone': 0,
+
+    # WdCollapseDirection
+    'wdCollapseEnd': 0, 'wdCollapseStart': 1,
+
+    # WdColorIndex
+    'wdByAuthor': -1, 'wdAuto': 0, 'wdNoHighlight': 0, 'wdBlack': 1, 'wdBlue': 2, 'wdTurquoise': 3, 'wdBrightGreen': 4, 'wdPink': 5,
+    'wdRed': 6, 'wdYellow': 7, 'wdWhite': 8, 'wdDarkBlue': 9, 'wdTeal': 10, 'wdGreen': 11, 'wdViolet': 12, 'wdDarkRed': 13,
+    'wdDarkYellow': 14, 'wdGray50': 15, 'wdGray25': 16,
+
+    # WdRevisionType
+    'wdNoRevision': 0, 'wdRevisionInsert': 1, 'wdRevisionDelete': 2, 'wdRevisionProperty': 3, 'wdRevisionParagraphNumber': 4,
+    'wdRevisionDisplayField': 5, 'wdRevisionReconcile': 6, 'wdRevisionConflict': 7, 'wdRevisionStyle': 8, 'wdRevisionReplace': 9,
+    'wdRevisionParagraphProperty': 10, 'wdRevisionTableProperty': 11, 'wdRevisionSectionProperty': 12, 'wdRevisionStyleDefinition': 13,
+    'wdRevisionMovedFrom': 14, 'wdRevisionMovedTo': 15, 'wdRevisionCellInsertion': 16, 'wdRevisionCellDeletion': 17,
+    'wdRevisionCellMerge': 18, 'wdRevisionCellSplit': 19, 'wdRevisionConflictInsert': 20, 'wdRevisionConflictDelete': 21,
+
+    # WdSaveFormat
+    'wdFormatDocument': 0, 'wdFormatXMLDocument': 12, 'wdFormatDocumentDefault': 16, 'wdFormatPDF': 17,
+
+    # WdWindowState
+    'wdWindowStateNormal': 0, 'wdWindowStateMaximize': 1, 'wdWindowStateMinimize': 2,
+
+    # XlCalculation
+    'xlCalculationAutomatic': -4105, 'xlCalculationManual': -4135, 'xlCalculationSemiautomatic': 2,
+
+    # XlFixedFormatType
+    'xlTypePDF': 0, 'xlTypeXPS': 1,
+
+    # XlWindowState
+    'xlMaximized': -4137, 'xlMinimized': -4140, 'xlNormal': -4143}
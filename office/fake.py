@@ -0,0 +1,628 @@
+"""An in-memory stand-in for Office, counting every COM round-trip against a configurable latency.
+
+Members that are not modeled explicitly are created on first access, so arbitrary formatting chains (e.g.
+`shape.TextFrame2.TextRange.Font.Glow.Color.RGB`) work and are counted like any other property.
+"""
+
+import collections
+import functools
+import pathlib
+import random
+import time
+
+from .backend import RPC_E_CALL_REJECTED
+from .util import address, parse_address
+
+
+class Error(Exception):
+    """Stand-in for pythoncom.com_error."""
+
+    def __init__(self, hresult=-2147352567, message='Exception occurred.'):
+        super().__init__(hresult, message)
+        self.hresult = hresult
+
+
+class Backend:
+    """Dispatches fake applications, and accumulates `calls` per member and simulated `elapsed` time.
+
+    Each property get (`Class.Member`), set (`Class.Member=`) and method call (`Class.Member()`) counts as one
+    round-trip, costing `latencies[key]` if given, `latency` otherwise. Sets and method calls additionally cost `redraw`
+    while the screen is updating, which is otherwise accumulated as `saved`. With `sleep`, time is also spent for real.
+    Round-trips are rejected with probability `reject` (repeatedly, as by a busy application), and retried as advised by
+    the `backend.Backoff` policy of the message filter, or fail with RPC_E_CALL_REJECTED without one.
+    """
+
+    error = Error
+
+    def __init__(self, latency=1e-4, latencies=None, redraw=0.0, sleep=False, reject=0.0, seed=0):
+        self.latency = latency
+        self.latencies = {} if latencies is None else latencies
+        self.redraw = redraw
+        self.sleep = sleep
+        self.reject = reject
+        self.random = random.Random(seed)
+        self.filter = None
+        self.calls = collections.Counter()
+        self.elapsed = 0.0
+        self.files = {}
+        self.saved = 0.0
+        self.updating = True
+
+    def dispatch(self, name):
+        return APPLICATIONS[name](self)
+
+    def get_open_file(self, filepath):  # noqa: ARG002
+        return None
+
+    def initialize(self):
+        pass
+
+    def message_filter(self, policy):
+        self.filter = policy
+
+    def proxy(self, name=''):
+        pass
+
+    def reset(self):
+        self.calls.clear()
+        self.elapsed = self.saved = 0.0
+
+    def tick(self, key):
+        latency = self.latencies.get(key, self.latency)
+        waited = 0.0
+        while self.reject and self.random.random() < self.reject:
+            delay = -1 if self.filter is None else self.filter.delay(waited)
+            if delay < 0:
+                self.elapsed += waited
+                raise Error(RPC_E_CALL_REJECTED, 'Call was rejected by callee.')
+            waited += latency + delay
+        latency += waited
+        if self.redraw and key[-1] in '=)':
+            if self.updating:
+                latency += self.redraw
+            else:
+                self.saved += self.redraw
+        self.calls[key] += 1
+        self.elapsed += latency
+        if self.sleep:
+            time.sleep(latency)
+
+    def uninitialize(self):
+        pass
+
+    def wrap(self, obj, name):  # noqa: ARG002
+        return obj
+
+
+def member(func):
+    """A modeled method, counted as one round-trip per call."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self.backend.tick(f'{self.kind}.{func.__name__}()')
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+def getter(func):
+    """A modeled read-only property, counted as one round-trip per access."""
+    @functools.wraps(func)
+    def wrapper(self):
+        self.backend.tick(f'{self.kind}.{func.__name__}')
+        return func(self)
+    return property(wrapper)
+
+
+class Object:
+    """A COM object, whose capitalized attributes are counted properties, created on first access if not modeled."""
+
+    children = {}
+    defaults = {}
+    kind = None
+
+    def __init__(self, backend, parent=None, kind=None, **properties):
+        self.__dict__.update(backend=backend, kind=kind or self.kind or type(self).__name__, properties={'Parent': parent, **self.defaults, **properties}, items={})
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+        self.backend.tick(f'{self.kind}.{name}')
+        return self.child(name)
+
+    def __setattr__(self, name, value):
+        if name[:1].isupper():
+            self.backend.tick(f'{self.kind}.{name}=')
+            self.properties[name] = value
+        else:
+            super().__setattr__(name, value)
+
+    def __call__(self, *args, **kwargs):
+        """Parameterized properties and unmodeled methods, e.g. `Ruler.Levels(1)` or `shape.ZOrder(1)`."""
+        self.backend.tick(f'{self.kind}()')
+        key = args + tuple(sorted(kwargs.items()))
+        if key not in self.items:
+            self.items[key] = Object(self.backend, self, kind=self.kind)
+        return self.items[key]
+
+    def child(self, name):
+        """Read a property without counting a round-trip, creating it if needed."""
+        if name not in self.properties:
+            self.properties[name] = self.children.get(name, Object)(self.backend, self, kind=name)
+        return self.properties[name]
+
+    def get(self, name):
+        """Read a property without counting a round-trip."""
+        return self.properties[name]
+
+    def root(self):
+        obj = self
+        while obj.get('Parent') is not None:
+            obj = obj.get('Parent')
+        return obj
+
+
+class Collection(Object):
+    item = Object
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__['list'] = []
+
+    def __call__(self, index):
+        return self.Item(index)
+
+    def __iter__(self):
+        for item in tuple(self.list):
+            self.backend.tick(f'{self.kind}.Item()')
+            yield item
+
+    def __len__(self):
+        return self.Count
+
+    @getter
+    def Count(self):  # noqa: N802
+        return len(self.list)
+
+    @member
+    def Item(self, index):  # noqa: N802
+        if isinstance(index, str):
+            return next(item for item in self.list if item.get('Name') == index)
+        return self.list[index - 1]
+
+    def append(self, item=None, index=None, **properties):
+        if item is None:
+            item = self.item(self.backend, self, **properties)
+        self.list.insert(len(self.list) if index is None else index - 1, item)
+        return item
+
+
+class Application(Object):
+    kind = 'Application'
+
+    def __setattr__(self, name, value):
+        if name == 'ScreenUpdating':
+            self.backend.updating = bool(value)
+        super().__setattr__(name, value)
+
+    @member
+    def Quit(self):  # noqa: N802
+        pass
+
+
+class Item(Object):
+
+    @member
+    def Delete(self):  # noqa: N802
+        self.get('Parent').list.remove(self)
+
+
+class Color(Object):
+    defaults = {'ObjectThemeColor': 0, 'RGB': 0}
+
+
+class Font(Object):
+    children = {'Color': Color}
+    defaults = {'Bold': 0, 'ColorIndex': 0, 'Italic': 0, 'Name': 'Calibri', 'Size': 18, 'StrikeThrough': 0}
+
+
+class Range(Object):
+    children = {'Font': Font}
+    defaults = {'Text': ''}
+
+    @member
+    def Paragraphs(self, index=None):  # noqa: N802
+        paragraphs = [Range(self.backend, self, Text=text) for text in self.get('Text').split('\r')]
+        return paragraphs if index is None else paragraphs[index - 1]
+
+
+# Word
+
+class Paragraph(Object):
+    children = {'Range': Range}
+
+
+class Paragraphs(Collection):
+    item = Paragraph
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.append()
+
+    @member
+    def Add(self, Range=None):  # noqa: ARG002, N802, N803
+        return self.append()
+
+
+class InlineShapes(Collection):
+
+    @member
+    def AddPicture(self, FileName, LinkToFile=0, SaveWithDocument=-1, Range=None):  # noqa: N802, N803
+        if isinstance(Range, StoryRange):
+            Range.insert(Range.get('Start'), '/')  # Word counts an inline shape as one character
+        return self.append(FileName=FileName, LinkToFile=LinkToFile, SaveWithDocument=SaveWithDocument, Range=Range)
+
+
+class StoryRange(Object):
+    """A range of characters of a document, whose text is kept by the document in UTF-16 code units, as Word counts them."""
+    children = {'Font': Font}
+    kind = 'Range'
+
+    def insert(self, index, text):
+        document = self.get('Parent')
+        units = utf16(text)
+        document.text = document.text[:index] + units + document.text[index:]
+        return len(units)
+
+    @member
+    def InsertAfter(self, Text):  # noqa: N802, N803
+        self.properties['End'] += self.insert(self.get('End'), Text)
+
+    @member
+    def Paragraphs(self, index):  # noqa: N802
+        document = self.get('Parent')
+        start = document.text.rfind('\r', 0, self.get('Start')) + 1
+        end = document.text.index('\r', self.get('Start')) + 1
+        for _ in range(index - 1):
+            start, end = end, document.text.index('\r', end) + 1
+        return Paragraph(self.backend, self, Range=StoryRange(self.backend, document, Start=start, End=end))
+
+    @member
+    def SetRange(self, Start, End):  # noqa: N802, N803
+        self.properties.update(Start=Start, End=End)
+
+    @getter
+    def Text(self):  # noqa: N802
+        return self.get('Parent').text[self.get('Start'):self.get('End')].encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'surrogatepass')
+
+
+class Revision(Item):
+    children = {'Range': Range}
+    defaults = {'Author': '', 'Type': 0}
+
+    @member
+    def Accept(self):  # noqa: N802
+        self.get('Parent').list.remove(self)
+
+    @member
+    def Reject(self):  # noqa: N802
+        self.get('Parent').list.remove(self)
+
+
+class Revisions(Collection):
+    item = Revision
+
+
+class Document(Item):
+    children = {'InlineShapes': InlineShapes, 'Paragraphs': Paragraphs, 'Revisions': Revisions}
+    defaults = {'FullName': '', 'Saved': -1, 'TrackRevisions': 0}
+
+    @member
+    def Close(self, *args, **kwargs):  # noqa: ARG002, N802
+        self.get('Parent').list.remove(self)
+
+    @member
+    def Save(self):  # noqa: N802
+        self.save(self.get('FullName'))
+
+    @member
+    def SaveAs(self, FileName, *args, **kwargs):  # noqa: ARG002, N802, N803
+        self.properties['FullName'] = str(FileName)
+        self.save(FileName)
+
+    @member
+    def SaveCopyAs(self, FileName):  # noqa: N802, N803
+        self.save(FileName)
+
+    def save(self, filepath):
+        """Keep the document for reopening, and leave a placeholder on disk for `pathlib.Path.is_file`."""
+        pathlib.Path(filepath).touch()
+        self.backend.files[str(filepath)] = self
+
+
+class Documents(Collection):
+    item = Document
+
+    @member
+    def Add(self, WithWindow=-1):  # noqa: N802, N803
+        return self.append(WithWindow=WithWindow)
+
+    @member
+    def Open(self, FileName, *args, WithWindow=-1, **kwargs):  # noqa: ARG002, N802, N803
+        document = self.append(FullName=str(FileName), WithWindow=WithWindow)
+        if str(FileName) in self.backend.files:
+            document.load(self.backend.files[str(FileName)])
+        return document
+
+
+class WordDocument(Document):
+    kind = 'Document'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__['text'] = '\r'
+
+    @getter
+    def Content(self):  # noqa: N802
+        return StoryRange(self.backend, self, Start=0, End=len(self.text))
+
+    @member
+    def Range(self, Start=0, End=None):  # noqa: N802, N803
+        return StoryRange(self.backend, self, Start=Start, End=len(self.text) if End is None else End)
+
+    def load(self, other):
+        self.__dict__['text'] = other.text
+        for revision in other.child('Revisions').list:
+            self.child('Revisions').append(Author=revision.get('Author'), Type=revision.get('Type'))
+
+
+class Options(Object):
+    defaults = {'CheckGrammarAsYouType': True, 'CheckSpellingAsYouType': True, 'Pagination': True}
+
+
+class WordApplication(Application):
+    children = {'Options': Options}
+    defaults = {'DisplayAlerts': -1, 'Name': 'Microsoft Word', 'ScreenUpdating': True, 'Visible': 0, 'WindowState': 0}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.properties['Documents'] = Documents(self.backend, self)
+        self.properties['Documents'].item = WordDocument
+
+
+# Excel
+
+class CellRange(Object):
+    """A block of cells, whose Value is read and written as a whole in one round-trip."""
+    kind = 'Range'
+
+    def __setattr__(self, name, value):
+        if name != 'Value':
+            super().__setattr__(name, value)
+            return
+        self.backend.tick('Range.Value=')
+        row, column, rows, columns = parse_address(self.get('Address'))
+        if rows == columns == 1 and not isinstance(value, (list, tuple)):
+            value = ((value,),)
+        if len(value) != rows or any(len(x) != columns for x in value):
+            raise Error(message=f'Cannot write a {len(value)}-row block to {self.get("Address")}')
+        cells = self.get('Parent').cells
+        for i, values in enumerate(value):
+            for j, x in enumerate(values):
+                if x is None:
+                    cells.pop((row + i, column + j), None)
+                else:
+                    cells[row + i, column + j] = x
+
+    @getter
+    def Value(self):  # noqa: N802
+        row, column, rows, columns = parse_address(self.get('Address'))
+        cells = self.get('Parent').cells
+        if rows == columns == 1:
+            return cells.get((row, column))
+        return tuple(tuple(cells.get((row + i, column + j)) for j in range(columns)) for i in range(rows))
+
+
+class Worksheet(Item):
+    defaults = {'Name': 'Sheet1'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__['cells'] = {}
+
+    @member
+    def Range(self, Cell1):  # noqa: N802, N803
+        return CellRange(self.backend, self, Address=Cell1)
+
+    @getter
+    def UsedRange(self):  # noqa: N802
+        if not self.cells:
+            return CellRange(self.backend, self, Address='A1')
+        rows, columns = zip(*self.cells)
+        return CellRange(self.backend, self, Address=address(min(rows), min(columns), max(rows) - min(rows) + 1, max(columns) - min(columns) + 1))
+
+
+class Worksheets(Collection):
+    item = Worksheet
+
+
+class Workbook(Document):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.properties['Worksheets'] = Worksheets(self.backend, self)
+        self.properties['Worksheets'].append()
+
+    @getter
+    def ActiveSheet(self):  # noqa: N802
+        return self.get('Worksheets').list[0]
+
+    def load(self, other):
+        for worksheet, cells in zip(self.get('Worksheets').list, (x.cells for x in other.get('Worksheets').list)):
+            worksheet.cells.update(cells)
+
+
+class ExcelApplication(Application):
+    defaults = {'Calculation': -4105, 'DisplayAlerts': True, 'EnableEvents': True, 'Name': 'Microsoft Excel', 'ScreenUpdating': True, 'Visible': 0, 'WindowState': -4143}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.properties['Workbooks'] = Documents(self.backend, self, kind='Workbooks')
+        self.properties['Workbooks'].item = Workbook
+
+
+# PowerPoint
+
+class TextFrame(Object):
+    children = {'TextRange': Range}
+    defaults = {'MarginBottom': 3.6, 'MarginLeft': 7.2, 'MarginRight': 7.2, 'MarginTop': 3.6, 'VerticalAnchor': 1, 'WordWrap': -1}
+
+
+class Shape(Item):
+    children = {'TextFrame': TextFrame}
+    defaults = {'Height': 0, 'Left': 0, 'Name': '', 'Top': 0, 'Width': 0}
+
+    @member
+    def Duplicate(self):  # noqa: N802
+        shapes = self.get('Parent')
+        shape = shapes.add(**{k: v for k, v in self.properties.items() if k not in ('Name', 'Parent') and not isinstance(v, Object)})
+        return ShapeRange(self.backend, shapes, targets=[shape])
+
+    @member
+    def Ungroup(self):  # noqa: N802
+        raise self.backend.error(message='This member can only be accessed for a group.')
+
+
+class Shapes(Collection):
+    item = Shape
+
+    def add(self, **properties):
+        shape = self.append(**properties)
+        shape.properties['Name'] = f'Shape {len(self.list)}'
+        return shape
+
+    @member
+    def AddLine(self, BeginX, BeginY, EndX, EndY):  # noqa: N802, N803
+        return self.add(Left=min(BeginX, EndX), Top=min(BeginY, EndY), Width=abs(EndX - BeginX), Height=abs(EndY - BeginY))
+
+    @member
+    def AddPicture(self, FileName, LinkToFile=0, SaveWithDocument=-1, Left=0, Top=0, Width=-1, Height=-1):  # noqa: ARG002, N802, N803
+        return self.add(Left=Left, Top=Top, Width=100 if Width < 0 else Width, Height=100 if Height < 0 else Height)
+
+    @member
+    def AddShape(self, Type, Left, Top, Width, Height):  # noqa: N802, N803
+        return self.add(AutoShapeType=Type, Left=Left, Top=Top, Width=Width, Height=Height)
+
+    @member
+    def AddTextbox(self, Orientation, Left, Top, Width, Height):  # noqa: ARG002, N802, N803
+        return self.add(Left=Left, Top=Top, Width=Width, Height=Height)
+
+    @member
+    def Range(self, Index):  # noqa: N802, N803
+        indices = Index if isinstance(Index, (list, tuple)) else [Index]
+        return ShapeRange(self.backend, self, targets=[self.list[i - 1] if isinstance(i, int) else self.Item.__wrapped__(self, i) for i in indices])
+
+
+class ShapeRange(Object):
+    """Several shapes (or their members) at once, with each set applied to all of them in one round-trip."""
+
+    def __init__(self, backend, parent=None, kind=None, targets=()):
+        super().__init__(backend, parent, kind)
+        self.__dict__['targets'] = list(targets)
+
+    def __call__(self, index):
+        return self.Item(index)
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+        self.backend.tick(f'{self.kind}.{name}')
+        return ShapeRange(self.backend, self, kind=name, targets=[target.child(name) for target in self.targets])
+
+    def __setattr__(self, name, value):
+        if name[:1].isupper():
+            self.backend.tick(f'{self.kind}.{name}=')
+            for target in self.targets:
+                target.properties[name] = value
+        else:
+            super().__setattr__(name, value)
+
+    @member
+    def Item(self, index):  # noqa: N802
+        return self.targets[index - 1]
+
+
+class Slide(Item):
+    children = {'Shapes': Shapes}
+    defaults = {'Layout': 12}
+
+    @getter
+    def SlideIndex(self):  # noqa: N802
+        return self.get('Parent').list.index(self) + 1
+
+    @getter
+    def SlideNumber(self):  # noqa: N802
+        return self.get('Parent').list.index(self) + 1
+
+    @member
+    def Select(self):  # noqa: N802
+        if not self.get('Parent').get('Parent').properties.get('WithWindow', -1):
+            raise self.backend.error(message='Slide.Select : Invalid request.  This view does not support selection.')
+        self.root().child('ActiveWindow').child('View').properties['Slide'] = self
+
+
+class Slides(Collection):
+    item = Slide
+
+    def append(self, item=None, index=None, **properties):
+        slide_id = max((x.get('SlideID') for x in self.list), default=255) + 1
+        properties.setdefault('SlideID', slide_id)
+        properties.setdefault('Name', f'Slide{slide_id - 255}')
+        return super().append(item, index, **properties)
+
+    @member
+    def Add(self, Index, Layout):  # noqa: N802, N803
+        return self.append(index=Index, Layout=Layout)
+
+
+class SlideMaster(Object):
+    children = {'Shapes': Shapes}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        shapes = self.properties['Shapes'] = Shapes(self.backend, self)
+        shapes.add(Left=48, Top=28, Width=864, Height=104)
+        shapes.add(Left=48, Top=140, Width=864, Height=344).child('TextFrame').child('TextRange').properties['Text'] = '\r'.join(f'Level {i}' for i in range(1, 6))
+        layouts = self.properties['CustomLayouts'] = Collection(self.backend, self, kind='CustomLayouts')
+        layouts.item = Item
+        for name in ('Title Slide', 'Title and Content', 'Section Header', 'Two Content', 'Comparison', 'Title Only', 'Blank'):
+            layouts.append(Name=name)
+
+
+class PageSetup(Object):
+    defaults = {'SlideHeight': 540, 'SlideWidth': 960}
+
+
+class Presentation(Document):
+    children = {'PageSetup': PageSetup, 'SlideMaster': SlideMaster, 'Slides': Slides}
+
+    def load(self, other):
+        for slide in other.child('Slides').list:
+            copy = self.child('Slides').append(Layout=slide.get('Layout'))
+            for shape in slide.child('Shapes').list:
+                copy.child('Shapes').add(**{k: v for k, v in shape.properties.items() if k in Shape.defaults})
+
+
+class PowerPointApplication(Application):
+    defaults = {'DisplayAlerts': 2, 'Name': 'Microsoft PowerPoint', 'Visible': -1, 'WindowState': 1}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.properties['Presentations'] = Documents(self.backend, self, kind='Presentations')
+        self.properties['Presentations'].item = Presentation
+
+
+APPLICATIONS = {'Excel.Application': ExcelApplication, 'PowerPoint.Application': PowerPointApplication, 'Word.Application': WordApplication}
+
+
+def utf16(text):
+    """Text with characters outside the Basic Multilingual Plane (e.g. emoji) split into their surrogate pairs."""
+    return ''.join(chr(x) if x < 0x10000 else chr(0xD800 + ((x - 0x10000) >> 10)) + chr(0xDC00 + ((x - 0x10000) & 0x3FF)) for x in map(ord, text))
@@ -0,0 +1,116 @@
+"""Images prepared for insertion into documents, downsampled to their display size and cached on disk by content."""
+
+import hashlib
+import io
+import os
+import pathlib
+import shutil
+
+from .util import counters, timer
+
+
+def default_directory():
+    """Per-user cache directory, under %LOCALAPPDATA% on Windows."""
+    root = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    return pathlib.Path(root) / 'OfficePie' / 'images'
+
+
+class Cache:
+    """An on-disk, least-recently-used cache of images prepared for insertion.
+
+    Images are keyed by a hash of their content (and the preparation settings), downsampled to `dpi` at the size they
+    are displayed at, and recompressed. The physical size recorded in an image is kept, so that images inserted without
+    an explicit size appear as before. Downsampling requires Pillow, without which images are inserted as they are.
+    The least recently used images are evicted once the cache exceeds `limit` bytes.
+
+    >>> ppt = PowerPoint()
+    >>> ppt.images = Cache(dpi=150)
+    >>> ppt.add_image('/path/to/figure.png', size=(4, 3))  # at most 600x450 pixels
+    """
+
+    formats = ('JPEG', 'PNG')
+
+    def __init__(self, directory=None, dpi=150, quality=85, limit=1 << 30):
+        self.directory = pathlib.Path(default_directory() if directory is None else directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dpi = dpi
+        self.quality = quality
+        self.limit = limit
+        self._digests = {}
+
+    def digest(self, filepath):
+        """Content hash of a file, memoized by path, modification time and size."""
+        stat = os.stat(filepath)
+        key = str(filepath), stat.st_mtime_ns, stat.st_size
+        if key not in self._digests:
+            sha = hashlib.sha256()
+            with open(filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            self._digests[key] = sha.hexdigest()
+        return self._digests[key]
+
+    def evict(self):
+        files = sorted((x.stat().st_mtime, x.stat().st_size, x) for x in self.directory.iterdir() if x.is_file())
+        total = sum(size for _, size, _ in files)
+        for _, size, filepath in files:
+            if total <= self.limit:
+                break
+            filepath.unlink(missing_ok=True)
+            total -= size
+            counters['image.evicted'] += 1
+
+    def prepare(self, filepath, size=None):
+        """Path of an image prepared for display at `size` (width, height) in inches, or of the original if unsupported."""
+        filepath = pathlib.Path(filepath)
+        key = hashlib.sha256(f'{self.digest(filepath)}:{size}:{self.dpi}:{self.quality}'.encode()).hexdigest()[:32]
+        output = self.directory / f'{key}{filepath.suffix.lower()}'
+        if output.is_file():
+            os.utime(output)
+            counters['image.hit'] += 1
+            return output
+        counters['image.miss'] += 1
+        with timer('image'):
+            if not self._prepare(filepath, output, size):
+                return filepath
+        self.evict()
+        return output
+
+    def _prepare(self, filepath, output, size):
+        data = resample(filepath, size, self.dpi, self.quality, self.formats)
+        if data is None:
+            return False
+        temp = output.with_name(f'{output.stem}.tmp{output.suffix}')
+        if len(data) < filepath.stat().st_size:
+            temp.write_bytes(data)
+        else:
+            shutil.copyfile(filepath, temp)
+        os.replace(temp, output)
+        return True
+
+
+def resample(source, size=None, dpi=150, quality=85, formats=Cache.formats):
+    """Image (a filepath or file object) downsampled to `dpi` at `size` (width, height) in inches and recompressed.
+
+    Returns the encoded bytes, in the format of the source, or None if Pillow is unavailable or the format unsupported.
+    The physical size recorded in the image is kept.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    with Image.open(source) as image:
+        if image.format not in formats:
+            return None
+        image_format = image.format
+        width, height = image.size
+        resolution = image.info.get('dpi', (96, 96))  # Office assumes 96 DPI when none is recorded
+        scale = 1.0 if size is None else min(1.0, max(size[0] * dpi / width, size[1] * dpi / height))
+        if scale < 1:
+            if image.mode == 'P':
+                image = image.convert('RGBA')
+            image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+        kwargs = {'quality': quality} if image_format == 'JPEG' else {}
+        output = io.BytesIO()
+        image.save(output, image_format, optimize=True, dpi=(resolution[0] * scale, resolution[1] * scale), **kwargs)
+    return output.getvalue()
@@ -0,0 +1,290 @@
+"""A local search index over the text of Office documents (.docx, .pptx, .xlsx), extracted without Office.
+
+    python -m office.index corpus.sqlite --update //server/share --processes 8
+    python -m office.index corpus.sqlite --search "budget NEAR/5 forecast" --kind notes
+"""
+
+import argparse
+import collections
+import hashlib
+import os
+import pathlib
+import sqlite3
+import typing
+import xml.etree.ElementTree as ET
+
+from . import docx, ooxml, pptx
+from .ooxml import qn
+
+SUFFIXES = ('.docx', '.docm', '.pptx', '.pptm', '.xlsx', '.xlsm')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, digest TEXT, error TEXT);
+CREATE TABLE IF NOT EXISTS parts (id INTEGER PRIMARY KEY, path TEXT, part TEXT, kind TEXT, author TEXT);
+CREATE INDEX IF NOT EXISTS parts_path ON parts (path);
+CREATE INDEX IF NOT EXISTS parts_author ON parts (author);
+"""
+
+
+class Match(typing.NamedTuple):
+    path: str
+    part: str
+    kind: str  # 'text', 'slide', 'notes', 'comment' or 'revision'
+    author: str
+    text: str
+
+
+class Index:
+    """Text, speaker notes, comments and revisions of documents, stored in SQLite and searched with full-text queries.
+
+    Files are keyed by path, modification time and size, then by content hash, so that updates only extract documents
+    that changed. Extraction runs in `processes` worker processes if given. Queries use the FTS5 syntax where SQLite
+    supports it (e.g. 'budget AND forecast', '"exact phrase"', 'fore*'), and match substrings otherwise.
+
+    >>> with Index('/path/to/corpus.sqlite') as index:
+    >>>     index.update(['/path/to/documents'], processes=8)
+    >>>     for match in index.search('forecast', kind='notes'):
+    >>>         print(match.path, match.part, match.text)
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.db = sqlite3.connect(str(filepath))
+        self.db.executescript(SCHEMA)
+        try:
+            self.db.execute('CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5 (text)')
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self.db.execute('CREATE TABLE IF NOT EXISTS texts (id INTEGER PRIMARY KEY, text TEXT)')
+        self.fts = 'fts5' in self.db.execute("SELECT sql FROM sqlite_master WHERE name = 'texts'").fetchone()[0].lower()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def authors(self):
+        """Number of documents with revisions by each author."""
+        return dict(self.db.execute("SELECT author, COUNT(DISTINCT path) FROM parts WHERE kind = 'revision' GROUP BY author ORDER BY author"))
+
+    def close(self):
+        self.db.close()
+
+    def search(self, query=None, kind=None, author=None, limit=100):
+        """Parts matching a query, of a kind and by an author if given, with matches highlighted in [brackets]."""
+        conditions, parameters = [], []
+        if query is not None:
+            conditions.append('texts MATCH ?' if self.fts else 'texts.text LIKE ?')
+            parameters.append(query if self.fts else f'%{query}%')
+        for column, value in (('kind', kind), ('author', author)):
+            if value is not None:
+                conditions.append(f'parts.{column} = ?')
+                parameters.append(value)
+        text = "snippet(texts, 0, '[', ']', '...', 16)" if self.fts and query is not None else 'texts.text'
+        order = 'ORDER BY rank' if self.fts and query is not None else 'ORDER BY parts.path, parts.id'
+        sql = f'SELECT parts.path, parts.part, parts.kind, parts.author, {text} FROM texts JOIN parts ON parts.id = texts.rowid'
+        rows = self.db.execute(f'{sql} WHERE {" AND ".join(conditions) or "1"} {order} LIMIT ?', (*parameters, limit))
+        if self.fts or query is None:
+            return [Match(*row) for row in rows]
+        return [Match(*row[:4], _snippet(row[4], query)) for row in rows]
+
+    def update(self, paths, processes=None):
+        """Index documents, and those within directories, returning the number of files added, changed, unchanged, removed and failed.
+
+        Files previously indexed under the given directories that no longer exist are removed.
+        """
+        files, directories = {}, []
+        for path in (pathlib.Path(x).resolve() for x in paths):
+            if path.is_dir():
+                directories.append(str(path))
+                files.update((str(x), x.stat()) for x in path.rglob('*') if x.suffix.lower() in SUFFIXES and not x.name.startswith('~$') and x.is_file())
+            else:
+                files[str(path)] = path.stat()
+        known = {path: (mtime, size, digest) for path, mtime, size, digest in self.db.execute('SELECT path, mtime, size, digest FROM files')}
+        counts = collections.Counter()
+        pending = []
+        for path, stat in files.items():
+            if known.get(path, (None, None))[:2] == (stat.st_mtime_ns, stat.st_size):
+                counts['unchanged'] += 1
+            else:
+                pending.append(path)
+        removed = [path for path in known if path not in files and any(path.startswith(os.path.join(x, '')) for x in directories)]
+        with self.db:
+            for path in removed:
+                self._remove(path)
+                self.db.execute('DELETE FROM files WHERE path = ?', (path,))
+            counts['removed'] = len(removed)
+        digests = [known[path][2] if path in known else None for path in pending]
+        for i, (path, digest, rows, error) in enumerate(_extract_all(pending, digests, processes)):
+            stat = files[path]
+            if error is not None:
+                counts['failed'] += 1
+            elif rows is None:
+                counts['unchanged'] += 1
+            else:
+                counts['changed' if path in known else 'added'] += 1
+                self._remove(path)
+                for part, kind, author, text in rows:
+                    rowid = self.db.execute('INSERT INTO parts (path, part, kind, author) VALUES (?, ?, ?, ?)', (path, part, kind, author)).lastrowid
+                    self.db.execute('INSERT INTO texts (rowid, text) VALUES (?, ?)', (rowid, text))
+            self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)', (path, stat.st_mtime_ns, stat.st_size, digest, error))
+            if i % 500 == 499:
+                self.db.commit()
+        self.db.commit()
+        return counts
+
+    def _remove(self, path):
+        self.db.execute('DELETE FROM texts WHERE rowid IN (SELECT id FROM parts WHERE path = ?)', (path,))
+        self.db.execute('DELETE FROM parts WHERE path = ?', (path,))
+
+
+def extract(filepath):
+    """Text of a document as (part, kind, author, text) rows.
+
+    Presentations give the text of each slide, its speaker notes and comments; documents give the text of each story
+    (body, headers, footers, footnotes, endnotes), comments, and the text of revisions by each author; workbooks give
+    shared and inline strings, and comments. Paragraphs are separated by newlines.
+    """
+    with ooxml.Package(filepath) as package:
+        main = package.main()
+        if main.startswith('ppt/'):
+            return list(_presentation(package))
+        if main.startswith('word/'):
+            return list(_document(package))
+        if main.startswith('xl/'):
+            return list(_workbook(package))
+        raise ValueError(f'Unrecognized document: {main}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indexes and searches the text of Office documents, without Office')
+    parser.add_argument('index', help='Index file, created if needed')
+    parser.add_argument('--update', nargs='+', default=[], metavar='PATH', help='Documents, or directories of documents, to index')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Number of worker processes to extract text with')
+    parser.add_argument('--search', help='Full-text query')
+    parser.add_argument('--kind', choices=('text', 'slide', 'notes', 'comment', 'revision'), help='Kind of text to search')
+    parser.add_argument('--author', help='Author of comments or revisions to search')
+    parser.add_argument('--limit', type=int, default=100, help='Maximum number of matches')
+    args = parser.parse_args()
+
+    with Index(args.index) as index:
+        if args.update:
+            counts = index.update(args.update, args.processes)
+            print(', '.join(f'{counts[x]} {x}' for x in ('added', 'changed', 'unchanged', 'removed', 'failed')))
+        if args.search or args.kind or args.author:
+            for match in index.search(args.search, args.kind, args.author, args.limit):
+                author = f' ({match.author})' if match.author else ''
+                print(f'{match.path} [{match.part}] {match.kind}{author}: {" ".join(match.text.split())}')
+
+
+def _digest(filepath):
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _document(package):
+    for part in docx.story_parts(package):
+        if part.startswith('word/comments'):
+            for comment in package.parse(part).iter(qn('w:comment')):
+                yield part, 'comment', comment.get(qn('w:author')), _join(comment, qn('w:p'), (qn('w:t'),))
+            continue
+        paragraphs = []
+        revisions = collections.defaultdict(list)
+        with package.open(part) as f:
+            for _, element in ET.iterparse(f):
+                if element.tag in (qn('w:ins'), qn('w:del')):
+                    revisions[element.get(qn('w:author'))].append(''.join(x.text or '' for x in element.iter() if x.tag in (qn('w:t'), qn('w:delText'))))
+                elif element.tag == qn('w:p'):
+                    paragraphs.append(''.join(x.text or '' for x in element.iter(qn('w:t'))))
+                    element.clear()
+        yield part, 'text', None, '\n'.join(paragraphs)
+        for author, texts in revisions.items():
+            yield part, 'revision', author, '\n'.join(x for x in texts if x)
+
+
+def _extract(path, digest=None):
+    """Digest and rows of a document, without rows if its digest is unchanged, or the error raised extracting it."""
+    try:
+        new = _digest(path)
+        return path, new, None if new == digest else extract(path), None
+    except Exception as error:  # noqa: BLE001
+        return path, None, None, f'{type(error).__name__}: {error}'
+
+
+def _extract_all(paths, digests, processes):
+    if not processes:
+        yield from map(_extract, paths, digests)
+        return
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        yield from executor.map(_extract, paths, digests, chunksize=max(1, min(64, len(paths) // (4 * processes))))
+
+
+def _join(element, paragraph, texts):
+    """Text of the paragraphs within an element, one per line."""
+    return '\n'.join(''.join(x.text or '' for x in p.iter() if x.tag in texts) for p in element.iter(paragraph))
+
+
+def _local(tag):
+    return tag.rpartition('}')[2]
+
+
+def _presentation(package):
+    authors = {}
+    for rel in package.rels(package.main()):
+        if rel.type in ('commentAuthors', 'authors') and not rel.external and rel.target in package:
+            authors.update((x.get('id'), x.get('name')) for x in package.parse(rel.target).iter() if x.get('id') is not None and x.get('name') is not None)
+    for slide in pptx.slide_parts(package):
+        yield slide, 'slide', None, _join(package.parse(slide), qn('a:p'), (qn('a:t'),))
+        for rel in package.rels(slide):
+            if rel.external or rel.target not in package:
+                continue
+            if rel.type == 'notesSlide':
+                root = package.parse(rel.target)
+                shapes = [x for x in root.iter(qn('p:sp')) if all(ph.get('type') in (None, 'body') for ph in x.iter(qn('p:ph')))]
+                yield rel.target, 'notes', None, '\n'.join(_join(x, qn('a:p'), (qn('a:t'),)) for x in shapes)
+            elif rel.type == 'comments':
+                for comment in package.parse(rel.target).iter():
+                    if _local(comment.tag) in ('cm', 'reply') and comment.get('authorId') is not None:
+                        text = next((x.text or '' for x in comment if _local(x.tag) == 'text'), None)  # legacy comments
+                        if text is None:
+                            text = '\n'.join(_join(x, qn('a:p'), (qn('a:t'),)) for x in comment if _local(x.tag) == 'txBody')
+                        yield rel.target, 'comment', authors.get(comment.get('authorId')), text
+
+
+def _snippet(text, query, width=60):
+    i = text.lower().find(query.lower())
+    return f'{"..." if i > width else ""}{text[max(0, i - width):i]}[{text[i:i + len(query)]}]{text[i + len(query):i + len(query) + width]}'
+
+
+def _workbook(package):
+    workbook = package.main()
+    strings = next((rel.target for rel in package.rels(workbook) if rel.type == 'sharedStrings' and rel.target in package), None)
+    if strings is not None:
+        yield strings, 'text', None, _join(package.parse(strings), qn('x:si'), (qn('x:t'),))
+    for rel in package.rels(workbook):
+        if rel.type != 'worksheet' or rel.target not in package:
+            continue
+        inline = []
+        with package.open(rel.target) as f:
+            for _, element in ET.iterparse(f):
+                if element.tag == qn('x:is'):
+                    inline.append(''.join(x.text or '' for x in element.iter(qn('x:t'))))
+                elif element.tag == qn('x:row'):
+                    element.clear()
+        if inline:
+            yield rel.target, 'text', None, '\n'.join(inline)
+        for comments in package.rels(rel.target):
+            if comments.type == 'comments' and comments.target in package:
+                root = package.parse(comments.target)
+                authors = [x.text for x in root.iter(qn('x:author'))]
+                for comment in root.iter(qn('x:comment')):
+                    author = int(comment.get('authorId', -1))
+                    yield comments.target, 'comment', authors[author] if 0 <= author < len(authors) else None, _join(comment, qn('x:text'), (qn('x:t'),))
+
+
+if __name__ == '__main__':
+    main()
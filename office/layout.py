@@ -0,0 +1,112 @@
+"""Arrangement of many shapes at once, with geometry read once, positions computed in Python, and written in one pass."""
+
+import math
+
+from .util import inch
+
+EDGES = {'left': ('Left', 0), 'center': ('Left', 0.5), 'right': ('Left', 1), 'top': ('Top', 0), 'middle': ('Top', 0.5), 'bottom': ('Top', 1)}
+
+
+class Layout:
+    """Arrange shapes of a presentation in grids, rows and columns, or align and distribute them.
+
+    Blocks of shapes are positioned as by `PowerPoint.move_shape`, with `position` (x, y) offset from the `reference`
+    of the slide (e.g. 'upper left', 'center', 'lower right'), in inches unless `inches` is False. Each shape is read
+    once, and only written where its position changes. Returns the new (left, top) of each shape,
+    in points.
+
+    >>> layout = Layout(ppt)
+    >>> shapes = [ppt.add_image(x, size=(2, 1.5)) for x in filepaths]
+    >>> layout.grid(shapes, columns=5, spacing=(0.1, 0.1), position=(0, 0.5), reference='center')
+    >>> layout.align(shapes[:5], 'top')
+    """
+
+    def __init__(self, ppt):
+        self.ppt = ppt
+        self._slide = None
+
+    def align(self, shapes, edge, relative=False):
+        """Align the left, center, right, top, middle or bottom edges of shapes, to each other or to the slide."""
+        name, fraction = EDGES[edge]
+        geometry = self._read(shapes)
+        size = 'Width' if name == 'Left' else 'Height'
+        if relative:
+            target = fraction * self._slide_size()[name == 'Top']
+        else:
+            low = min(x[name] for x in geometry)
+            high = max(x[name] + x[size] for x in geometry)
+            target = low + fraction * (high - low)
+        return self._write(shapes, geometry, [{**x, name: target - fraction * x[size]} for x in geometry])
+
+    def column(self, shapes, spacing=0, position=(0, 0), reference='center', inches=True):
+        return self.grid(shapes, columns=1, spacing=(0, spacing), position=position, reference=reference, inches=inches)
+
+    def distribute(self, shapes, direction='horizontal', relative=False):
+        """Space shapes evenly, horizontally or vertically, between the outermost ones or across the slide."""
+        name, size = ('Left', 'Width') if direction == 'horizontal' else ('Top', 'Height')
+        geometry = self._read(shapes)
+        order = sorted(range(len(shapes)), key=lambda i: geometry[i][name])
+        if relative:
+            low, high = 0, self._slide_size()[name == 'Top']
+        else:
+            low, high = min(x[name] for x in geometry), max(x[name] + x[size] for x in geometry)
+        gap = (high - low - sum(x[size] for x in geometry)) / max(1, len(shapes) - 1)
+        positions = [dict(x) for x in geometry]
+        for i in order:
+            positions[i][name] = low
+            low += geometry[i][size] + gap
+        return self._write(shapes, geometry, positions)
+
+    def grid(self, shapes, columns=None, rows=None, spacing=(0, 0), position=(0, 0), reference='center', inches=True):
+        """Arrange shapes row by row in a grid, centered in cells as wide as their column and as tall as their row.
+
+        The grid is as square as possible unless the number of `columns` or `rows` is given.
+        """
+        if not shapes:
+            return []
+        if columns is None:
+            columns = math.ceil(len(shapes) / rows) if rows else math.ceil(math.sqrt(len(shapes)))
+        rows = math.ceil(len(shapes) / columns)
+        geometry = self._read(shapes, ('Width', 'Height'))  # positions are all written anyway
+        widths = [max(x['Width'] for x in geometry[c::columns]) for c in range(columns)]
+        heights = [max(x['Height'] for x in geometry[r * columns:(r + 1) * columns]) for r in range(rows)]
+        (sx, sy), (x, y) = ((inch(a), inch(b)) if inches else (a, b) for a, b in (spacing, position))
+        left, top = _place(reference, x, y, sum(widths) + sx * (columns - 1), sum(heights) + sy * (rows - 1), *self._slide_size())
+        lefts = [left + sum(widths[:c]) + sx * c for c in range(columns)]
+        tops = [top + sum(heights[:r]) + sy * r for r in range(rows)]
+        positions = []
+        for i, shape in enumerate(geometry):
+            r, c = divmod(i, columns)
+            positions.append({**shape, 'Left': lefts[c] + (widths[c] - shape['Width']) / 2, 'Top': tops[r] + (heights[r] - shape['Height']) / 2})
+        return self._write(shapes, geometry, positions)
+
+    def row(self, shapes, spacing=0, position=(0, 0), reference='center', inches=True):
+        return self.grid(shapes, rows=1, spacing=(spacing, 0), position=position, reference=reference, inches=inches)
+
+    def _read(self, shapes, names=('Left', 'Top', 'Width', 'Height')):
+        return [{name: getattr(shape, name) for name in names} for shape in shapes]
+
+    def _slide_size(self):
+        """Width and height of slides, read once."""
+        if self._slide is None:
+            setup = self.ppt.doc.PageSetup
+            self._slide = setup.SlideWidth, setup.SlideHeight
+        return self._slide
+
+    def _write(self, shapes, geometry, positions):
+        with self.ppt.bulk():
+            for shape, old, new in zip(shapes, geometry, positions):
+                for name in ('Left', 'Top'):
+                    if new[name] != old.get(name):
+                        setattr(shape, name, new[name])
+        return [(x['Left'], x['Top']) for x in positions]
+
+
+def _place(reference, x, y, width, height, slide_width, slide_height):
+    """Left and top of a box of the given size, placed as by `PowerPoint.move_shape`."""
+    references = reference.split()
+    top = references[0]
+    left = references[1] if len(references) > 1 else 'center'
+    tops = {'upper': y, 'center': (slide_height - height) / 2 + y, 'lower': slide_height - height - y}
+    lefts = {'left': x, 'center': (slide_width - width) / 2 + x, 'right': slide_width - width - x}
+    return lefts[left], tops[top]
@@ -0,0 +1,260 @@
+"""Office Open XML (OOXML) packages, read directly without Office.
+
+See https://learn.microsoft.com/en-us/openspecs/office_standards/ms-oe376.
+"""
+
+import mmap
+import posixpath
+import struct
+import typing
+import xml.etree.ElementTree as ET
+import zipfile
+
+DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+
+EMU = 914400  # English Metric Units (of DrawingML lengths) per inch
+
+# general purpose flags of zip members that can be copied raw: deflate options, data descriptor and UTF-8 names
+RAW_FLAGS = 0x6 | 0x8 | 0x800
+
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'ct': 'http://schemas.openxmlformats.org/package/2006/content-types',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'pr': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+    'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+XML = 'http://www.w3.org/XML/1998/namespace'
+
+
+class Relationship(typing.NamedTuple):
+    id: str  # noqa: A003
+    type: str  # noqa: A003
+    target: str
+    external: bool
+
+
+class Tree(typing.NamedTuple):
+    """A parsed part, with the namespace prefixes and declarations of its source so that it can be written back as is.
+
+    ElementTree renames prefixes on output, which breaks attributes that refer to them (e.g. mc:Ignorable).
+    """
+    root: ET.Element
+    prefixes: dict
+    declarations: dict
+
+    def tostring(self):
+        chunks = [DECLARATION]
+        write_element(chunks.append, self.root, self.prefixes, dict(self.declarations))
+        return ''.join(chunks).encode('utf-8')
+
+
+def escape(text, attribute=False):
+    """Escape character data, or an attribute value, as xml.sax.saxutils does (without importing urllib)."""
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if attribute:
+        text = text.replace('"', '&quot;').replace('\n', '&#10;').replace('\r', '&#13;').replace('\t', '&#9;')
+    return text
+
+
+def qn(name):
+    """Expand a prefixed name (e.g. 'w:ins') to ElementTree's '{namespace}local' notation."""
+    prefix, local = name.split(':')
+    return f'{{{NS[prefix]}}}{local}'
+
+
+def read_tree(source):
+    """Parse a part from a file object into a `Tree`."""
+    parser = ET.XMLPullParser(events=('start-ns', 'start'))
+    prefixes = {XML: 'xml'}
+    declarations = {}
+    pending = []
+    root = None
+    for chunk in iter(lambda: source.read(1 << 16), b''):
+        parser.feed(chunk)
+        for event, data in parser.read_events():
+            if event == 'start-ns':
+                prefixes[data[1]] = data[0]
+                pending.append(data)
+            else:
+                if root is None:
+                    root = data
+                if pending:
+                    declarations[data] = pending
+                    pending = []
+    parser.close()
+    return Tree(root, prefixes, declarations)
+
+
+def rels_name(part):
+    """Name of the relationships part for a given part ('' for the package itself)."""
+    directory, filename = posixpath.split(part)
+    return posixpath.join(directory, '_rels', f'{filename}.rels')
+
+
+class Package:
+    """An index over the parts and relationships of an OOXML package, read lazily.
+
+    Only the zip directory is read on opening. Relationships are resolved, and parts decompressed and parsed, as they
+    are accessed. Copies of the package are saved with unchanged members copied raw from a memory map of the file.
+
+    >>> with Package('/path/to/file.pptx') as package:
+    >>>     for rel in package.rels('ppt/presentation.xml'):
+    >>>         print(rel.type, rel.target, package.size(rel.target))
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')  # noqa: SIM115
+        self._map = None
+        self.zip = zipfile.ZipFile(self._file)
+        self.parts = {info.filename: info for info in self.zip.infolist() if not info.is_dir()}
+        self._rels = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, part):
+        return part in self.parts
+
+    def close(self):
+        self.zip.close()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def copy(self, zout, part):
+        """Copy a member into another zip file as is, without decompressing and recompressing it.
+
+        Members are copied raw into seekable outputs, with their sizes and CRC written into the local header (in place of
+        a data descriptor), which ZipFile has no API for. Other members, e.g. encrypted ones, and other outputs (such as
+        pipes) go through ZipFile instead.
+        """
+        info = self.zip.getinfo(part)
+        target = zipfile.ZipInfo(info.filename, info.date_time)
+        target.compress_type = info.compress_type
+        target.create_system = info.create_system
+        target.external_attr = info.external_attr
+        if info.flag_bits & ~RAW_FLAGS or not getattr(zout.fp, 'seekable', lambda: False)():
+            zout.writestr(target, self.zip.read(info))  # which raises for encrypted members, rather than dropping their encryption
+            return
+        if self._map is None:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        filename_length, extra_length = struct.unpack('<HH', self._map[info.header_offset + 26:info.header_offset + 30])
+        start = info.header_offset + 30 + filename_length + extra_length
+        target.flag_bits = info.flag_bits & 0x6  # deflate options, whereas names are flagged as UTF-8 as they are written
+        target.CRC = info.CRC
+        target.compress_size = info.compress_size
+        target.file_size = info.file_size
+        zout.fp.seek(zout.start_dir)
+        target.header_offset = zout.fp.tell()
+        zout.fp.write(target.FileHeader())
+        with memoryview(self._map) as view:
+            for offset in range(start, start + info.compress_size, 1 << 24):
+                zout.fp.write(view[offset:min(offset + (1 << 24), start + info.compress_size)])
+        zout.start_dir = zout.fp.tell()
+        zout.filelist.append(target)
+        zout.NameToInfo[target.filename] = target
+
+    def read(self, part):
+        return self.zip.read(self.parts[part])
+
+    def open(self, part):  # noqa: A003
+        return self.zip.open(self.parts[part])
+
+    def parse(self, part):
+        return ET.fromstring(self.read(part))
+
+    def save(self, output, parts=None):
+        """Write the package to `output`, with the given parts replaced, added, or (if None) removed.
+
+        Other members are copied without decompressing them, so that time and memory scale with the changes only.
+        """
+        parts = {} if parts is None else parts
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for info in self.zip.infolist():
+                if info.filename not in parts:
+                    self.copy(zout, info.filename)
+                elif parts[info.filename] is not None:
+                    zout.writestr(zipfile.ZipInfo(info.filename, info.date_time), parts[info.filename], info.compress_type)
+            for part, data in parts.items():
+                if data is not None and part not in self.zip.NameToInfo:
+                    zout.writestr(part, data)
+        return output
+
+    def size(self, part, compressed=True):
+        info = self.parts[part]
+        return info.compress_size if compressed else info.file_size
+
+    def tree(self, part):
+        with self.open(part) as f:
+            return read_tree(f)
+
+    def rels(self, part=''):
+        """Relationships of a part, with internal targets resolved to part names."""
+        if part not in self._rels:
+            name = rels_name(part)
+            rels = []
+            if name in self.parts:
+                for element in self.parse(name).iter(f'{{{NS["pr"]}}}Relationship'):
+                    target = element.get('Target')
+                    external = element.get('TargetMode') == 'External'
+                    if not external:
+                        target = target[1:] if target.startswith('/') else posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+                    rels.append(Relationship(element.get('Id'), element.get('Type').rsplit('/', 1)[-1], target, external))
+            self._rels[part] = rels
+        return self._rels[part]
+
+    def rel(self, part, rid):
+        return next(rel for rel in self.rels(part) if rel.id == rid)
+
+    def main(self):
+        """Name of the main document part (e.g. 'word/document.xml')."""
+        return next(rel.target for rel in self.rels() if rel.type == 'officeDocument')
+
+    def reachable(self, part, stop=()):
+        """All parts reachable from a part through internal relationships, without traversing into parts of the given types."""
+        parts = set()
+        pending = [part]
+        while pending:
+            for rel in self.rels(pending.pop()):
+                if not rel.external and rel.type not in stop and rel.target not in parts and rel.target in self.parts:
+                    parts.add(rel.target)
+                    pending.append(rel.target)
+        parts.discard(part)
+        return parts
+
+
+def start_tag(element, prefixes, declarations, close=False):
+    attributes = ''.join(f' xmlns:{prefix}="{escape(uri)}"' if prefix else f' xmlns="{escape(uri)}"' for prefix, uri in declarations)
+    attributes += ''.join(f' {tag_name(key, prefixes)}="{escape(value, attribute=True)}"' for key, value in element.attrib.items())
+    return f'<{tag_name(element.tag, prefixes)}{attributes}{"/" if close else ""}>'
+
+
+def tag_name(tag, prefixes):
+    """Prefixed name of a tag (or attribute) in ElementTree's '{namespace}local' notation."""
+    if tag[0] != '{':
+        return tag
+    uri, local = tag[1:].split('}')
+    return f'{prefixes[uri]}:{local}' if prefixes[uri] else local
+
+
+def write_element(write, element, prefixes, declarations):
+    """Serialize an element with its source prefixes, declaring namespaces where they were originally declared."""
+    if not len(element) and not element.text:
+        write(start_tag(element, prefixes, declarations.pop(element, ()), close=True))
+    else:
+        write(start_tag(element, prefixes, declarations.pop(element, ())))
+        if element.text:
+            write(escape(element.text))
+        for child in element:
+            write_element(write, child, prefixes, declarations)
+        write(f'</{tag_name(element.tag, prefixes)}>')
+    if element.tail:
+        write(escape(element.tail))
@@ -0,0 +1,153 @@
+import collections
+import concurrent.futures
+import contextlib
+import logging
+import pathlib
+import queue
+import threading
+
+from . import backend as backends
+from .application import Excel, PowerPoint, Word
+
+PROGRAMS = {
+    '.doc': Word, '.docm': Word, '.docx': Word,
+    '.xls': Excel, '.xlsm': Excel, '.xlsx': Excel,
+    '.ppt': PowerPoint, '.pptm': PowerPoint, '.pptx': PowerPoint}
+
+logger = logging.getLogger(__name__)
+
+
+class Pool:
+    """Bounded sets of long-lived Office application instances, each leased one document at a time.
+
+    Every instance is owned by a worker thread (and its COM apartment), up to `size` per program type. Documents are
+    opened in an idle instance, passed to `func`, optionally saved, and closed again. An instance is recycled after
+    `recycle` documents, when it fails a health check, or when a COM error escapes `func`. An instance that cannot quit,
+    e.g. as `func` left documents open, is logged and forced to quit without saving them. Note that PowerPoint only ever
+    runs a single process, so its instances share it.
+
+    >>> with Pool(size=2, recycle=100) as pool:
+    >>>     futures = [pool.submit(lambda w: list(w.mark_revisions()), x, x.with_suffix('.marked.docx')) for x in filepaths]
+    >>>     for future in concurrent.futures.as_completed(futures):
+    >>>         future.result()
+    """
+
+    def __init__(self, size=2, recycle=100, programs=None, backend=None):
+        self.size = size
+        self.recycle = recycle
+        self.programs = PROGRAMS if programs is None else programs
+        self.backend = backends.get() if backend is None else backend
+        self.stats = collections.Counter()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def map(self, func, filepaths):  # noqa: A003
+        futures = [self.submit(func, filepath) for filepath in filepaths]
+        for future in futures:
+            yield future.result()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+            for jobs in self._queues.values():
+                for _ in range(self.size):
+                    jobs.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def submit(self, func, filepath, output=None, program=None):
+        """Schedule `func(instance)` with `instance.doc` set to the leased document, saving it to `output` if given."""
+        if program is None:
+            program = self.programs[pathlib.Path(filepath).suffix.lower()]
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Cannot submit to a pool that was shut down')
+            if program not in self._queues:
+                self._queues[program] = queue.Queue()
+                for _ in range(self.size):
+                    thread = threading.Thread(target=self._work, args=(program, self._queues[program]), daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+            self._queues[program].put((future, func, filepath, output))
+        return future
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _healthy(self, instance):
+        try:
+            instance.app.Name  # noqa: B018
+        except self.backend.error:
+            self._count('unhealthy')
+            return False
+        return True
+
+    def _retire(self, instance):
+        with contextlib.suppress(self.backend.error, RuntimeError):
+            if instance.doc is not None:
+                instance.close(alert=False)
+        try:
+            instance.quit()
+        except (self.backend.error, RuntimeError) as error:
+            logger.warning('Forcing %s to quit: %s', instance.application, error)
+            self._count('forced')
+            with contextlib.suppress(self.backend.error):
+                instance.quit(force=True)
+        self._count('recycled')
+
+    def _work(self, program, jobs):
+        self.backend.initialize()
+        instance = None
+        count = 0
+        try:
+            while (job := jobs.get()) is not None:
+                future, func, filepath, output = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if instance is not None and (count >= self.recycle or not self._healthy(instance)):
+                    self._retire(instance)
+                    instance = None
+                try:
+                    if instance is None:
+                        instance = program(str(filepath), visible=False, backend=self.backend)
+                        count = 0
+                        self._count('started')
+                    else:
+                        instance.open(str(filepath), visible=False)
+                    count += 1
+                    self._count('leased')
+                    result = func(instance)
+                    if output is not None:
+                        instance.doc.SaveAs(str(output))
+                    instance.close(alert=False)
+                    instance.doc = None
+                except self.backend.error as error:
+                    self._count('failed')
+                    future.set_exception(error)
+                    if instance is not None:
+                        self._retire(instance)
+                        instance = None
+                except Exception as error:  # noqa: BLE001
+                    self._count('failed')
+                    future.set_exception(error)
+                    if instance is not None:
+                        with contextlib.suppress(self.backend.error):
+                            instance.close(alert=False)
+                            instance.doc = None
+                else:
+                    future.set_result(result)
+        finally:
+            if instance is not None:
+                self._retire(instance)
+            self.backend.uninitialize()
@@ -0,0 +1,134 @@
+"""PowerPoint presentations (.pptx), read directly without Office."""
+
+import collections
+import functools
+import pathlib
+import typing
+
+from . import ooxml
+
+
+class SlideSize(typing.NamedTuple):
+    index: int
+    part: str
+    size: float
+    exclusive: int
+    shared: float
+    parts: list
+    shared_parts: list
+
+
+# relationship types that lead out of a slide, into deck-wide parts or other slides
+SLIDE_BOUNDARY = ('slide', 'slideMaster', 'notesMaster', 'handoutMaster', 'presentation')
+
+P14 = 'http://schemas.microsoft.com/office/powerpoint/2010/main'
+
+
+def export_slides(filepath, indices, out_dir, processes=None):
+    """Split a presentation into one file per slide, or per range of slides given as (first, last), in a single pass.
+
+    Each file gets the deck-wide parts (presentation, masters, layouts, themes, properties) and only the parts its own
+    slides reach, copied as is; references to other slides are dropped. Slides are numbered from 1, as in PowerPoint.
+    Files are written by `processes` worker processes if given, each opening the package once. Returns the filepaths
+    written, named after the source and slide numbers (e.g. 'deck 3.pptx', 'deck 4-6.pptx').
+    """
+    filepath, out_dir = pathlib.Path(filepath), pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for index in indices:
+        first, last = (index, index) if isinstance(index, int) else index
+        jobs.append((range(first, last + 1), out_dir / f'{filepath.stem} {first}{"" if first == last else f"-{last}"}{filepath.suffix}'))
+    if not processes:
+        with ooxml.Package(filepath) as package:
+            return [_export(package, slides, output) for slides, output in jobs]
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        chunksize = max(1, len(jobs) // (4 * processes))
+        return list(executor.map(_export_file, [filepath] * len(jobs), *zip(*jobs), chunksize=chunksize))
+
+
+def slide_parts(package):
+    """Slide part names, in presentation order."""
+    presentation = package.main()
+    return [package.rel(presentation, element.get(ooxml.qn('r:id'))).target for element in package.parse(presentation).iter(ooxml.qn('p:sldId'))]
+
+
+def slide_sizes(filepath, compressed=True):
+    """Attribute package size to slides, by following the relationship graph of each slide.
+
+    Each slide is charged its XML, its relationships, and every part it reaches (layouts, notes, media, charts, embeddings),
+    without traversing into masters or other slides. Parts reached by several slides are split evenly among them and
+    reported in `shared_parts`. Deck-wide parts (masters, themes, properties) are not charged to any slide.
+    """
+    with ooxml.Package(filepath) as package:
+        def size(part):
+            rels = ooxml.rels_name(part)
+            return package.size(part, compressed) + (package.size(rels, compressed) if rels in package else 0)
+
+        slides = slide_parts(package)
+        reach = [package.reachable(slide, stop=SLIDE_BOUNDARY) for slide in slides]
+        users = collections.Counter(part for parts in reach for part in parts)
+        for i, (slide, parts) in enumerate(zip(slides, reach)):
+            exclusive = size(slide) + sum(size(part) for part in parts if users[part] == 1)
+            shared_parts = sorted(part for part in parts if users[part] > 1)
+            shared = sum(size(part) / users[part] for part in shared_parts)
+            yield SlideSize(i + 1, slide, exclusive + shared, exclusive, shared, sorted(parts), shared_parts)
+
+
+def _drop_references(root, ids):
+    """Remove elements that refer to any of the given relationships, e.g. slide IDs, hyperlinks or custom show entries."""
+    attributes = [ooxml.qn(f'r:{name}') for name in ('id', 'embed', 'link', 'pict')]
+    for parent in list(root.iter()):
+        for element in list(parent):
+            if any(element.get(attribute) in ids for attribute in attributes):
+                parent.remove(element)
+
+
+def _export(package, slides, output):
+    presentation = package.main()
+    names = slide_parts(package)
+    if not slides or min(slides) < 1 or max(slides) > len(names):
+        raise IndexError(f'Slides {slides.start}-{slides.stop - 1} out of range for {len(names)} slides')
+    kept = {names[i - 1] for i in slides}
+    keep = {'[Content_Types].xml', *package.reachable('', stop=('slide',)), *kept}
+    for slide in kept:
+        keep |= package.reachable(slide, stop=SLIDE_BOUNDARY)
+    keep |= {ooxml.rels_name(part) for part in ['', *keep] if ooxml.rels_name(part) in package}
+
+    # drop relationships to parts left out, along with the elements (e.g. hyperlinks) that refer to them
+    changed = {}
+    for part in sorted(keep):
+        dropped = {rel.id for rel in package.rels(part) if not rel.external and rel.target in package and rel.target not in keep}
+        if not dropped:
+            continue
+        rels = package.tree(ooxml.rels_name(part))
+        for element in list(rels.root):
+            if element.get('Id') in dropped:
+                rels.root.remove(element)
+        changed[ooxml.rels_name(part)] = rels.tostring()
+        tree = package.tree(part)
+        _drop_references(tree.root, dropped)
+        if part == presentation:
+            ids = {element.get('id') for element in tree.root.iter(ooxml.qn('p:sldId'))}
+            for parent in list(tree.root.iter()):
+                for element in list(parent):
+                    if element.tag == f'{{{P14}}}sldId' and element.get('id') not in ids:
+                        parent.remove(element)
+        changed[part] = tree.tostring()
+
+    types = package.tree('[Content_Types].xml')
+    for element in list(types.root):
+        if element.tag == f'{{{ooxml.NS["ct"]}}}Override' and element.get('PartName').lstrip('/') not in keep:
+            types.root.remove(element)
+    changed['[Content_Types].xml'] = types.tostring()
+
+    return package.save(output, {**dict.fromkeys(set(package.zip.namelist()) - keep), **changed})
+
+
+@functools.lru_cache(maxsize=1)
+def _package(filepath):
+    return ooxml.Package(filepath)
+
+
+def _export_file(filepath, slides, output):
+    return _export(_package(filepath), slides, output)
@@ -0,0 +1,186 @@
+"""Rendering of slides to images, sharded across renderer instances and cached on disk by slide content."""
+
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+import pathlib
+import re
+import shutil
+import tempfile
+
+from . import backend as backends
+from . import image, ooxml, pptx
+from .util import counters, timer
+
+# relationship types that lead to parts that do not affect how a slide looks
+RENDER_BOUNDARY = ('slide', 'notesSlide', 'notesMaster', 'handoutMaster', 'presentation')
+
+
+def default_directory():
+    return image.default_directory().parent / 'slides'
+
+
+class Cache:
+    """An on-disk, least-recently-used cache of rendered slides, evicted once it exceeds `limit` bytes.
+
+    A cache may be shared by threads and processes: images are written to temporary files and moved into place, and
+    images evicted while being read count as misses.
+    """
+
+    def __init__(self, directory=None, limit=1 << 30):
+        self.directory = pathlib.Path(default_directory() if directory is None else directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.limit = limit
+
+    def evict(self):
+        files = []
+        for filepath in self.directory.glob('*.png'):
+            with contextlib.suppress(OSError):  # removed meanwhile
+                stat = filepath.stat()
+                files.append((stat.st_mtime, stat.st_size, filepath))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, filepath in files:
+            if total <= self.limit:
+                break
+            with contextlib.suppress(OSError):  # removed meanwhile, or held open by a reader on Windows
+                filepath.unlink(missing_ok=True)
+                counters['render.evicted'] += 1
+            total -= size
+
+    def get(self, key, output):
+        """Copy a cached image to `output`, returning whether it was cached."""
+        filepath = self.directory / f'{key}.png'
+        try:
+            os.utime(filepath)
+            shutil.copyfile(filepath, output)
+        except FileNotFoundError:
+            counters['render.miss'] += 1
+            return False
+        counters['render.hit'] += 1
+        return True
+
+    def put(self, key, filepath):
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as f, open(filepath, 'rb') as source:
+            shutil.copyfileobj(source, f)
+        try:
+            os.replace(f.name, self.directory / f'{key}.png')
+        except PermissionError:  # held open by a reader on Windows, with the same content as keyed
+            os.remove(f.name)
+
+
+class PowerPointRenderer:
+    """Render slides with PowerPoint, exporting the whole presentation at once when all of its slides are requested.
+
+    A renderer is called with a presentation, the slide numbers (from 1) to render, a directory to write '<number>.png'
+    files to, and the size in pixels. It may be called from several threads at once.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backends.get() if backend is None else backend
+
+    def __call__(self, filepath, slides, directory, width, height):
+        from .application import PowerPoint
+        self.backend.initialize()
+        try:
+            ppt = PowerPoint(str(filepath), headless=True, backend=self.backend)
+            try:
+                if slides == list(range(1, ppt.doc.Slides.Count + 1)):
+                    ppt.doc.Export(str(directory), 'PNG', width, height)
+                    for exported in list(directory.iterdir()):  # named after the localized word for slide, e.g. 'Slide1.PNG'
+                        match = re.search(r'(\d+)\.png$', exported.name, re.IGNORECASE)
+                        if match:
+                            exported.rename(directory / f'{int(match.group(1))}.png')
+                else:
+                    for i in slides:
+                        ppt.doc.Slides(i).Export(str(directory / f'{i}.png'), 'PNG', width, height)
+            finally:
+                ppt.close(alert=False)
+        finally:
+            self.backend.uninitialize()
+
+
+def render(filepath, indices, out_dir, width=1280, height=None, renderer=None, instances=1, cache=None):
+    """Render slides of a presentation to PNG files, reusing images of slides rendered before from `cache`.
+
+    Slides are numbered from 1, as in PowerPoint, all of them by default. Without a `height`, slides keep their aspect
+    ratio. Slides are keyed by a hash of the content of every part that affects how they look (the slide, its layout,
+    master, theme and media), along with their number if they show it, so that edits elsewhere in the deck do not cause
+    them to be rendered again. Slides not in the cache are split into contiguous shards, rendered by up to `instances`
+    concurrent calls to `renderer` (a `PowerPointRenderer` by default). Note that PowerPoint only ever runs a single
+    process, which its shards share. Returns the filepaths written, named after the source and slide numbers (e.g.
+    'deck 3.png').
+    """
+    filepath, out_dir = pathlib.Path(filepath), pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = Cache() if cache is None else cache
+    renderer = PowerPointRenderer() if renderer is None else renderer
+    with ooxml.Package(filepath) as package:
+        slides = pptx.slide_parts(package)
+        size = package.parse(package.main()).find(ooxml.qn('p:sldSz'))
+        if height is None:
+            height = round(width * int(size.get('cy')) / int(size.get('cx')))
+        keys = _keys(package, slides, f'{width}x{height}')
+    indices = range(1, len(slides) + 1) if indices is None else indices
+    outputs = {i: out_dir / f'{filepath.stem} {i}.png' for i in indices}
+    missing = []
+    for i, output in sorted(outputs.items()):
+        if not cache.get(keys[i - 1], output):
+            missing.append(i)
+    if missing:
+        with tempfile.TemporaryDirectory() as directory, timer('render'):
+            shards = _shards(missing, instances)
+            jobs = []
+            for j, shard in enumerate(shards):
+                shard_dir = pathlib.Path(directory) / str(j)
+                shard_dir.mkdir()
+                source = filepath
+                if len(shards) > 1:  # each instance opens its own copy
+                    source = pathlib.Path(directory) / f'{j}{filepath.suffix}'
+                    shutil.copyfile(filepath, source)
+                jobs.append((source, shard, shard_dir))
+            with concurrent.futures.ThreadPoolExecutor(len(jobs)) as executor:
+                list(executor.map(lambda job: renderer(job[0], job[1], job[2], width, height), jobs))
+            for _, shard, shard_dir in jobs:
+                for i in shard:
+                    rendered = shard_dir / f'{i}.png'
+                    cache.put(keys[i - 1], rendered)
+                    shutil.copyfile(rendered, outputs[i])
+        cache.evict()
+    return list(outputs.values())
+
+
+def _keys(package, slides, salt):
+    """Hash of each slide, over the content of the parts (and relationships) that affect how it looks."""
+    digests = {}
+
+    def digest(part):
+        if part not in digests:
+            sha = hashlib.sha256()
+            with package.open(part) as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            digests[part] = sha.hexdigest()
+        return digests[part]
+
+    keys = []
+    for i, slide in enumerate(slides):
+        parts = {slide, *package.reachable(slide, stop=RENDER_BOUNDARY)}
+        parts |= {ooxml.rels_name(part) for part in parts if ooxml.rels_name(part) in package}
+        numbered = b'type="slidenum"' in package.read(slide)
+        key = ':'.join([salt, str(i + 1) if numbered else '', *(digest(part) for part in sorted(parts, key=lambda part: (part != slide, part)))])
+        keys.append(hashlib.sha256(key.encode()).hexdigest()[:32])
+    return keys
+
+
+def _shards(slides, count):
+    """Split slide numbers into up to `count` contiguous shards of similar size."""
+    count = max(1, min(count, len(slides)))
+    step, extra = divmod(len(slides), count)
+    shards, start = [], 0
+    for j in range(count):
+        stop = start + step + (j < extra)
+        shards.append(slides[start:stop])
+        start = stop
+    return shards
@@ -0,0 +1,175 @@
+"""Documents (.docx, .pptx) generated from a template by substituting placeholders, without Office."""
+
+import concurrent.futures
+import functools
+import pathlib
+import re
+
+from . import docx, ooxml, pptx
+from .ooxml import qn
+
+PATTERN = r'\{\{\s*(\w+)\s*\}\}'  # e.g. {{name}}
+
+MARKER = '\ue000{}\ue001'  # private use characters standing in for placeholders in serialized parts
+
+
+class Template:
+    """A template indexed once for placeholders, which are then substituted to write any number of documents.
+
+    Placeholders (e.g. '{{name}}') are found in the text of paragraphs, even when split across runs, as happens when
+    they are typed or formatted in pieces; each takes the formatting of the run it starts in. Pictures are placeholders
+    when their name or alternative text is one, and are swapped for another image of the same format. Text is
+    searched in the stories of documents, and in the slides and notes of presentations. Parts without placeholders are
+    copied into each document without decompressing them, and the others are written from their serialized template
+    with values spliced in, so that no XML is parsed per document.
+
+    >>> with Template('/path/to/letter.docx') as template:
+    >>>     for i, row in enumerate(rows):
+    >>>         template.fill({'name': row.name, 'logo': row.logo_path}, f'/path/to/letter {i}.docx')
+    """
+
+    def __init__(self, filepath, pattern=PATTERN):
+        self.filepath = filepath
+        self.package = ooxml.Package(filepath)
+        self.fields = set()
+        self.media = {}  # picture placeholder to the image parts it swaps
+        self._segments = {}  # part to its serialized template, alternating literal text and placeholder names
+        pattern = re.compile(pattern)
+        main = self.package.main()
+        if main.startswith('word/'):
+            paragraph, text = qn('w:p'), qn('w:t')
+            parts = docx.story_parts(self.package)
+        elif main.startswith('ppt/'):
+            paragraph, text = qn('a:p'), qn('a:t')
+            slides = pptx.slide_parts(self.package)
+            parts = [*slides, *(rel.target for slide in slides for rel in self.package.rels(slide) if rel.type == 'notesSlide' and rel.target in self.package)]
+        else:
+            raise ValueError(f'Unsupported template: {main}')
+        for part in parts:
+            tree = self.package.tree(part)
+            found = False
+            for texts in _paragraphs(tree.root, paragraph, text):
+                found |= self._index(texts, pattern, text == qn('w:t'))
+            for name, embed in _pictures(tree.root, pattern):
+                target = self.package.rel(part, embed).target
+                self.media.setdefault(name, set()).add(target)
+            if found:
+                self._segments[part] = re.split(MARKER.format('(\\w+)'), tree.tostring().decode('utf-8'))
+        self.fields |= set(self.media)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.package.close()
+
+    def fill(self, values, output):
+        """Write a document with placeholders substituted from `values`.
+
+        Text placeholders all need a value. Pictures are swapped for the image (a filepath or bytes) given, if any.
+        """
+        missing = {name for segments in self._segments.values() for name in segments[1::2]} - set(values)
+        if missing:
+            raise KeyError(f'No values for {sorted(missing)}')
+        parts = {}
+        for part, segments in self._segments.items():
+            chunks = segments.copy()
+            chunks[1::2] = (ooxml.escape(str(values[name])) for name in segments[1::2])
+            parts[part] = ''.join(chunks).encode('utf-8')
+        for name, targets in self.media.items():
+            if values.get(name) is None:
+                continue
+            image = values[name]
+            if not isinstance(image, bytes):
+                image = pathlib.Path(image)
+                for target in targets:
+                    if image.suffix.lower() != pathlib.PurePosixPath(target).suffix.lower():
+                        raise ValueError(f'Cannot swap {target} for {image.name} of another format')
+                image = image.read_bytes()
+            parts.update(dict.fromkeys(targets, image))
+        return self.package.save(output, parts)
+
+    def _index(self, texts, pattern, preserve):
+        """Gather each placeholder in the text of a paragraph into the text element it starts in, as a marker."""
+        joined = ''.join(x.text or '' for x in texts)
+        matches = list(pattern.finditer(joined))
+        if not matches:
+            return False
+        starts, ends = [], []
+        for element in texts:
+            starts.append(ends[-1] if ends else 0)
+            ends.append(starts[-1] + len(element.text or ''))
+        for match in reversed(matches):  # later matches first, so that earlier offsets hold
+            self.fields.add(match.group(1))
+            first = next(i for i, end in enumerate(ends) if end > match.start())
+            last = next(i for i, end in enumerate(ends) if end >= match.end())
+            head = (texts[first].text or '')[:match.start() - starts[first]]
+            tail = (texts[last].text or '')[match.end() - starts[last]:]
+            for element in texts[first + 1:last + 1]:
+                element.text = ''
+            texts[first].text = head + MARKER.format(match.group(1)) + (tail if first == last else '')
+            if first != last:
+                texts[last].text = tail
+            if preserve:
+                texts[first].set(f'{{{ooxml.XML}}}space', 'preserve')
+        return True
+
+
+def fill(filepath, rows, outputs, processes=None):
+    """Write a document per row of values from a template (see `Template`), returning the filepaths written.
+
+    Documents are written by `processes` worker processes if given, each indexing the template once.
+    """
+    if not processes:
+        with Template(filepath) as template:
+            return [template.fill(values, output) for values, output in zip(rows, outputs)]
+    rows, outputs = list(rows), list(outputs)
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        chunksize = max(1, len(outputs) // (4 * processes))
+        return list(executor.map(_fill_file, [filepath] * len(outputs), rows, outputs, chunksize=chunksize))
+
+
+def _fill_file(filepath, values, output):
+    return _template(filepath).fill(values, output)
+
+
+def _paragraphs(root, paragraph, text):
+    """Text elements of each paragraph, leaving out those of paragraphs nested within (e.g. in text boxes)."""
+    paragraphs = []
+
+    def walk(element, texts):
+        for child in element:
+            if child.tag == paragraph:
+                paragraphs.append([])
+                walk(child, paragraphs[-1])
+            elif child.tag == text:
+                texts.append(child)
+            else:
+                walk(child, texts)
+
+    walk(root, [])
+    return paragraphs
+
+
+def _pictures(root, pattern):
+    """Placeholder names of pictures, named or described as one, with the relationship ids of their images."""
+    for container in root.iter():
+        properties = next((x for x in container if x.tag in (qn('wp:docPr'), qn('p:nvPicPr'))), None)
+        if properties is None:
+            continue
+        if properties.tag == qn('p:nvPicPr'):
+            properties = properties.find(qn('p:cNvPr'))
+        match = next((m for m in (pattern.fullmatch(properties.get(x, '')) for x in ('descr', 'name')) if m), None)
+        if match is None:
+            continue
+        for blip in container.iter(qn('a:blip')):
+            if blip.get(qn('r:embed')):
+                yield match.group(1), blip.get(qn('r:embed'))
+
+
+@functools.lru_cache(maxsize=1)
+def _template(filepath):
+    return Template(filepath)
@@ -0,0 +1,199 @@
+"""Tracing of COM round-trips, per member path from the application or document, and per Python call site."""
+
+import collections
+import datetime as dt
+import inspect
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+
+from . import backend as backends
+
+# values returned by COM that are not objects, and so are not wrapped
+PLAIN = (str, bytes, int, float, complex, bool, type(None), tuple, list, dict, dt.datetime)
+
+
+class Stat(typing.NamedTuple):
+    path: str
+    count: int
+    total: float
+    p50: float
+    p90: float
+    p99: float
+    sites: list  # most frequent call sites, with their counts
+
+
+class Tracer:
+    """A backend wrapping another, which traces every member get, set and call on the objects it dispatches.
+
+    Applications and their documents are wrapped in proxies, as is every object reached from them, so that round-trips
+    are recorded by member path (e.g. 'Document.Revisions.Item.Range.Font.ColorIndex=') along with the innermost Python
+    call site outside this module. Gets, sets and calls are keyed as by `fake.Backend`. Blocks timed by `util.timer` are
+    recorded too while the tracer is registered in `util.hooks`.
+
+    >>> tracer = Tracer()
+    >>> w = Word(backend=tracer)
+    >>> list(w.mark_revisions())
+    >>> print(tracer.report(top=10))
+    >>> tracer.write_trace('/path/to/trace.json')  # open in chrome://tracing or https://ui.perfetto.dev
+    """
+
+    def __init__(self, backend=None, events=1000000):
+        self.backend = backends.get() if backend is None else backend
+        self.error = self.backend.error
+        self.limit = events
+        self.events = []
+        self.latencies = collections.defaultdict(list)
+        self.sites = collections.defaultdict(collections.Counter)
+        self.start = time.perf_counter()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def dispatch(self, name):
+        return self.wrap(self.backend.dispatch(name), 'Application')
+
+    def hook(self, name, elapsed):
+        """Record a block timed by `util.timer`, as a span enclosing its round-trips."""
+        if len(self.events) < self.limit:
+            self.events.append((name, 'timer', time.perf_counter() - elapsed, elapsed, threading.get_ident(), None))
+
+    def record(self, path, start):
+        """Record a round-trip that started at `start` (as given by time.perf_counter) and ended now."""
+        elapsed = time.perf_counter() - start
+        self.latencies[path].append(elapsed)
+        frame = inspect.currentframe()
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        site = None if frame is None else f'{pathlib.Path(frame.f_code.co_filename).name}:{frame.f_lineno} ({frame.f_code.co_name})'
+        self.sites[path][site] += 1
+        if len(self.events) < self.limit:
+            self.events.append((path, 'set' if path[-1] == '=' else 'call' if path[-1] == ')' else 'get', start, elapsed, threading.get_ident(), site))
+
+    def report(self, top=None):
+        """Members by total time, with their call counts, latency percentiles and most frequent call site."""
+        lines = [f'{"member":<60} {"calls":>9} {"total (ms)":>11} {"p50 (us)":>9} {"p90 (us)":>9} {"p99 (us)":>9}  call site']
+        lines.extend(f'{x.path:<60} {x.count:>9} {1e3 * x.total:>11.1f} {1e6 * x.p50:>9.1f} {1e6 * x.p90:>9.1f} {1e6 * x.p99:>9.1f}  {x.sites[0][0]}' for x in self.stats()[:top])
+        return '\n'.join(lines)
+
+    def reset(self):
+        self.events.clear()
+        self.latencies.clear()
+        self.sites.clear()
+        self.start = time.perf_counter()
+
+    def stats(self):
+        """Latency statistics per member path, by total time."""
+        stats = []
+        for path, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            percentiles = (latencies[int(q * (len(latencies) - 1))] for q in (0.5, 0.9, 0.99))
+            stats.append(Stat(path, len(latencies), sum(latencies), *percentiles, self.sites[path].most_common(3)))
+        return sorted(stats, key=lambda x: x.total, reverse=True)
+
+    def wrap(self, obj, name):
+        """Trace an object under a root path (e.g. 'Document'), rather than the path it was reached by."""
+        return Proxy(self, _unwrap(obj), name)
+
+    def write_trace(self, filepath):
+        """Write recorded events in the Chrome trace event format."""
+        pid = os.getpid()
+        events = [{'name': name, 'cat': category, 'ph': 'X', 'ts': 1e6 * (start - self.start), 'dur': 1e6 * elapsed, 'pid': pid, 'tid': tid, 'args': {} if site is None else {'site': site}}
+                  for name, category, start, elapsed, tid, site in self.events]
+        pathlib.Path(filepath).write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+
+
+class Proxy:
+    """A COM object, whose capitalized members are traced under its path."""
+
+    __slots__ = ('obj', 'path', 'tracer')
+
+    def __init__(self, tracer, obj, path):
+        object.__setattr__(self, 'tracer', tracer)
+        object.__setattr__(self, 'obj', obj)
+        object.__setattr__(self, 'path', path)
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            return getattr(self.obj, name)
+        path = f'{self.path}.{name}'
+        start = time.perf_counter()
+        value = getattr(self.obj, name)
+        if inspect.ismethod(value) or inspect.isbuiltin(value):  # methods make their round-trip when called
+            return _Method(self.tracer, value, path)
+        self.tracer.record(path, start)
+        return _wrap(self.tracer, value, path)
+
+    def __setattr__(self, name, value):
+        start = time.perf_counter()
+        try:
+            setattr(self.obj, name, _unwrap(value))
+        finally:
+            self.tracer.record(f'{self.path}.{name}=', start)
+
+    def __call__(self, *args, **kwargs):
+        """Parameterized properties and default members, e.g. `doc.Paragraphs(1)`."""
+        return _Method(self.tracer, self.obj, self.path)(*args, **kwargs)
+
+    def __iter__(self):
+        iterator = iter(self.obj)
+        path = f'{self.path}.Item'
+        while True:
+            start = time.perf_counter()
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.tracer.record(f'{path}()', start)
+            yield _wrap(self.tracer, value, path)
+
+    def __len__(self):
+        start = time.perf_counter()
+        try:
+            return len(self.obj)
+        finally:
+            self.tracer.record(f'{self.path}.Count', start)
+
+    def __bool__(self):
+        return bool(self.obj)
+
+    def __eq__(self, other):
+        return self.obj == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self.obj)
+
+    def __repr__(self):
+        return f'<Proxy {self.path} of {self.obj!r}>'
+
+
+class _Method:
+
+    def __init__(self, tracer, func, path):
+        self.tracer = tracer
+        self.func = func
+        self.path = path
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            value = self.func(*(_unwrap(x) for x in args), **{k: _unwrap(v) for k, v in kwargs.items()})
+        finally:
+            self.tracer.record(f'{self.path}()', start)
+        return _wrap(self.tracer, value, self.path)
+
+
+def _unwrap(value):
+    if isinstance(value, Proxy):
+        return value.obj
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(x) for x in value)
+    return value
+
+
+def _wrap(tracer, value, path):
+    return value if isinstance(value, PLAIN) else Proxy(tracer, value, path)
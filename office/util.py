@@ -1,4 +1,45 @@
-from win32com.client import constants
+import collections
+import contextlib
+import functools
+import re
+import time
+
+from . import enums
+
+
+class Constants:
+    """Office enumerations, looked up in `table` (prefilled from `enums`) before the type libraries generated by pywin32."""
+
+    def __init__(self):
+        self.table = dict(enums.VALUES)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self.table:
+            from win32com.client import constants
+            self.table[name] = getattr(constants, name)
+        return self.table[name]
+
+
+constants = Constants()
+counters = collections.Counter()
+hooks = []  # callables notified with the name and wall time of every completed timer
+timings = collections.defaultdict(float)
+
+
+def address(row, column, rows=1, columns=1):
+    """A1-style address of a block of cells, given its top-left cell (numbered from 1) and shape."""
+    def letters(n):
+        name = ''
+        while n:
+            n, remainder = divmod(n - 1, 26)
+            name = chr(65 + remainder) + name
+        return name
+    first = f'{letters(column)}{row}'
+    if rows == columns == 1:
+        return first
+    return f'{first}:{letters(column + columns - 1)}{row + rows - 1}'
 
 
 def boolean(value):
@@ -11,5 +52,29 @@ def inch(value, reverse=False):
     return value * 72
 
 
+def parse_address(value):
+    """Top-left cell and shape, as (row, column, rows, columns), of an A1-style address (e.g. 'B2', '$A$1:$C$10')."""
+    match = re.fullmatch(r'\$?([A-Z]+)\$?(\d+)(?::\$?([A-Z]+)\$?(\d+))?', value.upper())
+    if match is None:
+        raise ValueError(f'Invalid address: {value}')
+    columns = [functools.reduce(lambda n, c: 26 * n + ord(c) - 64, x, 0) for x in match.group(1, 3) if x]
+    rows = [int(x) for x in match.group(2, 4) if x]
+    return min(rows), min(columns), max(rows) - min(rows) + 1, max(columns) - min(columns) + 1
+
+
 def rgb(r, g, b):
     return r + (g * 256) + (b * 256 ** 2)
+
+
+@contextlib.contextmanager
+def timer(name):
+    """Accumulate call count and wall time of a block under the given name in `counters` and `timings`, and notify `hooks`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        counters[name] += 1
+        timings[name] += elapsed
+        for hook in hooks:
+            hook(name, elapsed)
@@ -0,0 +1,125 @@
+"""Background execution of Office jobs for the Qt tools, off the GUI thread."""
+
+import contextlib
+import queue
+import threading
+import traceback
+
+from PyQt5 import QtCore
+
+from . import backend as backends
+
+
+class Worker(QtCore.QThread):
+    """A thread that owns a COM apartment and runs queued jobs one at a time.
+
+    A job is a generator function, called on the worker thread (where Office applications must also be created). Each
+    item it yields is forwarded through `progress`, and its return value through `finished`. Signals carry the key the
+    job was submitted with (its filepath by default), and are delivered on the thread of connected windows. Cancelling
+    closes the running generator at its next yield, so cleanup belongs in `finally` blocks.
+
+    >>> worker = Worker()
+    >>> worker.progress.connect(lambda key, n: progress.setValue(n))
+    >>> worker.submit(docx.mark_revisions, input_path, output_path)
+    """
+
+    started_job = QtCore.pyqtSignal(object)
+    progress = QtCore.pyqtSignal(object, object)
+    finished_job = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, str)
+    cancelled = QtCore.pyqtSignal(object)
+    idle = QtCore.pyqtSignal()
+
+    def __init__(self, backend=None, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self._cancel = threading.Event()
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.start()
+
+    def cancel(self, pending=True):
+        """Cancel the running job, and those still queued unless `pending` is False.
+
+        A cancel made between jobs, or that the running job finishes before acting on, applies to the next job queued, if
+        any, rather than being dropped.
+        """
+        if pending:
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._jobs.put(None)
+                    break
+                self._done()
+                self.cancelled.emit(job[0])
+        with self._lock:
+            if self._pending:  # consumed by the job running, or the next to run
+                self._cancel.set()
+
+    def pending(self):
+        """Number of jobs queued or running."""
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True):
+        self.cancel()
+        self._jobs.put(None)
+        if wait:
+            self.wait()
+
+    def submit(self, func, *args, key=None, **kwargs):
+        """Queue `func(*args, **kwargs)`, returning its key."""
+        if key is None:
+            key = args[0] if args else func.__name__
+        with self._lock:
+            self._pending += 1
+        self._jobs.put((key, func, args, kwargs))
+        return key
+
+    def run(self):
+        backend = self.backend
+        if backend is None:
+            with contextlib.suppress(ImportError):  # jobs that do not need Office still run without pywin32
+                backend = backends.get()
+        if backend is not None:
+            backend.initialize()
+        try:
+            while (job := self._jobs.get()) is not None:
+                self._run(*job)
+                if not self._done():
+                    self.idle.emit()
+        finally:
+            if backend is not None:
+                backend.uninitialize()
+
+    def _done(self):
+        with self._lock:
+            self._pending -= 1
+            if not self._pending:
+                self._cancel.clear()
+            return self._pending
+
+    def _run(self, key, func, args, kwargs):
+        if self._cancel.is_set():
+            self._cancel.clear()
+            self.cancelled.emit(key)
+            return
+        self.started_job.emit(key)
+        try:
+            iterator = func(*args, **kwargs)
+            while True:
+                item = next(iterator)
+                if self._cancel.is_set():
+                    self._cancel.clear()
+                    iterator.close()
+                    self.cancelled.emit(key)
+                    return
+                self.progress.emit(key, item)
+        except StopIteration as stop:
+            self.finished_job.emit(key, stop.value)
+        except Exception:  # noqa: BLE001
+            self.failed.emit(key, traceback.format_exc())
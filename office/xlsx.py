@@ -0,0 +1,201 @@
+"""Excel workbooks (.xlsx), read directly without Office."""
+
+import datetime as dt
+import functools
+import re
+import xml.etree.ElementTree as ET
+
+from . import ooxml
+from .ooxml import qn
+from .util import parse_address
+
+# built-in number formats that display dates or times, see ECMA-376 Part 1, 18.8.30
+DATE_FORMATS = {*range(14, 23), 45, 46, 47}
+
+CELL, ROW, TEXT, VALUE = qn('x:c'), qn('x:row'), qn('x:t'), qn('x:v')
+
+
+def read_chunks(filepath, sheet=None, columns=None, size=1 << 16, dtype=None):
+    """Stream a worksheet as 2-D NumPy arrays of up to `size` rows each (see `read_rows`).
+
+    Values are converted as by `Excel.read_range`, to a `dtype` inferred from the first chunk unless one is given, so
+    that every chunk has the same dtype while memory use is bounded by the chunk size rather than the worksheet. A later
+    chunk holding values of another type (e.g. text below rows of numbers) raises ValueError, in which case pass the
+    dtype to use (e.g. object). Nested lists are yielded instead if NumPy is not installed.
+    """
+    from .application import _array, _dtype
+
+    def array(rows):
+        nonlocal dtype
+        if dtype is None:
+            dtype = _dtype(rows) or object
+        elif inferred and dtype is not object and _dtype(rows) not in (None, dtype):
+            raise ValueError(f'Rows from {start + 1} do not fit the dtype {np.dtype(dtype)} of those before, pass a dtype (e.g. object) to read them with')
+        width = max(len(row) for row in rows)  # rows are ragged without a used range
+        return _array([row + [None] * (width - len(row)) for row in rows], dtype)
+
+    try:
+        import numpy as np
+    except ImportError:  # lists are yielded, whatever the types of their values
+        np = None
+    inferred = dtype is None and np is not None
+    start, chunk = 0, []
+    for row in read_rows(filepath, sheet, columns):
+        chunk.append(row)
+        if len(chunk) == size:
+            yield array(chunk)
+            start, chunk = start + size, []
+    if chunk:
+        yield array(chunk)
+
+
+def read_rows(filepath, sheet=None, columns=None):
+    """Stream the rows of a worksheet (by name, or number from 1, the first by default) as lists of values.
+
+    Rows span the used range recorded in the worksheet (or start from A1, as long as their cells, without one), with empty cells and rows read
+    as None, numbers as float, booleans as bool, dates as datetime, and errors as None. With `columns`, given as letters
+    or numbers (from 1), or a range such as 'B:D', only those are read, in that order. The worksheet is parsed
+    incrementally, so that memory use does not grow with it, though shared strings are held in memory.
+
+    >>> for row in read_rows('/path/to/file.xlsx', 'Data', columns='A:C'):
+    >>>     print(row)
+    """
+    with ooxml.Package(filepath) as package:
+        workbook = package.main()
+        target = _sheet(package, workbook, sheet)
+        strings = _strings(package, workbook)
+        dates, epoch = _dates(package, workbook)
+        wanted = None if columns is None else _columns(columns)
+        top, left, width = 1, 1, None
+        with package.open(target) as f:
+            number = 0
+            for element in _iterparse(f, (qn('x:dimension'), ROW)):
+                if element.tag == qn('x:dimension'):
+                    top, left, rows, width = parse_address(element.get('ref'))
+                    if rows == width == 1:  # left as A1 by some writers, whatever the used range
+                        top, left, width = 1, 1, None
+                    continue
+                index = int(element.get('r', number + 1))
+                for _ in range(max(number + 1, top), index):
+                    yield _select({}, wanted, left, width)
+                number = index
+                if index >= top:
+                    yield _select(_cells(element, strings, dates, epoch), wanted, left, width)
+
+
+def sheet_names(filepath):
+    with ooxml.Package(filepath) as package:
+        return [element.get('name') for element in package.parse(package.main()).iter(qn('x:sheet'))]
+
+
+def _cells(row, strings, dates, epoch):
+    """Values of the cells of a row, by column number (from 1)."""
+    values = {}
+    column = 0
+    for cell in row.iter(CELL):
+        reference = cell.get('r')
+        column = _column(reference) if reference else column + 1
+        kind = cell.get('t', 'n')
+        if kind == 'inlineStr':
+            values[column] = ''.join(x.text or '' for x in cell.iter(TEXT))
+            continue
+        value = cell.findtext(VALUE)
+        if not value or kind == 'e':
+            continue
+        if kind == 's':
+            values[column] = strings[int(value)]
+        elif kind == 'b':
+            values[column] = value == '1'
+        elif kind == 'str':
+            values[column] = value
+        elif kind == 'd':
+            values[column] = dt.datetime.fromisoformat(value)
+        elif int(cell.get('s', 0)) in dates:
+            values[column] = _date(float(value), epoch)
+        else:
+            values[column] = float(value)
+    return values
+
+
+def _column(reference):
+    """Column number (from 1) of a cell reference, e.g. 'C12'."""
+    return _letters(reference.rstrip('0123456789'))
+
+
+def _columns(columns):
+    if isinstance(columns, str):
+        first, _, last = columns.partition(':')
+        _, first, _, count = parse_address(f'{first}1:{last or first}1')
+        return list(range(first, first + count))
+    return [x if isinstance(x, int) else _column(x) for x in columns]
+
+
+def _date(serial, epoch):
+    """Datetime of a serial date, in the 1900 (with its phantom leap day) or 1904 date system."""
+    if epoch.year == 1899 and serial < 60:
+        serial += 1
+    return epoch + dt.timedelta(days=serial)
+
+
+def _dates(package, workbook):
+    """Indices of cell styles that display dates, and the epoch of the workbook's date system."""
+    properties = package.parse(workbook).find(qn('x:workbookPr'))
+    epoch = dt.datetime(1904, 1, 1) if properties is not None and properties.get('date1904') in ('1', 'true') else dt.datetime(1899, 12, 30)
+    styles = next((rel.target for rel in package.rels(workbook) if rel.type == 'styles' and rel.target in package), None)
+    if styles is None:
+        return set(), epoch
+    root = package.parse(styles)
+    formats = set(DATE_FORMATS)
+    for element in root.iter(qn('x:numFmt')):
+        code = re.sub(r'"[^"]*"|\\.|\[[^\]]*\]', '', element.get('formatCode', ''))  # drop literals, escapes, colors and locales
+        if re.search('[dmyhs]', code, re.IGNORECASE):
+            formats.add(int(element.get('numFmtId')))
+    xfs = root.find(qn('x:cellXfs'))
+    return {i for i, xf in enumerate([] if xfs is None else xfs) if int(xf.get('numFmtId', 0)) in formats}, epoch
+
+
+def _iterparse(source, tags):
+    """Elements with the given tags, each removed from its parent once handled, so that the tree does not grow."""
+    parents = []
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag in tags:
+            yield element
+            if parents:
+                parents[-1].remove(element)
+
+
+@functools.lru_cache(maxsize=None)
+def _letters(letters):
+    return parse_address(f'{letters}1')[1]
+
+
+def _select(values, wanted, left, width):
+    if wanted is not None:
+        return [values.get(column) for column in wanted]
+    if width is None:
+        width = max(values, default=left - 1) - left + 1
+    return [values.get(column) for column in range(left, left + width)]
+
+
+def _sheet(package, workbook, sheet):
+    """Part name of a worksheet, by name or number (from 1)."""
+    sheets = list(package.parse(workbook).iter(qn('x:sheet')))
+    if sheet is None:
+        sheet = 1
+    matches = [x for i, x in enumerate(sheets) if sheet in (i + 1, x.get('name'))]
+    if not matches:
+        raise KeyError(f'No worksheet {sheet!r} in {[x.get("name") for x in sheets]}')
+    return package.rel(workbook, matches[0].get(qn('r:id'))).target
+
+
+def _strings(package, workbook):
+    """Shared strings of a workbook, without their phonetic runs."""
+    part = next((rel.target for rel in package.rels(workbook) if rel.type == 'sharedStrings' and rel.target in package), None)
+    if part is None:
+        return []
+    with package.open(part) as f:
+        return [''.join(x.text or '' for x in [*si.findall(TEXT), *si.findall(f'{qn("x:r")}/{TEXT}')]) for si in _iterparse(f, (qn('x:si'),))]
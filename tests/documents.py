@@ -0,0 +1,75 @@
+"""Minimal Office documents, written part by part, for tests that run without Office."""
+
+import zipfile
+
+from office.ooxml import NS
+
+TYPES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+DEFAULTS = (
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>')
+
+
+def rels(*relationships):
+    """A relationships part, given (id, type, target) of each relationship."""
+    items = ''.join(f'<Relationship Id="{rid}" Type="{TYPES}/{kind}" Target="{target}"/>' for rid, kind, target in relationships)
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{NS["pr"]}">{items}</Relationships>'
+
+
+def write(filepath, parts):
+    """A package of the given parts, with a content type override for each XML part, as Office writes them."""
+    overrides = ''.join(f'<Override PartName="/{name}" ContentType="application/xml"/>' for name in parts if name.endswith('.xml'))
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Types xmlns="{NS["ct"]}">{DEFAULTS}{overrides}</Types>')
+        for name, data in parts.items():
+            z.writestr(name, data)
+    return filepath
+
+
+def document(filepath, body, parts=None):
+    """A Word document with the given body content (paragraphs and tables)."""
+    xml = f'<w:document xmlns:w="{NS["w"]}" xmlns:r="{NS["r"]}"><w:body>{body}</w:body></w:document>'
+    return write(filepath, {
+        '_rels/.rels': rels(('rId1', 'officeDocument', 'word/document.xml')),
+        'word/document.xml': xml,
+        **({} if parts is None else parts)})
+
+
+def picture(rid, width, height, name='Picture'):
+    """A picture shape of a slide, showing the image of a relationship at a size in inches."""
+    return (f'<p:pic><p:nvPicPr><p:cNvPr id="2" name="{name}"/><p:cNvPicPr/><p:nvPr/></p:nvPicPr>'
+            f'<p:blipFill><a:blip r:embed="{rid}"/></p:blipFill>'
+            f'<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{round(width * 914400)}" cy="{round(height * 914400)}"/></a:xfrm></p:spPr></p:pic>')
+
+
+def presentation(filepath, slides, media=None):
+    """A presentation with a slide per (shapes, relationships), where relationships are (id, type, target) of the slide."""
+    ids = ''.join(f'<p:sldId id="{256 + i}" r:id="rId{i + 1}"/>' for i in range(len(slides)))
+    parts = {
+        '_rels/.rels': rels(('rId1', 'officeDocument', 'ppt/presentation.xml')),
+        'ppt/presentation.xml': (f'<p:presentation xmlns:p="{NS["p"]}" xmlns:r="{NS["r"]}"><p:sldIdLst>{ids}</p:sldIdLst>'
+                                 '<p:sldSz cx="12192000" cy="6858000"/></p:presentation>'),
+        'ppt/_rels/presentation.xml.rels': rels(*((f'rId{i + 1}', 'slide', f'slides/slide{i + 1}.xml') for i in range(len(slides))))}
+    for i, (shapes, relationships) in enumerate(slides):
+        parts[f'ppt/slides/slide{i + 1}.xml'] = (f'<p:sld xmlns:a="{NS["a"]}" xmlns:p="{NS["p"]}" xmlns:r="{NS["r"]}">'
+                                                 f'<p:cSld><p:spTree>{shapes}</p:spTree></p:cSld></p:sld>')
+        parts[f'ppt/slides/_rels/slide{i + 1}.xml.rels'] = rels(*relationships)
+    parts.update({} if media is None else media)
+    return write(filepath, parts)
+
+
+def workbook(filepath, rows, strings=(), styles=None):
+    """A workbook with a single worksheet of the given row elements, and optionally shared strings and styles."""
+    relationships = [('rId1', 'worksheet', 'worksheets/sheet1.xml'), ('rId2', 'sharedStrings', 'sharedStrings.xml')]
+    parts = {
+        '_rels/.rels': rels(('rId1', 'officeDocument', 'xl/workbook.xml')),
+        'xl/workbook.xml': f'<workbook xmlns="{NS["x"]}" xmlns:r="{NS["r"]}"><sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        'xl/worksheets/sheet1.xml': f'<worksheet xmlns="{NS["x"]}"><sheetData>{rows}</sheetData></worksheet>',
+        'xl/sharedStrings.xml': f'<sst xmlns="{NS["x"]}">{"".join(f"<si><t>{x}</t></si>" for x in strings)}</sst>'}
+    if styles is not None:
+        relationships.append(('rId3', 'styles', 'styles.xml'))
+        parts['xl/styles.xml'] = f'<styleSheet xmlns="{NS["x"]}">{styles}</styleSheet>'
+    parts['xl/_rels/workbook.xml.rels'] = rels(*relationships)
+    return write(filepath, parts)
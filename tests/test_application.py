@@ -0,0 +1,89 @@
+import datetime as dt
+
+import pytest
+
+from office import fake
+from office.application import Excel, PowerPoint, Word
+
+np = pytest.importorskip('numpy')
+
+
+def test_excel_ranges_round_trip():
+    backend = fake.Backend()
+    excel = Excel(backend=backend)
+    excel.chunk = 6  # cells per round-trip
+    values = np.arange(20, dtype=float).reshape(10, 2)
+    values[1, 1] = np.nan
+    assert excel.write_range(values, 'B2') == 'B2:C11'
+    assert backend.calls['Range.Value='] == 4  # in chunks of 3 rows
+    assert excel.doc.ActiveSheet.Range('C3').Value is None  # NaN left empty
+    assert excel.read_range('A1').tolist() == [[None]]
+    backend.reset()
+    read = excel.read_range('B2:C11')
+    assert read.dtype == float
+    assert np.array_equal(read, values, equal_nan=True)
+    assert backend.calls['Range.Value'] == 4
+
+    dates = np.array(['2024-01-01', 'NaT', '2024-03-01'], dtype='datetime64[D]')
+    assert excel.write_range(dates, 'E1') == 'E1:E3'  # as a column
+    assert excel.doc.ActiveSheet.Range('E1').Value == dt.datetime(2024, 1, 1)
+    assert excel.doc.ActiveSheet.Range('E2').Value is None  # NaT left empty
+    excel.write_range([[dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc)]], 'E2')  # as pywintypes returns dates
+    read = excel.read_range('E1:E3')
+    assert read.dtype == np.dtype('datetime64[us]')
+    assert read[:, 0].tolist() == [dt.datetime(2024, 1, 1), dt.datetime(2024, 2, 1), dt.datetime(2024, 3, 1)]
+    excel.doc.ActiveSheet.Range('E2').Value = None
+    assert np.isnat(excel.read_range('E1:E3')[1, 0])
+
+
+def test_excel_ranges_infer_dtype():
+    excel = Excel(backend=fake.Backend())
+    excel.write_range([['a', None, 1.5, True], [None, None, 2, False]], 'A1')
+    assert excel.read_range('A1:D2').dtype == object
+    assert excel.read_range('C1:D2').tolist() == [[1.5, 1.0], [2.0, 0.0]]  # booleans as numbers
+    assert excel.read_range('B1:B2').dtype == object  # without any values
+    assert excel.read_range('C1:D2', dtype=object).tolist() == [[1.5, True], [2, False]]
+    assert excel.read_range().shape == (2, 4)  # the used range
+
+
+def test_word_buffer_counts_utf16():
+    backend = fake.Backend()
+    word = Word(backend=backend)
+    with word.buffer(size=3):
+        first = word.add_text('Smile \U0001f600')  # two code units in Word
+        image = word.add_image('image.png', size=(1, 1))
+        second = word.add_text('Line\nbreak \U0001f44d')
+        assert backend.calls['Range.InsertAfter()'] == 2  # flushed at three paragraphs
+        third = word.add_text('Last')
+        assert first.Range.Text == 'Smile \U0001f600\r'
+        second.Range.Font.Bold = True
+        assert backend.calls['Range.InsertAfter()'] == 2  # already flushed
+        assert third.Range.Text == 'Last\r'  # resolving flushes
+        assert backend.calls['Range.InsertAfter()'] == 3
+        fourth = word.add_text('Flushed on exit')
+    assert word.doc.Content.Text == 'Smile \U0001f600\r/\rLine\rbreak \U0001f44d\rLast\rFlushed on exit\r\r'
+    assert image.Width == 72
+    assert (first.start, first.end, image.start, image.end, second.start, second.end) == (0, 9, 9, 11, 11, 25)
+    assert second.Range.Text == 'Line\r'  # the first of its paragraphs
+    assert second.Range.Font.Bold
+    assert fourth.Range.Text == 'Flushed on exit\r'
+
+
+@pytest.mark.parametrize('headless', [False, True])
+def test_powerpoint_indexes_shapes(headless):
+    backend = fake.Backend()
+    ppt = PowerPoint(backend=backend, headless=headless)
+    first = ppt.add_slide()
+    title = ppt.add_text('Title')
+    second = ppt.add_slide()
+    assert ppt.get_slide('Slide1').SlideID == first.SlideID
+    assert ppt.get_slide().SlideID == first.SlideID  # current, as looked up by name
+    backend.reset()
+    assert ppt.get_shape(title.Name).TextFrame.TextRange.Text == 'Title'
+    assert backend.calls['Shapes.Item()'] == 1  # indexed on first use
+    added = ppt.add_text('Added')
+    assert ppt.get_shape(added.Name).TextFrame.TextRange.Text == 'Added'
+    assert ppt.get_shape(title.Name, slide=0).TextFrame.TextRange.Text == 'Title'
+    assert backend.calls['Shapes.Item()'] == 1  # nor again, as shapes are added
+    assert ppt.get_slide(-1).SlideID == second.SlideID
+    assert (backend.calls['Slide.Select()'] > 0) != headless  # never selected, nor redrawn, without a window
@@ -0,0 +1,90 @@
+import sys
+import time
+import types
+
+import pytest
+
+from office import backend, fake
+from office.application import Application, Word
+
+
+def test_backoff_grows_exponentially():
+    policy = backend.Backoff(initial=0.05, factor=2.0, maximum=1.0)
+    elapsed, delays = 0.0, []
+    for _ in range(8):
+        delays.append(policy.delay(elapsed))
+        elapsed += 1e-3 + delays[-1]  # each retry also takes a round-trip
+    assert delays == pytest.approx([0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 1.0])
+
+
+def test_rejected_calls_are_retried(monkeypatch):
+    monkeypatch.setattr(Application, 'retry', backend.Backoff())
+    word = Word(backend=fake.Backend(reject=0.5))
+    for i in range(10):
+        word.add_text(f'Paragraph {i}')
+    assert Application.retry.counters['retried'] > 0
+    assert Application.retry.counters['failed'] == 0
+
+
+def test_rejected_calls_fail_without_retry_or_after_timeout(monkeypatch):
+    monkeypatch.setattr(Application, 'retry', None)
+    with pytest.raises(fake.Error):
+        Word(backend=fake.Backend(reject=1.0))
+    b = fake.Backend(reject=1.0)
+    b.message_filter(backend.Backoff(timeout=10.0))
+    with pytest.raises(fake.Error):
+        b.tick('Application.Visible=')
+    assert b.elapsed >= 10.0
+    assert b.filter.counters['failed'] == 1
+
+
+def test_budget_is_spent_per_window():
+    policy = backend.Backoff(budget=3, window=0.05)
+    assert [policy.delay(0.0) for _ in range(4)] == [0.05, 0.05, 0.05, -1]
+    time.sleep(0.05)
+    assert policy.delay(0.0) == 0.05  # calls made later are retried again
+    assert policy.counters == {'rejected': 5, 'retried': 4, 'failed': 1}
+
+
+class MakePy:
+    """Stand-in for win32com.client.makepy, printing the line that makepy prints for a type library."""
+
+    def __init__(self):
+        self.calls = []
+
+    def main(self):
+        self.calls.append(sys.argv[1:])
+        print("from win32com.client import gencache\ngencache.EnsureModule('{91493440-5A91-11CF-8700-00AA0060263B}', 0, 2, 12)")
+
+
+def com(directory):
+    """A COM backend with makepy and gencache stubbed out, which needs no pywin32."""
+    b = backend.COM.__new__(backend.COM)
+    b.gen_path = directory
+    b.makepy = MakePy()
+    b.client = types.SimpleNamespace(gencache=types.SimpleNamespace(modules=[]))
+    b.client.gencache.EnsureModule = lambda *args: b.client.gencache.modules.append(args)
+    return b
+
+
+def test_dispatch_through_backend():
+    b = fake.Backend()
+    Word(backend=b).add_text('Hello')
+    assert b.calls['Range.Text='] == 1
+    with backend.use(fake.Backend()) as default:
+        Word().add_text('Hello')
+    assert default.calls == b.calls
+
+
+def test_proxy_lookups_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, '_proxies', {})
+    b = com(tmp_path)
+    b.proxy('Microsoft PowerPoint 16.0 Object Library')
+    b.proxy('Microsoft PowerPoint 16.0 Object Library')
+    assert b.makepy.calls == [['-i', 'Microsoft PowerPoint 16.0 Object Library']]
+    assert b.client.gencache.modules == [('{91493440-5A91-11CF-8700-00AA0060263B}', 0, 2, 12)]
+    monkeypatch.setattr(backend, '_proxies', {})  # as in another process
+    b = com(tmp_path)
+    b.proxy('Microsoft PowerPoint 16.0 Object Library')
+    assert b.makepy.calls == []
+    assert b.client.gencache.modules == [('{91493440-5A91-11CF-8700-00AA0060263B}', 0, 2, 12)]
@@ -0,0 +1,40 @@
+from office import fake
+from office.application import PowerPoint
+from office.builder import Builder
+from office.util import constants
+
+SHAPES = [
+    {'text': 'First', 'position': (1, 1), 'size': (2, 1), 'fontsize': 12, 'bold': True},
+    {'text': 'Second', 'position': (1, 2), 'size': (2, 1), 'fontsize': 12},
+    {'image': 'image.png', 'position': (4, 1)},
+    {'shape': constants.msoShapeRectangle, 'position': (4, 3), 'size': (1, 1), 'properties': {'Fill.Transparency': 0.5}},
+    {'line': (2, 1), 'end': (0, 0)}]
+
+
+def test_flush_counts_round_trips():
+    backend = fake.Backend()
+    ppt = PowerPoint(backend=backend)
+    builder = Builder(ppt)
+    backend.reset()
+    with ppt.bulk():
+        pass
+    overhead = sum(backend.calls.values())  # of bulk, rather than of building
+
+    backend.reset()
+    calls = builder.flush([{'layout': 'Blank', 'shapes': SHAPES}])
+    assert calls == sum(backend.calls.values()) - overhead
+    assert backend.calls['Shapes.Range()'] == 1
+    assert backend.calls['TextFrame.MarginLeft='] == backend.calls['Font.Size='] == 1  # once for both textboxes
+    assert backend.calls['TextFrame.MarginLeft'] == 1  # the default, read once
+
+    backend.reset()
+    assert builder.flush([{'index': 1, 'shapes': SHAPES[:2]}]) == sum(backend.calls.values()) - overhead < calls
+    assert backend.calls['TextFrame.MarginLeft'] == 0  # nor again
+    assert builder.calls == calls + sum(backend.calls.values()) - overhead
+
+    shapes = list(ppt.doc.Slides(1).Shapes)
+    assert [(x.Left, x.Top, x.Width, x.Height) for x in shapes[:5]] == [(72, 72, 144, 72), (72, 144, 144, 72), (288, 72, 100, 100), (288, 216, 72, 72), (0, 0, 144, 72)]
+    assert [x.TextFrame.TextRange.Text for x in shapes[:2]] == ['First', 'Second']
+    assert [x.TextFrame.MarginLeft for x in shapes[:2]] == [0, 0]
+    assert [x.TextFrame.TextRange.Font.Bold for x in shapes[:2]] == [constants.msoTrue, constants.msoFalse]
+    assert shapes[3].Fill.Transparency == 0.5
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+from documents import picture, presentation
+
+from office import compact, ooxml
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def png(size=(1200, 800), color='red'):
+    f = io.BytesIO()
+    Image.new('RGB', size, color).save(f, 'PNG')
+    return f.getvalue()
+
+
+def test_duplicates_are_collapsed(tmp_path):
+    data = png()
+    filepath = presentation(tmp_path / 'deck.pptx', [
+        (picture('rId1', 1, 1), [('rId1', 'image', '../media/image1.png')]),
+        (picture('rId1', 1, 1), [('rId1', 'image', '../media/image2.png')])],
+        {'ppt/media/image1.png': data, 'ppt/media/image2.png': data})
+    savings = compact.compact(filepath, tmp_path / 'compact.pptx')
+    with ooxml.Package(tmp_path / 'compact.pptx') as package:
+        assert 'ppt/media/image2.png' not in package
+        assert package.rels('ppt/slides/slide2.xml')[0].target == 'ppt/media/image1.png'
+    assert sum(x.saved for x in savings) > 0
+
+
+def test_kept_image_is_sized_for_its_largest_use(tmp_path):
+    """A duplicate shown larger than the image kept for it must not be downsampled to the smaller use."""
+    data = png()
+    filepath = presentation(tmp_path / 'deck.pptx', [
+        (picture('rId1', 1, 2 / 3), [('rId1', 'image', '../media/image1.png')]),
+        (picture('rId1', 8, 16 / 3), [('rId1', 'image', '../media/image2.png')])],
+        {'ppt/media/image1.png': data, 'ppt/media/image2.png': data})
+    compact.compact(filepath, tmp_path / 'compact.pptx', dpi=150)
+    with ooxml.Package(tmp_path / 'compact.pptx') as package, Image.open(package.open('ppt/media/image1.png')) as image:
+        assert 'ppt/media/image2.png' not in package
+        assert image.size == (1200, 800)  # 8 inches at 150 DPI is larger than the original
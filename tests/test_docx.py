@@ -0,0 +1,69 @@
+import zipfile
+
+from documents import document
+
+from office import docx, ooxml
+from office.ooxml import qn
+
+BODY = (
+    '<w:p><w:r><w:t xml:space="preserve">Kept </w:t></w:r>'
+    '<w:ins w:id="1" w:author="A"><w:r><w:t>inserted</w:t></w:r></w:ins>'
+    '<w:del w:id="2" w:author="A"><w:r><w:delText>deleted</w:delText></w:r></w:del>'
+    '<w:del w:id="3" w:author="B"><w:r><w:delText>other</w:delText></w:r></w:del></w:p>'
+    '<w:p><w:pPr><w:rPr><w:del w:id="4" w:author="A"/></w:rPr></w:pPr><w:r><w:t>First</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t>Second</w:t></w:r></w:p>'
+    '<w:p><w:moveTo w:id="5" w:author="A"><w:r><w:t>Moved</w:t></w:r></w:moveTo></w:p>')
+
+
+def paragraphs(filepath):
+    """Text of each paragraph, with tracked deletions in brackets."""
+    with ooxml.Package(filepath) as package:
+        root = package.parse('word/document.xml')
+    return [''.join(x.text if x.tag == qn('w:t') else f'[{x.text}]' for x in p.iter() if x.tag in (qn('w:t'), qn('w:delText'))) for p in root.iter(qn('w:p'))]
+
+
+def colors(filepath):
+    """Text of runs colored by mark_revisions, and whether they are struck through."""
+    with ooxml.Package(filepath) as package:
+        root = package.parse('word/document.xml')
+    return [(r.findtext(qn('w:t')), r.find(f'{qn("w:rPr")}/{qn("w:strike")}') is not None) for r in root.iter(qn('w:r')) if r.find(f'{qn("w:rPr")}/{qn("w:color")}') is not None]
+
+
+def test_mark_revisions(tmp_path):
+    filepath = document(tmp_path / 'in.docx', BODY)
+    counts = list(docx.mark_revisions(filepath, tmp_path / 'out.docx'))
+    assert counts[-1] == 4
+    assert paragraphs(tmp_path / 'out.docx') == ['Kept inserted', 'FirstSecond', 'Moved']
+    assert colors(tmp_path / 'out.docx') == [('inserted', False)]
+
+
+def test_mark_revisions_by_author(tmp_path):
+    filepath = document(tmp_path / 'in.docx', BODY)
+    list(docx.mark_revisions(filepath, tmp_path / 'out.docx', author='A', color='FF0000', strike_deletions=True))
+    assert paragraphs(tmp_path / 'out.docx') == ['Kept inserteddeleted[other]', 'First', 'Second', 'Moved']
+    assert colors(tmp_path / 'out.docx') == [('inserted', False), ('deleted', True)]  # and the mark of the first paragraph
+    with ooxml.Package(tmp_path / 'out.docx') as package:
+        root = package.parse('word/document.xml')
+    assert {x.get(qn('w:val')) for x in root.iter(qn('w:color'))} == {'FF0000'}
+    assert len(list(root.iter(qn('w:moveTo')))) == 1  # left as a tracked change
+
+
+def test_scan_revisions(tmp_path):
+    filepath = document(tmp_path / 'in.docx', BODY)
+    revisions = docx.scan_revisions(filepath)
+    assert revisions.handled == docx.count_revisions(filepath) == 4
+    assert revisions.authors() == {'A': 4, 'B': 1}
+    assert revisions.types() == {'Insert': 1, 'Delete': 3, 'Moved To': 1}
+    assert revisions.unhandled() == {'Moved To': 1}
+    assert docx.scan_revisions(filepath, author='B').handled == 1
+    assert docx.scan_revisions(filepath, author='A').handled == list(docx.mark_revisions(filepath, tmp_path / 'out.docx', author='A'))[-1]
+
+
+def test_marked_stories_are_compressed(tmp_path):
+    filepath = document(tmp_path / 'in.docx', BODY * 100)
+    list(docx.mark_revisions(filepath, tmp_path / 'out.docx'))
+    with zipfile.ZipFile(tmp_path / 'out.docx') as z:
+        info = z.getinfo('word/document.xml')
+        assert z.testzip() is None
+    assert info.compress_type == zipfile.ZIP_DEFLATED
+    assert info.compress_size < info.file_size / 10
@@ -0,0 +1,48 @@
+import io
+import os
+import shutil
+
+import pytest
+
+from office import image
+from office.util import counters
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def noise(filepath, size=(800, 600), image_format='PNG'):
+    Image.effect_noise(size, 64).save(filepath, image_format, dpi=(96, 96))
+    return filepath
+
+
+def test_resample(tmp_path):
+    with Image.open(io.BytesIO(image.resample(noise(tmp_path / 'a.png'), size=(2, 1.5)))) as resampled:
+        assert resampled.format == 'PNG'
+        assert resampled.size == (300, 225)  # at 150 DPI
+        assert resampled.info['dpi'] == pytest.approx((36, 36), abs=0.1)  # keeping the physical size
+    with Image.open(io.BytesIO(image.resample(tmp_path / 'a.png', size=(8, 8)))) as resampled:
+        assert resampled.size == (800, 600)  # never upsampled
+    assert image.resample(noise(tmp_path / 'a.gif', image_format='GIF')) is None
+
+
+def test_cache_is_keyed_by_content(tmp_path):
+    cache = image.Cache(tmp_path / 'cache')
+    source = noise(tmp_path / 'a.png')
+    before = dict(counters)
+
+    first = cache.prepare(source, size=(2, 1.5))
+    os.utime(first, (1000, 1000))
+    second = cache.prepare(source, size=(1, 0.75))
+    os.utime(second, (2000, 2000))
+    assert first.parent == second.parent == tmp_path / 'cache'
+    assert first.stat().st_size < source.stat().st_size
+
+    assert cache.prepare(shutil.copyfile(source, tmp_path / 'copy.png'), size=(2, 1.5)) == first  # used most recently
+    assert counters['image.hit'] - before.get('image.hit', 0) == 1
+    assert counters['image.miss'] - before.get('image.miss', 0) == 2
+
+    cache.limit = first.stat().st_size + second.stat().st_size
+    third = cache.prepare(source, size=(0.5, 0.375))
+    assert [first.is_file(), second.is_file(), third.is_file()] == [True, False, True]  # the least recently used evicted
+    assert counters['image.evicted'] - before.get('image.evicted', 0) == 1
+    assert cache.prepare(noise(tmp_path / 'a.gif', image_format='GIF'), size=(1, 1)) == tmp_path / 'a.gif'  # unsupported
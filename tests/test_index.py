@@ -0,0 +1,39 @@
+import os
+
+from documents import document, presentation, workbook
+
+from office import index
+
+
+def corpus(directory):
+    directory.mkdir()
+    document(directory / 'report.docx', '<w:p><w:r><w:t>Quarterly budget</w:t></w:r><w:ins w:id="1" w:author="Ann"><w:r><w:t> forecast</w:t></w:r></w:ins></w:p>')
+    presentation(directory / 'deck.pptx', [('<p:sp><p:txBody><a:p><a:r><a:t>Revenue forecast</a:t></a:r></a:p></p:txBody></p:sp>', [])])
+    workbook(directory / 'data.xlsx', '<row r="1"><c r="A1" t="s"><v>0</v></c></row>', strings=['Headcount'])
+    (directory / 'broken.docx').write_bytes(b'not a zip')
+
+
+def test_extract(tmp_path):
+    corpus(tmp_path / 'corpus')
+    assert index.extract(tmp_path / 'corpus' / 'report.docx') == [
+        ('word/document.xml', 'text', None, 'Quarterly budget forecast'),
+        ('word/document.xml', 'revision', 'Ann', ' forecast')]
+    assert index.extract(tmp_path / 'corpus' / 'deck.pptx') == [('ppt/slides/slide1.xml', 'slide', None, 'Revenue forecast')]
+    assert index.extract(tmp_path / 'corpus' / 'data.xlsx') == [('xl/sharedStrings.xml', 'text', None, 'Headcount')]
+
+
+def test_update_and_search(tmp_path):
+    corpus(tmp_path / 'corpus')
+    with index.Index(tmp_path / 'corpus.sqlite') as db:
+        assert db.update([tmp_path / 'corpus']) == {'added': 3, 'failed': 1, 'removed': 0}
+        assert sorted((x.path.rpartition(os.sep)[2], x.kind) for x in db.search('forecast')) == [('deck.pptx', 'slide'), ('report.docx', 'revision'), ('report.docx', 'text')]
+        assert [x.author for x in db.search('forecast', kind='revision')] == ['Ann']
+        assert db.authors() == {'Ann': 1}
+
+        assert db.update([tmp_path / 'corpus']) == {'unchanged': 4, 'removed': 0}
+        os.utime(tmp_path / 'corpus' / 'report.docx', ns=(0, 0))  # touched, and unchanged by content
+        presentation(tmp_path / 'corpus' / 'deck.pptx', [('<p:sp><p:txBody><a:p><a:r><a:t>Revenue</a:t></a:r></a:p></p:txBody></p:sp>', [])])
+        (tmp_path / 'corpus' / 'data.xlsx').unlink()
+        assert db.update([tmp_path / 'corpus']) == {'changed': 1, 'unchanged': 2, 'removed': 1}
+        assert [x.path.rpartition(os.sep)[2] for x in db.search('forecast', kind='text')] == ['report.docx']
+        assert db.search('Headcount') == []
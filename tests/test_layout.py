@@ -0,0 +1,48 @@
+import pytest
+
+from office import fake
+from office.application import PowerPoint
+from office.layout import Layout
+from office.util import constants
+
+
+def shapes(ppt, *boxes):
+    slide = ppt.add_slide()
+    return [slide.Shapes.AddShape(constants.msoShapeRectangle, *box) for box in boxes]
+
+
+def test_grid():
+    backend = fake.Backend()
+    ppt = PowerPoint(backend=backend)
+    layout = Layout(ppt)
+    targets = shapes(ppt, (0, 0, 72, 72), (0, 0, 144, 36), (0, 0, 36, 72), (0, 0, 72, 72))
+    assert layout.grid([]) == []
+    backend.reset()
+    positions = layout.grid(targets, spacing=(1, 0.5), position=(1, 1), reference='upper left')  # two by two, centered in their cells
+    assert positions == [(72, 72), (216, 90), (90, 180), (252, 180)]
+    assert backend.calls['Shape.Left'] == backend.calls['Shape.Top'] == 0  # as all positions are written
+    assert backend.calls['Shape.Width'] == backend.calls['Shape.Height'] == 4
+    assert [(x.Left, x.Top) for x in targets] == positions
+    assert layout.row(targets[:2]) == [(372, 234), (444, 252)]  # centered on the slide
+    assert layout.column(targets[:2], spacing=1) == [(444, 180), (408, 324)]
+
+
+def test_align_and_distribute():
+    backend = fake.Backend()
+    ppt = PowerPoint(backend=backend)
+    layout = Layout(ppt)
+    targets = shapes(ppt, (72, 72, 72, 72), (216, 90, 144, 36), (90, 180, 36, 72))
+    backend.reset()
+    assert layout.align(targets, 'right') == [(288, 72), (216, 90), (324, 180)]
+    assert backend.calls['Shape.Left='] == 2  # only where positions change
+    assert backend.calls['Shape.Top='] == 0
+    assert layout.align(targets, 'middle', relative=True) == [(288, 234), (216, 252), (324, 234)]
+    assert [(x.Left, x.Top) for x in targets] == [(288, 234), (216, 252), (324, 234)]
+
+    targets = shapes(ppt, (0, 0, 72, 72), (500, 200, 72, 72), (100, 100, 72, 72))
+    backend.reset()
+    assert layout.distribute(targets) == [(0, 0), (500, 200), (250, 100)]  # between the outermost shapes
+    assert backend.calls['Shape.Left='] == 1
+    assert layout.distribute(targets, 'vertical', relative=True) == [(0, 0), (500, 468), (250, 234)]  # across the slide
+    with pytest.raises(KeyError):
+        layout.align(targets, 'above')
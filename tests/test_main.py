@@ -0,0 +1,62 @@
+import json
+import sys
+
+import pytest
+from documents import presentation
+
+from office import __main__ as cli
+
+
+def deck(filepath, count=2):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    return presentation(filepath, [(f'<p:sp><p:txBody><a:p><a:r><a:t>Slide {i}</a:t></a:r></a:p></p:txBody></p:sp>', []) for i in range(count)])
+
+
+def run(monkeypatch, capsys, *args):
+    """Records printed by a run, by document name, and its summary."""
+    monkeypatch.setattr(sys, 'argv', ['office', *map(str, args)])
+    cli.main()
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    return {record['path'].replace('\\', '/').rpartition('/')[2]: record for record in records}, err.strip().splitlines()[-1]
+
+
+def test_inputs_are_expanded(tmp_path, monkeypatch, capsys):
+    deck(tmp_path / 'a.pptx')
+    deck(tmp_path / 'nested' / 'b.pptx', 3)
+    (tmp_path / '~$a.pptx').write_bytes(b'lock file')
+    (tmp_path / 'list.txt').write_text(f'{tmp_path / "a.pptx"}\n')
+    records, summary = run(monkeypatch, capsys, 'size', tmp_path / '**' / '*.pptx', f'@{tmp_path / "list.txt"}', tmp_path / 'missing.pptx', '--processes', 1)
+    assert sorted(records) == ['a.pptx', 'b.pptx']  # once each, without lock files
+    assert [len(x['result']['slides']) for _, x in sorted(records.items())] == [2, 3]
+    assert summary == '2 done, 0 failed, 0 skipped'
+
+
+def test_runs_resume_from_manifest(tmp_path, monkeypatch, capsys):
+    deck(tmp_path / 'decks' / 'a.pptx')
+    deck(tmp_path / 'decks' / 'nested' / 'b.pptx', 3)
+    (tmp_path / 'decks' / 'c.pptx').write_bytes(b'not a zip')
+    manifest = tmp_path / 'manifest.jsonl'
+    args = ('split', tmp_path / 'decks' / '**' / '*.pptx', '--output', tmp_path / 'slides', '--manifest', manifest, '--processes', 1)
+    records, summary = run(monkeypatch, capsys, *args)
+    assert summary == '2 done, 1 failed, 0 skipped'
+    assert records['c.pptx']['status'] == 'failed'
+    assert sorted(x.relative_to(tmp_path / 'slides').as_posix() for x in (tmp_path / 'slides').rglob('*.pptx')) == ['a 1.pptx', 'a 2.pptx', 'nested/b 1.pptx', 'nested/b 2.pptx', 'nested/b 3.pptx']
+
+    records, summary = run(monkeypatch, capsys, *args)
+    assert sorted(records) == ['c.pptx']  # failed documents are tried again
+    assert summary == '0 done, 1 failed, 2 skipped'
+
+    with open(manifest, 'a') as f:
+        f.write('{"job": "split", "path": ')  # cut short by an interruption
+    deck(tmp_path / 'decks' / 'a.pptx', 4)  # edited since
+    records, summary = run(monkeypatch, capsys, *args)
+    assert sorted(records) == ['a.pptx', 'c.pptx']
+    assert len(records['a.pptx']['result']['files']) == 4
+    assert summary == '1 done, 1 failed, 1 skipped'
+
+
+def test_output_is_required(tmp_path, monkeypatch, capsys):
+    with pytest.raises(SystemExit):
+        run(monkeypatch, capsys, 'split', deck(tmp_path / 'a.pptx'))
+    assert 'requires --output' in capsys.readouterr().err
@@ -0,0 +1,72 @@
+import io
+import struct
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pytest
+
+from office import ooxml
+
+MEMBERS = {
+    'deflated.xml': (b'<a>' + b'text ' * 1000 + b'</a>', zipfile.ZIP_DEFLATED),
+    'stored.png': (bytes(range(256)) * 10, zipfile.ZIP_STORED),
+    'media/bild ä名.png': (b'non-ASCII name', zipfile.ZIP_DEFLATED)}
+
+
+class Stream(io.RawIOBase):
+    """A write-only stream that cannot seek (or tell), such as a pipe, which zip files are written to with data descriptors."""
+
+    def __init__(self):
+        self.data = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.data.write(data)
+
+
+def source(filepath, seekable=True):
+    f = open(filepath, 'wb') if seekable else Stream()  # noqa: SIM115
+    with zipfile.ZipFile(f, 'w') as z:
+        for name, (data, compression) in MEMBERS.items():
+            z.writestr(name, data, compression)
+    if not seekable:
+        filepath.write_bytes(f.data.getvalue())
+    f.close()
+    return filepath
+
+
+@pytest.mark.parametrize('seekable', [True, False])
+def test_save_copies_members_raw(tmp_path, seekable):
+    filepath = source(tmp_path / 'source.zip', seekable)
+    with ooxml.Package(filepath) as package:
+        assert all(bool(x.flag_bits & 0x8) != seekable for x in package.zip.infolist())  # written with data descriptors
+        package.save(tmp_path / 'copy.zip', {'added.xml': b'<added/>', 'stored.png': None})
+        output = Stream()
+        package.save(output, {'deflated.xml': b'<changed/>'})
+    contents = {name: data for name, (data, _) in MEMBERS.items()}
+    with zipfile.ZipFile(tmp_path / 'copy.zip') as z:
+        assert z.testzip() is None
+        assert {x.filename: z.read(x) for x in z.infolist()} == {'deflated.xml': contents['deflated.xml'], 'media/bild ä名.png': contents['media/bild ä名.png'], 'added.xml': b'<added/>'}
+        assert z.getinfo('deflated.xml').compress_type == zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(output.data) as z:  # written through ZipFile, with data descriptors
+        assert z.testzip() is None
+        assert {x.filename: z.read(x) for x in z.infolist()} == {**contents, 'deflated.xml': b'<changed/>'}
+        assert z.getinfo('stored.png').compress_type == zipfile.ZIP_STORED
+
+
+def test_encrypted_members_are_not_copied_raw(tmp_path):
+    data = bytearray(source(tmp_path / 'source.zip').read_bytes())
+    for signature, offset in ((b'PK\x03\x04', 6), (b'PK\x01\x02', 8)):  # flag the first member as encrypted, in its local and central headers
+        i = data.index(signature)
+        data[i + offset:i + offset + 2] = struct.pack('<H', struct.unpack('<H', data[i + offset:i + offset + 2])[0] | 0x1)
+    (tmp_path / 'encrypted.zip').write_bytes(bytes(data))
+    with ooxml.Package(tmp_path / 'encrypted.zip') as package, pytest.raises(RuntimeError, match='password'):
+        package.save(tmp_path / 'copy.zip')
+
+
+def test_escape_round_trips():
+    text = 'a "quoted" <tag> & \ttab\r\nline'
+    assert ET.fromstring(f'<x a="{ooxml.escape(text, attribute=True)}">{ooxml.escape(text)}</x>').get('a') == text
+    assert ET.fromstring(f'<x>{ooxml.escape(text)}</x>').text == text.replace('\r\n', '\n')  # as normalized by parsers
@@ -0,0 +1,41 @@
+import pytest
+
+from office import fake, trace
+from office.pool import Pool
+
+
+def test_instances_are_reused_and_recycled(tmp_path):
+    tracer = trace.Tracer(fake.Backend())
+    filepaths = [tmp_path / f'{x}.docx' for x in 'abcde']
+    with Pool(size=1, recycle=2, backend=tracer) as pool:
+        assert list(pool.map(lambda w: w.doc.Paragraphs.Count, filepaths)) == [1] * 5
+    assert pool.stats == {'started': 3, 'leased': 5, 'recycled': 3}
+    counts = {path: len(x) for path, x in tracer.latencies.items()}
+    assert counts['Application.Quit()'] == 3
+    assert counts['Application.Name'] == 2  # health checks, before each document opened in a running instance
+    assert counts['Document.Close()'] == 5
+    assert sum(counts.values()) == sum(tracer.backend.calls.values())
+
+
+def test_failures_are_reported(tmp_path):
+    def fail(word):  # noqa: ARG001
+        raise fake.Error
+
+    with Pool(size=1, backend=fake.Backend()) as pool:
+        with pytest.raises(fake.Error):
+            pool.submit(fail, tmp_path / 'a.docx').result()
+        with pytest.raises(ZeroDivisionError):
+            pool.submit(lambda w: 1 / 0, tmp_path / 'b.docx').result()  # noqa: ARG005
+        assert pool.submit(lambda w: w.doc.Paragraphs.Count, tmp_path / 'c.docx').result() == 1
+    assert pool.stats == {'started': 2, 'leased': 3, 'failed': 2, 'recycled': 2}  # a COM error retires its instance
+
+
+def test_instances_left_with_documents_are_forced_to_quit(tmp_path, caplog):
+    backend = fake.Backend()
+    with Pool(size=1, recycle=1, backend=backend) as pool:
+        assert pool.submit(lambda w: w.app.Documents.Add().Saved, tmp_path / 'a.docx').result() == -1  # left open, as if edited
+        assert pool.submit(lambda w: len(w.app.Documents), tmp_path / 'b.docx').result() == 1  # in a new instance
+    assert pool.stats == {'started': 2, 'leased': 2, 'forced': 1, 'recycled': 2}
+    assert backend.calls['Document.Saved='] == 1  # discarding its changes
+    assert backend.calls['Application.Quit()'] == 2
+    assert 'Forcing Word to quit: Cannot quit with 1 document(s) open' in caplog.text
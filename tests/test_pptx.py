@@ -0,0 +1,53 @@
+import pytest
+from documents import picture, presentation
+
+from office import ooxml, pptx
+from office.ooxml import qn
+
+LINK = '<p:sp><p:nvSpPr><p:cNvPr id="3" name="Link"><a:hlinkClick r:id="rId2" action="ppaction://hlinksldjump"/></p:cNvPr></p:nvSpPr></p:sp>'
+
+
+def deck(filepath):
+    """Three slides, the first linking to the second, the first and last showing the same image."""
+    return presentation(filepath, [
+        (picture('rId1', 1, 1) + LINK, [('rId1', 'image', '../media/shared.png'), ('rId2', 'slide', 'slide2.xml')]),
+        (picture('rId1', 1, 1), [('rId1', 'image', '../media/own.png')]),
+        (picture('rId1', 1, 1), [('rId1', 'image', '../media/shared.png')])],
+        {'ppt/media/shared.png': b'shared' * 100, 'ppt/media/own.png': b'own' * 100})
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_export_slides(tmp_path, processes):
+    filepaths = pptx.export_slides(deck(tmp_path / 'deck.pptx'), [1, 2, 3, (1, 2)], tmp_path / 'slides', processes)
+    assert [x.name for x in filepaths] == ['deck 1.pptx', 'deck 2.pptx', 'deck 3.pptx', 'deck 1-2.pptx']
+    media, counts = [], []
+    for filepath in filepaths:
+        with ooxml.Package(filepath) as package:
+            assert package.zip.testzip() is None
+            slides = pptx.slide_parts(package)
+            counts.append(len(list(package.parse('ppt/presentation.xml').iter(qn('p:sldId')))))
+            for part in package.parts:
+                assert all(rel.target in package for rel in package.rels(part) if not rel.external), f'dangling relationship of {part}'
+            overrides = {x.get('PartName').lstrip('/') for x in package.parse('[Content_Types].xml') if x.get('PartName')}
+            assert overrides == {x for x in package.parts if x.endswith('.xml')} - {'[Content_Types].xml'}
+            media.append(sorted(x for x in package.parts if x.startswith('ppt/media/')))
+            assert len(list(package.parse(slides[0]).iter(qn('a:hlinkClick')))) == (len(slides) == 2)  # kept along with the slide it links to
+    assert counts == [1, 1, 1, 2]
+    assert media == [['ppt/media/shared.png'], ['ppt/media/own.png'], ['ppt/media/shared.png'], ['ppt/media/own.png', 'ppt/media/shared.png']]
+    with pytest.raises(IndexError):
+        pptx.export_slides(tmp_path / 'deck.pptx', [4], tmp_path / 'slides')
+
+
+def test_slide_sizes(tmp_path):
+    filepath = deck(tmp_path / 'deck.pptx')
+    sizes = list(pptx.slide_sizes(filepath, compressed=False))
+    with ooxml.Package(filepath) as package:
+        def size(part):
+            return package.size(part, False) + package.size(ooxml.rels_name(part), False)
+        shared, own = package.size('ppt/media/shared.png', False), package.size('ppt/media/own.png', False)
+        assert [x.index for x in sizes] == [1, 2, 3]
+        assert [x.shared_parts for x in sizes] == [['ppt/media/shared.png'], [], ['ppt/media/shared.png']]
+        assert [x.shared for x in sizes] == [shared / 2, 0, shared / 2]
+        assert [x.exclusive for x in sizes] == [size('ppt/slides/slide1.xml'), size('ppt/slides/slide2.xml') + own, size('ppt/slides/slide3.xml')]
+        assert all(x.size == x.exclusive + x.shared for x in sizes)
+    assert sum(x.size for x in pptx.slide_sizes(filepath)) < sum(x.size for x in sizes)  # compressed
@@ -0,0 +1,65 @@
+import concurrent.futures
+import threading
+
+from documents import presentation
+
+from office import render
+from office.util import counters
+
+
+class Renderer:
+    """Stand-in for `render.PowerPointRenderer`, writing what it was called with in place of each image."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, filepath, slides, directory, width, height):
+        with self.lock:
+            self.calls.append(slides)
+        for i in slides:
+            (directory / f'{i}.png').write_text(f'{filepath.name} {width}x{height} {i}')
+
+
+def deck(filepath, texts):
+    return presentation(filepath, [(''.join(f'<p:sp><p:txBody><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp>' for text in texts[:i + 1]), []) for i in range(len(texts))])
+
+
+def test_slides_are_sharded_and_cached(tmp_path):
+    filepath = deck(tmp_path / 'deck.pptx', ['One', 'Two', 'Three', 'Four', 'Five'])
+    cache = render.Cache(tmp_path / 'cache')
+    renderer = Renderer()
+    hits, misses = counters['render.hit'], counters['render.miss']
+    outputs = render.render(filepath, None, tmp_path / 'out', 640, renderer=renderer, instances=2, cache=cache)
+    assert sorted(renderer.calls) == [[1, 2, 3], [4, 5]]
+    assert [x.name for x in outputs] == [f'deck {i}.png' for i in range(1, 6)]
+    assert outputs[3].read_text() == '1.pptx 640x360 4'  # rendered from a copy of the deck per shard
+    assert (counters['render.hit'] - hits, counters['render.miss'] - misses) == (0, 5)
+
+    renderer.calls.clear()
+    render.render(filepath, [2, 4], tmp_path / 'out', 640, renderer=renderer, instances=2, cache=cache)
+    assert renderer.calls == []
+    assert (counters['render.hit'] - hits, counters['render.miss'] - misses) == (2, 5)
+
+    deck(filepath, ['One', 'Two', 'Three', 'Changed', 'Five'])
+    render.render(filepath, None, tmp_path / 'out', 640, renderer=renderer, instances=2, cache=cache)
+    assert sorted(renderer.calls) == [[4], [5]]  # slides showing the changed text
+    render.render(filepath, None, tmp_path / 'out', 320, renderer=renderer, instances=2, cache=cache)
+    assert sorted(renderer.calls[2:]) == [[1, 2, 3], [4, 5]]  # at another size
+
+
+def test_cache_is_evicted_beyond_its_limit(tmp_path):
+    filepath = deck(tmp_path / 'deck.pptx', ['One', 'Two', 'Three'])
+    cache = render.Cache(tmp_path / 'cache', limit=20)
+    render.render(filepath, None, tmp_path / 'out', 640, renderer=Renderer(), cache=cache)
+    assert len(list(cache.directory.iterdir())) == 1
+
+
+def test_cache_is_shared_by_threads(tmp_path):
+    filepaths = [deck(tmp_path / f'deck {j}.pptx', ['One', 'Two', 'Three']) for j in range(8)]  # slides of the same keys
+    cache = render.Cache(tmp_path / 'cache', limit=40)  # evicting while others read and write
+    for _ in range(10):
+        with concurrent.futures.ThreadPoolExecutor(len(filepaths)) as executor:
+            outputs = executor.map(lambda x: render.render(x, None, tmp_path / 'out', 640, renderer=Renderer(), instances=2, cache=cache), filepaths)
+            assert all(x.is_file() for files in outputs for x in files)
+    assert not list(cache.directory.glob('*.tmp'))
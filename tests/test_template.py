@@ -0,0 +1,46 @@
+import pytest
+from documents import document, picture, presentation
+
+from office import ooxml, template
+from office.ooxml import qn
+
+
+def texts(filepath, part, paragraph):
+    with ooxml.Package(filepath) as package:
+        root = package.parse(part)
+    return [''.join(x.text or '' for x in p.iter() if x.tag in (qn('w:t'), qn('a:t'))) for p in root.iter(paragraph)]
+
+
+def test_fill_document(tmp_path):
+    filepath = document(tmp_path / 'letter.docx', (
+        '<w:p><w:r><w:t xml:space="preserve">Dear {{ na</w:t></w:r><w:r><w:rPr><w:b/></w:rPr><w:t>me }},</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>{{amount}} due, {{name}}.</w:t></w:r></w:p>'))
+    with template.Template(filepath) as letter:
+        assert letter.fields == {'name', 'amount'}
+        letter.fill({'name': 'Ann & <Bob>', 'amount': 12.5}, tmp_path / 'out.docx')
+        with pytest.raises(KeyError):
+            letter.fill({'name': 'Ann'}, tmp_path / 'missing.docx')
+    assert texts(tmp_path / 'out.docx', 'word/document.xml', qn('w:p')) == ['Dear Ann & <Bob>,', '12.5 due, Ann & <Bob>.']
+
+
+def test_fill_presentation(tmp_path):
+    filepath = presentation(tmp_path / 'deck.pptx', [(
+        '<p:sp><p:txBody><a:p><a:r><a:t>{{title}}</a:t></a:r></a:p></p:txBody></p:sp>' + picture('rId1', 1, 1, name='{{logo}}'),
+        [('rId1', 'image', '../media/image1.png')])], {'ppt/media/image1.png': b'template'})
+    with template.Template(filepath) as deck:
+        assert deck.fields == {'title', 'logo'}
+        deck.fill({'title': 'Results'}, tmp_path / 'kept.pptx')
+        deck.fill({'title': 'Results', 'logo': b'swapped'}, tmp_path / 'swapped.pptx')
+        with pytest.raises(ValueError, match='another format'):
+            deck.fill({'title': 'Results', 'logo': tmp_path / 'logo.jpg'}, tmp_path / 'jpeg.pptx')
+    assert texts(tmp_path / 'kept.pptx', 'ppt/slides/slide1.xml', qn('a:p')) == ['Results']
+    with ooxml.Package(tmp_path / 'kept.pptx') as kept, ooxml.Package(tmp_path / 'swapped.pptx') as swapped:
+        assert (kept.read('ppt/media/image1.png'), swapped.read('ppt/media/image1.png')) == (b'template', b'swapped')
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_fill_many(tmp_path, processes):
+    filepath = document(tmp_path / 'letter.docx', '<w:p><w:r><w:t>Dear {{name}}</w:t></w:r></w:p>')
+    names = ['Ann', 'Bob', 'Cy']
+    outputs = template.fill(filepath, ({'name': x} for x in names), [tmp_path / f'{x}.docx' for x in names], processes)
+    assert [texts(x, 'word/document.xml', qn('w:p')) for x in outputs] == [[f'Dear {x}'] for x in names]
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+QtCore = pytest.importorskip('PyQt5.QtCore')
+
+from office import fake  # noqa: E402
+from office.worker import Worker  # noqa: E402
+
+
+def job(gate=None, count=3):
+    if gate is not None:
+        gate.wait(5)
+    yield from range(count)
+    return count
+
+
+@pytest.fixture
+def worker():
+    worker = Worker(backend=fake.Backend())
+    worker.events = []
+    done = threading.Event()
+    for name in ('started_job', 'finished_job', 'cancelled'):
+        getattr(worker, name).connect(lambda key, *args, name=name: worker.events.append((name, key)), QtCore.Qt.DirectConnection)  # noqa: ARG005
+    worker.idle.connect(done.set, QtCore.Qt.DirectConnection)
+    worker.done = done
+    yield worker
+    worker.shutdown()
+
+
+def test_cancel_between_jobs_applies_to_the_next(worker):
+    gate, started = threading.Event(), threading.Event()
+    worker.started_job.connect(lambda key: started.set(), QtCore.Qt.DirectConnection)  # noqa: ARG005
+    worker.submit(job, gate, 0, key='a')  # has nothing left to yield once the gate opens
+    worker.submit(job, key='b')
+    worker.submit(job, key='c')
+    assert started.wait(5)
+    worker.cancel(pending=False)
+    gate.set()
+    assert worker.done.wait(5)
+    assert worker.events == [('started_job', 'a'), ('finished_job', 'a'), ('cancelled', 'b'), ('started_job', 'c'), ('finished_job', 'c')]
+
+
+def test_cancel_when_idle_does_nothing(worker):
+    worker.cancel()
+    worker.submit(job, key='a')
+    assert worker.done.wait(5)
+    assert worker.events == [('started_job', 'a'), ('finished_job', 'a')]
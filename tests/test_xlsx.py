@@ -0,0 +1,43 @@
+import datetime as dt
+
+import pytest
+from documents import workbook
+
+from office import xlsx
+
+ROWS = (
+    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="inlineStr"><is><t>Date</t></is></c><c r="C1" t="s"><v>1</v></c></row>'
+    '<row r="2"><c r="A2"><v>1.5</v></c><c r="B2" s="1"><v>45292</v></c><c r="C2" t="b"><v>1</v></c></row>'
+    '<row r="4"><c r="A4" t="e"><v>#DIV/0!</v></c><c r="C4" t="str"><v>formula</v></c></row>')
+
+STYLES = '<cellXfs count="2"><xf numFmtId="0"/><xf numFmtId="14"/></cellXfs>'
+
+
+def test_read_rows(tmp_path):
+    filepath = workbook(tmp_path / 'data.xlsx', ROWS, strings=['Value', 'Flag'], styles=STYLES)
+    assert xlsx.sheet_names(filepath) == ['Data']
+    assert list(xlsx.read_rows(filepath)) == [
+        ['Value', 'Date', 'Flag'],
+        [1.5, dt.datetime(2024, 1, 1), True],
+        [],
+        [None, None, 'formula']]
+    assert list(xlsx.read_rows(filepath, 'Data', columns='B:C')) == [['Date', 'Flag'], [dt.datetime(2024, 1, 1), True], [None, None], [None, 'formula']]
+    assert list(xlsx.read_rows(filepath, 1, columns=['C', 1])) == [['Flag', 'Value'], [True, 1.5], [None, None], ['formula', None]]
+    with pytest.raises(KeyError):
+        list(xlsx.read_rows(filepath, 'Missing'))
+
+
+def test_read_chunks_keep_their_dtype(tmp_path):
+    np = pytest.importorskip('numpy')
+    rows = ''.join(f'<row r="{i}"><c r="A{i}"><v>{i}</v></c><c r="B{i}"><v>{2 * i}</v></c></row>' for i in range(1, 6))
+    filepath = workbook(tmp_path / 'numbers.xlsx', rows + '<row r="6"/><row r="7"><c r="A7" t="inlineStr"><is><t>Total</t></is></c></row>')
+    chunks = xlsx.read_chunks(filepath, size=3)
+    assert next(chunks).tolist() == [[1, 2], [2, 4], [3, 6]]
+    second = next(chunks)
+    assert second.dtype == float
+    assert np.isnan(second[2]).all()
+    with pytest.raises(ValueError, match='Rows from 7'):
+        next(chunks)
+    chunks = list(xlsx.read_chunks(filepath, size=3, dtype=object))
+    assert [x.dtype for x in chunks] == [object] * 3
+    assert chunks[2].tolist() == [['Total']]